@@ -1,13 +1,16 @@
 # scripts/FCS/fcs_endpoint.py
-import os, sys, lucene, atexit, re, yaml, traceback
+import os, sys, lucene, atexit, re, yaml, traceback, threading
+from bisect import bisect_left
+from collections import OrderedDict, deque
 from datetime import datetime, timezone
 from pathlib import Path
 
 from flask import Flask, request, Response
 
 from java.nio.file import Paths
-from org.apache.lucene.store import FSDirectory
-from org.apache.lucene.index import DirectoryReader, Term
+from org.apache.lucene.store import FSDirectory, MMapDirectory
+from org.apache.lucene.index import DirectoryReader, Term, MultiTerms, TermsEnum
+from org.apache.lucene.util import BytesRef
 from org.apache.lucene.analysis.standard import StandardAnalyzer
 from org.apache.lucene.search import IndexSearcher, BooleanQuery, BooleanClause, TermQuery, MatchAllDocsQuery
 from org.apache.lucene.queryparser.classic import QueryParser, MultiFieldQueryParser
@@ -15,8 +18,16 @@ from org.apache.lucene.document import LongPoint
 from org.apache.lucene.analysis.tokenattributes import CharTermAttribute
 from java.io import StringReader
 import os
-from fcs_xml import fcs_searchretrieve_xml, fcs_explain_xml, sru_diagnostic_xml
+from fcs_xml import fcs_searchretrieve_xml, fcs_explain_xml, sru_diagnostic_xml, sru_scan_xml
 from fcs_kwic_xml import kwic
+import fcs_metrics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "TextSearch"))
+import dedup  # noqa: E402  (Dubletten-Cluster neben dem Index, reines numpy)
+import sorting  # noqa: E402  (Sortierungen passend zur Index-Sortierung des Indexers)
+import grouping  # noqa: E402  (ein Record pro Ausgabe/Magazin)
+import related  # noqa: E402  (ähnliche Artikel, MoreLikeThis über Term-Vektoren)
+from doc_loader import DocLoader, KEY_FIELDS, RECORD_FIELDS  # noqa: E402
 
 # --- SRU Version Handling (1.2 + 2.0) --------------------------------------
 SUPPORTED_SRU_VERS = {"1.2", "2.0"}
@@ -77,6 +88,7 @@ CONFIG_PATH = "/Users/stoia1/Desktop/Website/DigitProject/config/zxpress.yaml"
 
 app = Flask(__name__)
 _LUCENE_READY = False
+fcs_metrics.install(app)  # Server-Timing + /metrics (FCS_METRICS=0 schaltet ab)
 
 # --- FCS 2.0 Explain metadata am App-Objekt hinterlegen ---
 app.explain_meta = {
@@ -118,13 +130,43 @@ def _load_yaml(path: str | Path) -> dict:
         return {}
 
 # ---------- Lucene Init + Profil-Init ----------
+_tls = threading.local()
+
+def attach_thread():
+    """Aktuellen Thread nur einmal an die JVM hängen (nicht bei jedem Request)."""
+    if not getattr(_tls, "attached", False):
+        lucene.getVMEnv().attachCurrentThread()
+        _tls.attached = True
+
+def _open_reader(index_dir: str, mmap: bool = True):
+    path = Paths.get(index_dir)
+    return DirectoryReader.open(MMapDirectory(path) if mmap else FSDirectory.open(path))
+
+def init_worker(index_dir: str | None = None, mmap: bool = True, warmup: bool = True):
+    """
+    Produktionsmodus (siehe fcs_serve.py): JVM, mmap-Reader und Profil beim Worker-Start laden,
+    damit der erste Request keinen Kaltstart bezahlt. Muss NACH dem fork() laufen.
+    """
+    global _LUCENE_READY
+    if not _LUCENE_READY:
+        lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+        _LUCENE_READY = True
+    attach_thread()
+    app.index_dir = index_dir or INDEX_DIR
+    app.reader = _open_reader(app.index_dir, mmap)
+    app.searcher = IndexSearcher(app.reader)
+    app.profile = _load_yaml(CONFIG_PATH)
+    if warmup:
+        app.searcher.search(MatchAllDocsQuery(), 1)
+
 def _ensure_lucene():
     global _LUCENE_READY
     if not _LUCENE_READY:
         lucene.initVM(vmargs=['-Djava.awt.headless=true'])
         _LUCENE_READY = True
-    lucene.getVMEnv().attachCurrentThread()
+    attach_thread()
     if not hasattr(app, "reader"):
+        app.index_dir = INDEX_DIR
         app.reader = DirectoryReader.open(FSDirectory.open(Paths.get(INDEX_DIR)))
         app.searcher = IndexSearcher(app.reader)
     if not hasattr(app, "profile"):
@@ -139,6 +181,21 @@ def health():
     except Exception as e:
         return {"status": "error", "detail": str(e)}, 500
 
+@app.route("/related", methods=["GET"])
+def related_articles():
+    """Ähnliche Artikel als JSON: /related?article_id=…&limit=10&other_magazines=1"""
+    _ensure_lucene()
+    article_id = _int_arg(("article_id", "id"), None)
+    if article_id is None:
+        return {"error": "article_id fehlt oder ist keine Zahl"}, 400
+    limit = max(1, min(_int_arg(("limit",), 10), 50))
+    other = (request.args.get("other_magazines") or "").strip().lower() in ("1", "true", "yes")
+    with fcs_metrics.phase("related"):
+        res = related.related(app.reader, app.searcher, article_id, limit, other)
+    if res is None:
+        return {"error": f"Artikel {article_id} nicht im Index"}, 404
+    return res, 200
+
 # Minimal HEAD handler for /sru
 @app.route("/sru", methods=["HEAD"])
 def sru_head():
@@ -247,6 +304,186 @@ def _normalize_kwic(kwics):
             out.append((k[0], k[1], k[2]))
     return out
 
+# ---------- SRU Scan (Term-Browsing) ----------
+# scanClause-Index -> Lucene-Feld
+SCAN_FIELDS = {
+    "magazine": "magazine",
+    "form": "form",
+    "language": "language", "lang": "language",
+    "issue_label": "issue_label", "issue": "issue_label",
+    "title": "title", "dc.title": "title",
+    "content": "content", "text": "content", "cql.serverchoice": "content",
+}
+# Felder mit wenigen Termen: komplette Termliste je Reader-Generation cachen (bisect statt Enum)
+SCAN_SMALL_FIELDS = {"magazine", "form", "language", "issue_label"}
+# Analysierte Felder: Starterm wie der StandardAnalyzer kleinschreiben
+SCAN_LOWERCASE_FIELDS = {"title", "content"}
+SCAN_DEFAULT_TERMS = 20
+SCAN_MAX_TERMS = 1000
+# Große Felder: jeder n-te Term als Sprungmarke für responsePosition > 1 (je Reader-Generation)
+SCAN_SAMPLE_EVERY = 256
+
+_scan_lock = threading.Lock()
+_scan_term_lists = {}            # (reader_version, field) -> [(term, docFreq)]
+_scan_results = OrderedDict()    # (reader_version, field, start, pos, max) -> [(term, docFreq)]
+_SCAN_RESULTS_MAX = 512
+
+def _parse_scan_clause(raw: str):
+    """'magazine', 'magazine = Z80', 'title="covox"' -> (index, start_term)."""
+    m = re.match(r'^\s*(?P<idx>[\w.]+)\s*(?:(?:==|=|exact)\s*(?P<term>.*?))?\s*$', raw or "")
+    if not m:
+        return None, ""
+    term = (m.group("term") or "").strip()
+    if len(term) >= 2 and term[0] == term[-1] == '"':
+        term = term[1:-1]
+    return m.group("idx").lower(), term
+
+def _all_terms(field: str, version):
+    """Komplette (term, docFreq)-Liste eines kleinen Feldes, je Reader-Generation gecacht."""
+    key = (version, field)
+    with _scan_lock:
+        cached = _scan_term_lists.get(key)
+    if cached is not None:
+        return cached
+    out = []
+    terms = MultiTerms.getTerms(app.reader, field)
+    if terms is not None:
+        te = terms.iterator()
+        br = te.next()
+        while br is not None:
+            out.append((br.utf8ToString(), te.docFreq()))
+            br = te.next()
+    with _scan_lock:
+        _scan_term_lists[key] = out
+    return out
+
+def _term_samples(field: str, version):
+    """Jeder SCAN_SAMPLE_EVERY-te Term eines großen Feldes (sortiert), je Reader-Generation gecacht."""
+    key = (version, field, "sample")
+    with _scan_lock:
+        cached = _scan_term_lists.get(key)
+    if cached is not None:
+        return cached
+    out = []
+    terms = MultiTerms.getTerms(app.reader, field)
+    if terms is not None:
+        te = terms.iterator()
+        br = te.next()
+        i = 0
+        while br is not None:
+            if i % SCAN_SAMPLE_EVERY == 0:
+                out.append(br.utf8ToString())
+            i += 1
+            br = te.next()
+    with _scan_lock:
+        _scan_term_lists[key] = out
+    return out
+
+def _scan_enum(field: str, start: str, pos: int, maxn: int):
+    """
+    Große Felder (title/content): TermsEnum ab seekCeil(start).
+    Für responsePosition > 1 (höchstens maximumTerms + 1) wird ab einer Sprungmarke vor start
+    gelesen, die mindestens pos-1 Terme zurückliegt (_term_samples); die letzten pos-1 Vorgänger
+    landen in einer begrenzten deque (kein Rückwärtslaufen im TermsEnum möglich).
+    Für responsePosition 0 liegt start vor der Liste: übersprungen wird der Starterm selbst,
+    aber nur, wenn er exakt im Index steht.
+    """
+    terms = MultiTerms.getTerms(app.reader, field)
+    if terms is None:
+        return []
+    te = terms.iterator()
+    out = []
+    if pos > 1:
+        before = deque(maxlen=pos - 1)
+        samples = _term_samples(field, app.reader.getVersion())
+        j = bisect_left(samples, start) - 1          # letzte Sprungmarke < start (-1: start vor dem ersten Term)
+        back = -(-(pos - 1) // SCAN_SAMPLE_EVERY)    # ceil: genug Terme zwischen Marke und start
+        anchor = samples[max(0, j - back)] if j >= 0 else start
+        br = te.term() if te.seekCeil(BytesRef(anchor)) != TermsEnum.SeekStatus.END else None
+        while br is not None and br.utf8ToString() < start:
+            before.append((br.utf8ToString(), te.docFreq()))
+            br = te.next()
+        out.extend(before)
+    else:
+        status = te.seekCeil(BytesRef(start))
+        if status == TermsEnum.SeekStatus.END:
+            return []
+        br = te.term()
+        if pos == 0 and status == TermsEnum.SeekStatus.FOUND:
+            br = te.next()
+    while br is not None and len(out) < maxn:
+        out.append((br.utf8ToString(), te.docFreq()))
+        br = te.next()
+    return out
+
+def scan_terms(field: str, start: str, pos: int, maxn: int):
+    version = app.reader.getVersion()
+    key = (version, field, start, pos, maxn)
+    with _scan_lock:
+        hit = _scan_results.get(key)
+        if hit is not None:
+            _scan_results.move_to_end(key)
+            return hit
+
+    if field in SCAN_SMALL_FIELDS:
+        lst = _all_terms(field, version)
+        i = bisect_left([t for t, _ in lst], start) if start else 0
+        if pos >= 1:
+            lo = max(0, i - (pos - 1))
+        else:
+            exact = bool(start) and i < len(lst) and lst[i][0] == start
+            lo = i - pos + (1 if exact else 0)
+        res = lst[lo:lo + maxn]
+    else:
+        res = _scan_enum(field, start, pos, maxn)
+
+    with _scan_lock:
+        _scan_results[key] = res
+        if len(_scan_results) > _SCAN_RESULTS_MAX:
+            _scan_results.popitem(last=False)
+    return res
+
+def _int_arg(names, default):
+    for n in names:
+        raw = request.args.get(n)
+        if raw is not None:
+            try:
+                return int(raw)
+            except (TypeError, ValueError):
+                return default
+    return default
+
+def sru_scan(sru_ver: str) -> Response:
+    scan_clause = (request.args.get("scanClause") or request.args.get("scanclause") or "").strip()
+    if not scan_clause:
+        diag = sru_diagnostic_xml(code="7", message="Mandatory parameter not supplied",
+                                  details="scanClause", version=sru_ver)
+        return _xml_response(diag, sru_ver, 200)
+
+    idx, start = _parse_scan_clause(scan_clause)
+    field = SCAN_FIELDS.get(idx or "")
+    if not field:
+        diag = sru_diagnostic_xml(code="16", message="Unsupported index",
+                                  details=idx or scan_clause, version=sru_ver)
+        return _xml_response(diag, sru_ver, 200)
+    if field in SCAN_LOWERCASE_FIELDS:
+        start = start.lower()
+
+    pos = _int_arg(("responsePosition", "responseposition"), 1)
+    maxn = _int_arg(("maximumTerms", "maximumterms"), SCAN_DEFAULT_TERMS)
+    maxn = max(1, min(maxn, SCAN_MAX_TERMS))
+    if not 0 <= pos <= maxn + 1:
+        diag = sru_diagnostic_xml(code="6", message="Unsupported parameter value",
+                                  details=f"responsePosition={pos} (erlaubt: 0..{maxn + 1})", version=sru_ver)
+        return _xml_response(diag, sru_ver, 200)
+
+    with fcs_metrics.phase("scan"):
+        terms = scan_terms(field, start, pos, maxn)
+    with fcs_metrics.phase("xml"):
+        xml = sru_scan_xml(terms=terms, scan_clause=scan_clause, response_position=pos,
+                           maximum_terms=maxn, version=sru_ver)
+    return _xml_response(xml, sru_ver, 200)
+
 # ---------- SRU Endpoint ----------
 
 # Helper: consistently add SRU version header to all SRU XML responses
@@ -266,6 +503,15 @@ def _xml_response(xml_str: str, sru_ver: str, status: int = 200) -> Response:
     resp.headers["X-SRU-Version"] = ver_token
     return resp
 
+MAX_COLLAPSE_SCAN = 5000  # Obergrenze geprüfter Treffer bei x-collapse-duplicates (Anfragezeit begrenzen)
+
+def _collapsed_hits(qry, wanted: int, dups, loader, batch: int = 100, sort=None):
+    """x-collapse-duplicates: ein Treffer pro Dubletten-Cluster (dedup.collapse_hits), Scan gedeckelt."""
+    hits, _ = dedup.collapse_hits(app.searcher, qry, wanted, dups,
+                                  lambda doc_id: loader.load(doc_id, KEY_FIELDS).get("doc_key"),
+                                  batch=batch, max_scan=min(max(wanted * 20, batch), MAX_COLLAPSE_SCAN), sort=sort)
+    return hits
+
 @app.route("/sru", methods=["GET"])
 def sru_search():
     _ensure_lucene()
@@ -285,7 +531,8 @@ def sru_search():
             val = x_fcs_param.strip().lower() if isinstance(x_fcs_param, str) else ""
             if val in ("", "true", "1", "yes"):
                 probe_ver = _req_sru_version() or "2.0"
-                xml = fcs_explain_xml(app.explain_meta, version=probe_ver)
+                with fcs_metrics.phase("xml"):
+                    xml = fcs_explain_xml(app.explain_meta, version=probe_ver)
                 return _xml_response(xml, probe_ver, 200)
         # ---------------------------------------------------------------------
 
@@ -298,9 +545,13 @@ def sru_search():
 
 
         if op == "explain":
-            xml = fcs_explain_xml(app.explain_meta, version=sru_ver)
+            with fcs_metrics.phase("xml"):
+                xml = fcs_explain_xml(app.explain_meta, version=sru_ver)
             return _xml_response(xml, sru_ver, 200)
 
+        if op == "scan":
+            return sru_scan(sru_ver)
+
         if op != "searchretrieve":
             diag = sru_diagnostic_xml(
                 code="7",
@@ -317,16 +568,18 @@ def sru_search():
         query = raw_query  # echoed string for XML
         qtext = ""
 
-        # Accept cql.serverChoice="..."
-        m = re.match(r'^cql\.serverChoice\s*=\s*"(?P<q>.*)"$', raw_query)
-        if m:
-            qtext = m.group("q")
-        else:
-            # If it's already a plain term or empty, just use as-is
-            qtext = raw_query
+        with fcs_metrics.phase("cql"):
+            # Accept cql.serverChoice="..."
+            m = re.match(r'^cql\.serverChoice\s*=\s*"(?P<q>.*)"$', raw_query)
+            if m:
+                qtext = m.group("q")
+            else:
+                # If it's already a plain term or empty, just use as-is
+                qtext = raw_query
 
         # Build Lucene query (falls back to MatchAll if empty)
-        qry = build_query(qtext)
+        with fcs_metrics.phase("build_query"):
+            qry = build_query(qtext)
 
         # --- SRU 2.0: maximumRecords (Default 10; 0 allowed) ---
         maxre_raw = request.args.get('maximumRecords') or request.args.get('maximumrecords')
@@ -346,19 +599,41 @@ def sru_search():
         if start < 1:
             start = 1
 
-        # Count first
-        total = app.searcher.count(qry)
+        # x-sort: relevance (Default) | date | date-desc | reading – date nutzt die Index-Sortierung
+        sort_mode = (request.args.get("x-sort") or "relevance").strip().lower()
+        if sort_mode not in sorting.SORT_MODES:
+            diag = sru_diagnostic_xml(code="6", message="Unsupported parameter value",
+                                      details=f"x-sort={sort_mode}", version=sru_ver)
+            return _xml_response(diag, sru_ver, 200)
+        sort = sorting.make_sort(sort_mode)
+
+        # x-group: issue | magazine – ein Record pro Gruppe (Top-Artikel), numberOfRecords = Anzahl Gruppen
+        group_mode = (request.args.get("x-group") or "").strip().lower() or None
+        if group_mode and group_mode not in grouping.GROUP_MODES:
+            diag = sru_diagnostic_xml(code="6", message="Unsupported parameter value",
+                                      details=f"x-group={group_mode}", version=sru_ver)
+            return _xml_response(diag, sru_ver, 200)
+
+        # Count first (gruppiert: Seite und Gruppenzahl kommen aus demselben Durchlauf)
+        groups = None
+        with fcs_metrics.phase("count"):
+            if group_mode:
+                groups, total, _ = grouping.grouped_search(app.searcher, qry, group_mode, max(maxre, 1),
+                                                           offset=start - 1, sort=sort)
+            else:
+                total = app.searcher.count(qry)
 
         # maximumRecords == 0 - return only numberOfRecords
         if maxre == 0:
-            xml = fcs_searchretrieve_xml(
-                records=[],
-                total=total,
-                start_record=start,
-                maximum_records=0,
-                query_str=query,
-                version=sru_ver,
-            )
+            with fcs_metrics.phase("xml"):
+                xml = fcs_searchretrieve_xml(
+                    records=[],
+                    total=total,
+                    start_record=start,
+                    maximum_records=0,
+                    query_str=query,
+                    version=sru_ver,
+                )
             return _xml_response(xml, sru_ver, 200)
 
         # Perform search and page
@@ -370,33 +645,58 @@ def sru_search():
         if fetch > 1000:
             fetch = 1000
 
-        top = app.searcher.search(qry, fetch)
-        hits = top.scoreDocs
+        collapse = (request.args.get("x-collapse-duplicates") or "").strip().lower() in ("1", "true", "yes")
+        dups = dedup.load_cached(app.index_dir) if collapse else None
+
+        # eine StoredFields-Instanz pro Request; Records brauchen nur Titel + Extents, nie content
+        loader = DocLoader(app.reader, RECORD_FIELDS)
 
-        slice_from = max(0, start - 1)
-        slice_to = min(len(hits), slice_from + maxre)
-        window = hits[slice_from:slice_to]
+        group_hits = {}
+        if groups is not None:
+            window = [sd for _, sd, _ in groups]
+            group_hits = {sd.doc: n for _, sd, n in groups}
+        else:
+            with fcs_metrics.phase("search"):
+                if dups is not None:
+                    # numberOfRecords bleibt die ungekürzte Trefferzahl; nur die Records werden entdoppelt
+                    hits = _collapsed_hits(qry, fetch, dups, loader, sort=sort)
+                elif sort is not None:
+                    hits = app.searcher.search(qry, fetch, sort).scoreDocs
+                else:
+                    hits = app.searcher.search(qry, fetch).scoreDocs
+
+            slice_from = max(0, start - 1)
+            slice_to = min(len(hits), slice_from + maxre)
+            window = hits[slice_from:slice_to]
+
+        with fcs_metrics.phase("stored"):
+            docs = loader.load_all([sd.doc for sd in window])
 
         records = []
-        for sd in window:
-            # Lucene 9+ way to read stored fields
-            doc = app.reader.storedFields().document(sd.doc)
-            title = doc.get("title") or f"doc-{sd.doc}"
-            rec = {
-                "id": str(sd.doc),
-                "title": title,
-                "kwic": [{"left": "", "match": title, "right": ""}],
-            }
+        for sd, doc in zip(window, docs):
+            with fcs_metrics.phase("kwic"):
+                title = doc.get("title") or f"doc-{sd.doc}"
+                rec = {
+                    "id": str(sd.doc),
+                    "title": title,
+                    "magazine": doc.get("magazine") or "",
+                    "issue_label": doc.get("issue_label") or "",
+                    "issue_date_iso": doc.get("issue_date_iso") or "",
+                    "kwic": [{"left": "", "match": title, "right": ""}],
+                }
+                if sd.doc in group_hits:
+                    rec["group_hits"] = str(group_hits[sd.doc])
             records.append(rec)
 
-        xml = fcs_searchretrieve_xml(
-            records=records,
-            total=total,
-            start_record=start,
-            maximum_records=maxre,
-            query_str=query,
-            version=sru_ver,
-        )
+        with fcs_metrics.phase("xml"):
+            xml = fcs_searchretrieve_xml(
+                records=records,
+                total=total,
+                start_record=start,
+                maximum_records=maxre,
+                query_str=query,
+                version=sru_ver,
+            )
         return _xml_response(xml, sru_ver, 200)
 
     except Exception:
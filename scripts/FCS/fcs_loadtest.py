@@ -0,0 +1,302 @@
+# scripts/FCS/fcs_loadtest.py
+# Lasttest für den FCS/SRU-Endpoint: Request-Mix abspielen, Latenz und Fehlerquoten messen.
+#
+#   python scripts/FCS/fcs_loadtest.py                                   # in-process (Flask test_client)
+#   python scripts/FCS/fcs_loadtest.py --url http://127.0.0.1:8088/sru --concurrency 16 --requests 5000
+#   python scripts/FCS/fcs_loadtest.py --log access.log --concurrency 8  # Query-Log abspielen
+#   python scripts/FCS/fcs_loadtest.py --max-p95 150 --max-error-rate 0.01 --json lt.json   # Release-Gate
+#
+# Ohne --log wird ein synthetischer Mix aus den Request-Formen in docs/fcs/sample-*.xml erzeugt:
+# explain, searchRetrieve mit variierendem maximumRecords/startRecord und die CLARIN-Autodetect-Probe.
+# Liefert der Server Server-Timing-Header (fcs_metrics), werden die Phasen mit ausgewertet.
+# Log-Dateien dürfen Access-Log-Zeilen ("GET /sru?… HTTP/1.1"), URLs oder reine Query-Strings enthalten.
+import os, re, sys, json, time, random, argparse, threading, http.client
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit, parse_qsl
+from xml.etree import ElementTree as ET
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+SAMPLES_DIR = os.path.join(REPO_ROOT, "docs", "fcs")
+SRU_NS = {"sru": "http://www.loc.gov/zing/srw/"}
+
+DIAG_RE = re.compile(rb"info:srw/diagnostic/1/(\d+)")
+LOG_RE = re.compile(r"/sru\?(\S+)")
+TIMING_RE = re.compile(r"([\w.-]+);dur=([\d.]+)")
+
+# zusätzliche Suchbegriffe für den synthetischen Mix (neben denen aus den Samples)
+EXTRA_QUERIES = ["covox", "spectrum", "\"zx spectrum\"", "прог*", "cql.serverChoice=\"демо\"", "игра"]
+MAX_RECORDS = [0, 5, 10, 20, 50]
+START_RECORDS = [1, 1, 1, 6, 11, 51]
+# Anteile im synthetischen Mix
+MIX_WEIGHTS = {"search": 0.80, "explain": 0.08, "probe": 0.07, "scan": 0.05}
+
+
+# -------------------
+# Request-Mix
+# -------------------
+def sample_shapes(samples_dir: str = SAMPLES_DIR) -> dict:
+    """Query-Strings und Paging-Werte aus den echoedSearchRetrieveRequest-Blöcken der Samples."""
+    shapes = {"queries": [], "max": [], "start": []}
+    if not os.path.isdir(samples_dir):
+        return shapes
+    for fn in sorted(os.listdir(samples_dir)):
+        if not (fn.startswith("sample-") and fn.endswith(".xml")):
+            continue
+        try:
+            root = ET.parse(os.path.join(samples_dir, fn)).getroot()
+        except ET.ParseError:
+            continue
+        echo = root.find("sru:echoedSearchRetrieveRequest", SRU_NS)
+        if echo is None:
+            continue
+        q = echo.findtext("sru:query", default="", namespaces=SRU_NS)
+        if q and q not in shapes["queries"]:
+            shapes["queries"].append(q)
+        for key, tag in (("max", "sru:maximumRecords"), ("start", "sru:startRecord")):
+            v = echo.findtext(tag, namespaces=SRU_NS)
+            if v and v.isdigit() and int(v) not in shapes[key]:
+                shapes[key].append(int(v))
+    return shapes
+
+
+def classify(params: dict) -> str:
+    if "x-fcs-endpoint-description" in params:
+        return "probe"
+    op = (params.get("operation") or "searchRetrieve").lower()
+    return {"searchretrieve": "search", "explain": "explain", "scan": "scan"}.get(op, op)
+
+
+def synthetic_mix(n: int, seed: int = 42) -> list[dict]:
+    rng = random.Random(seed)
+    shapes = sample_shapes()
+    queries = shapes["queries"] + [q for q in EXTRA_QUERIES if q not in shapes["queries"]]
+    maxes = sorted(set(shapes["max"] + MAX_RECORDS))
+    starts = sorted(set(shapes["start"] + START_RECORDS))
+    kinds, weights = zip(*MIX_WEIGHTS.items())
+    out = []
+    for _ in range(n):
+        kind = rng.choices(kinds, weights)[0]
+        if kind == "search":
+            p = {"operation": "searchRetrieve", "version": "2.0", "query": rng.choice(queries),
+                 "maximumRecords": rng.choice(maxes), "startRecord": rng.choice(starts)}
+        elif kind == "explain":
+            p = {"operation": "explain", "version": "2.0"}
+        elif kind == "probe":
+            p = {"operation": "explain", "version": rng.choice(["1.2", "2.0"]), "x-fcs-endpoint-description": "true"}
+        else:
+            p = {"operation": "scan", "version": "2.0", "scanClause": rng.choice(["magazine", "form", "title=z"])}
+        out.append({k: str(v) for k, v in p.items()})
+    return out
+
+
+def load_log(path: str, limit: int | None = None) -> list[dict]:
+    """Access-Log / URL- / Query-String-Zeilen → Parameter-Dicts (Reihenfolge bleibt erhalten)."""
+    out = []
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            m = LOG_RE.search(line)
+            qs = m.group(1) if m else (line.split("?", 1)[1] if "?" in line else line)
+            params = dict(parse_qsl(qs, keep_blank_values=True))
+            if params:
+                out.append(params)
+            if limit and len(out) >= limit:
+                break
+    return out
+
+
+# -------------------
+# Transport
+# -------------------
+class InProcessClient:
+    """Flask test_client pro Thread; JVM/Reader werden einmal im Hauptthread geladen."""
+
+    def __init__(self, index_dir=None):
+        import fcs_endpoint
+        self.ep = fcs_endpoint
+        if index_dir:
+            fcs_endpoint.init_worker(index_dir=index_dir, warmup=True)
+        else:
+            fcs_endpoint._ensure_lucene()
+        self._tls = threading.local()
+
+    def thread_init(self):
+        self.ep.attach_thread()
+
+    def get(self, params: dict):
+        c = getattr(self._tls, "client", None)
+        if c is None:
+            c = self._tls.client = self.ep.app.test_client()
+        r = c.get("/sru", query_string=params)
+        return r.status_code, r.get_data(), dict(r.headers)
+
+
+class HttpClient:
+    """Keep-Alive-Verbindung pro Thread gegen einen laufenden Server."""
+
+    def __init__(self, url: str, timeout: float = 30.0):
+        u = urlsplit(url)
+        self.host, self.port = u.hostname, u.port or (443 if u.scheme == "https" else 80)
+        self.path = u.path or "/sru"
+        self.https = u.scheme == "https"
+        self.timeout = timeout
+        self._tls = threading.local()
+
+    def thread_init(self):
+        pass
+
+    def _conn(self):
+        c = getattr(self._tls, "conn", None)
+        if c is None:
+            cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            c = self._tls.conn = cls(self.host, self.port, timeout=self.timeout)
+        return c
+
+    def get(self, params: dict):
+        target = f"{self.path}?{urlencode(params)}"
+        for attempt in (0, 1):  # eine Wiederholung bei vom Server geschlossener Keep-Alive-Verbindung
+            c = self._conn()
+            try:
+                c.request("GET", target)
+                r = c.getresponse()
+                return r.status, r.read(), dict(r.getheaders())
+            except (http.client.HTTPException, ConnectionError):
+                c.close()
+                self._tls.conn = None
+                if attempt:
+                    raise
+
+
+# -------------------
+# Lauf + Auswertung
+# -------------------
+def percentiles(samples: list[float]) -> dict:
+    if not samples:
+        return {"n": 0}
+    s = sorted(samples)
+    pick = lambda p: s[min(len(s) - 1, int(p * len(s)))]
+    return {"n": len(s), "mean_ms": round(sum(s) / len(s), 2), "p50_ms": round(pick(0.50), 2),
+            "p95_ms": round(pick(0.95), 2), "p99_ms": round(pick(0.99), 2), "max_ms": round(s[-1], 2)}
+
+
+def server_timing(headers: dict) -> dict:
+    """'count;dur=1.20, search;dur=3.40, total;dur=6.0' → {phase: ms}"""
+    raw = next((v for k, v in headers.items() if k.lower() == "server-timing"), None)
+    return {name: float(dur) for name, dur in TIMING_RE.findall(raw)} if raw else {}
+
+
+def run(client, requests: list[dict], concurrency: int, warmup: int = 20) -> dict:
+    for p in requests[:warmup]:
+        client.get(p)
+
+    lat = defaultdict(list)
+    phases = defaultdict(list)
+    counts = Counter()
+    diag_codes = Counter()
+    lock = threading.Lock()
+
+    def one(params):
+        kind = classify(params)
+        t = time.perf_counter()
+        try:
+            status, body, headers = client.get(params)
+            err = status >= 400
+        except Exception:
+            status, body, headers, err = None, b"", {}, True
+        ms = (time.perf_counter() - t) * 1000
+        m = DIAG_RE.search(body) if body else None
+        timing = server_timing(headers)
+        with lock:
+            for name, dur in timing.items():
+                phases[name].append(dur)
+            lat[kind].append(ms)
+            lat["all"].append(ms)
+            counts[(kind, "n")] += 1
+            if err or (m and m.group(1) == b"1"):  # Diagnostic 1 = Systemfehler
+                counts[(kind, "error")] += 1
+            elif m:
+                counts[(kind, "diagnostic")] += 1
+                diag_codes[m.group(1).decode()] += 1
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, initializer=client.thread_init) as pool:
+        list(pool.map(one, requests))
+    wall = time.perf_counter() - t0
+
+    report = {"requests": len(requests), "concurrency": concurrency, "seconds": round(wall, 3),
+              "throughput_rps": round(len(requests) / wall, 1) if wall else None, "kinds": {}}
+    for kind in sorted(k for k in lat if k != "all"):
+        n = counts[(kind, "n")]
+        report["kinds"][kind] = {**percentiles(lat[kind]),
+                                 "error_rate": round(counts[(kind, "error")] / n, 4),
+                                 "diagnostic_rate": round(counts[(kind, "diagnostic")] / n, 4)}
+    n_all = len(lat["all"])
+    report["all"] = {**percentiles(lat["all"]),
+                     "error_rate": round(sum(v for (k, t), v in counts.items() if t == "error") / n_all, 4) if n_all else 0,
+                     "diagnostic_rate": round(sum(v for (k, t), v in counts.items() if t == "diagnostic") / n_all, 4) if n_all else 0}
+    report["diagnostic_codes"] = dict(diag_codes)
+    report["server_timing"] = {name: percentiles(v) for name, v in sorted(phases.items())}
+    return report
+
+
+def print_report(rep: dict):
+    print(f"\n📈 {rep['requests']} Requests, Parallelität {rep['concurrency']}, "
+          f"{rep['seconds']}s → {rep['throughput_rps']} req/s")
+    print(f"  {'Art':8s} {'n':>6s} {'p50':>8s} {'p95':>8s} {'p99':>8s} {'Fehler':>7s} {'Diag':>7s}")
+    for kind, r in list(rep["kinds"].items()) + [("gesamt", rep["all"])]:
+        print(f"  {kind:8s} {r.get('n', 0):6d} {r.get('p50_ms', 0):8.2f} {r.get('p95_ms', 0):8.2f} "
+              f"{r.get('p99_ms', 0):8.2f} {r['error_rate'] * 100:6.2f}% {r['diagnostic_rate'] * 100:6.2f}%")
+    if rep["diagnostic_codes"]:
+        print(f"  Diagnostics: {rep['diagnostic_codes']}")
+    if rep["server_timing"]:
+        print("  Server-Timing (Phase: n / p50 / p95 ms):")
+        for name, r in rep["server_timing"].items():
+            print(f"    {name:12s} {r['n']:6d} {r['p50_ms']:8.2f} {r['p95_ms']:8.2f}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Lasttest für den FCS/SRU-Endpoint")
+    ap.add_argument("--url", default=None, help="laufender Endpoint (z.B. http://127.0.0.1:8088/sru); sonst in-process")
+    ap.add_argument("--index-dir", default=None, help="nur in-process: Indexpfad (Default: fcs_endpoint.INDEX_DIR)")
+    ap.add_argument("--log", default=None, help="Query-Log zum Abspielen statt synthetischem Mix")
+    ap.add_argument("--requests", type=int, default=1000, help="Anzahl Requests (synthetisch) bzw. Limit (Log)")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--warmup", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--json", default=None, help="Bericht als JSON schreiben")
+    ap.add_argument("--max-p95", type=float, default=None, help="Gate: p95 gesamt in ms")
+    ap.add_argument("--max-error-rate", type=float, default=None, help="Gate: Fehlerquote gesamt (0..1)")
+    args = ap.parse_args()
+
+    reqs = load_log(args.log, args.requests) if args.log else synthetic_mix(args.requests, args.seed)
+    if not reqs:
+        print("❌ Keine Requests zum Abspielen.")
+        sys.exit(2)
+    client = HttpClient(args.url) if args.url else InProcessClient(args.index_dir)
+    print(f"🚦 {len(reqs)} Requests ({'Log' if args.log else 'synthetisch'}) → {args.url or 'in-process'}")
+
+    rep = run(client, reqs, args.concurrency, args.warmup)
+    rep["target"] = args.url or "in-process"
+    rep["source"] = args.log or f"synthetic(seed={args.seed})"
+    print_report(rep)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rep, f, ensure_ascii=False, indent=2)
+        print(f"📝 Bericht: {args.json}")
+
+    failed = []
+    if args.max_p95 is not None and rep["all"].get("p95_ms", 0) > args.max_p95:
+        failed.append(f"p95 {rep['all']['p95_ms']} ms > {args.max_p95} ms")
+    if args.max_error_rate is not None and rep["all"]["error_rate"] > args.max_error_rate:
+        failed.append(f"Fehlerquote {rep['all']['error_rate']} > {args.max_error_rate}")
+    if failed:
+        print("❌ Gate verfehlt: " + "; ".join(failed))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# scripts/FCS/fcs_metrics.py
+# Phasen-Timing für den FCS-Endpoint: Server-Timing-Header pro Request und Prometheus-Histogramme auf /metrics.
+#
+#   with fcs_metrics.phase("count"):
+#       total = app.searcher.count(qry)
+#
+# Abschalten mit FCS_METRICS=0 – phase() liefert dann einen geteilten nullcontext,
+# install() registriert keine Hooks, der Hot Path kostet nur einen Funktionsaufruf.
+import os, time, threading
+from contextlib import nullcontext
+
+from flask import Response, request
+
+ENABLED = os.environ.get("FCS_METRICS", "1").strip().lower() not in ("0", "false", "off", "no")
+
+# Sekunden, Prometheus-Konvention
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+OPERATIONS = ("searchretrieve", "explain", "scan", "probe", "related")
+TIMED_PATHS = ("/sru", "/related")
+
+_NULL = nullcontext()
+_tls = threading.local()
+
+
+class Histogram:
+    """Feste Buckets, ein Lock pro Histogramm; Labels als Tupel-Schlüssel."""
+
+    def __init__(self, name: str, help_text: str, label_names: tuple):
+        self.name = name
+        self.help = help_text
+        self.label_names = label_names
+        self._lock = threading.Lock()
+        self._series = {}  # labels -> [bucket_counts..., sum, count]
+
+    def observe(self, labels: tuple, seconds: float):
+        i = 0
+        while i < len(BUCKETS) and seconds > BUCKETS[i]:
+            i += 1
+        with self._lock:
+            s = self._series.get(labels)
+            if s is None:
+                s = self._series[labels] = [0] * (len(BUCKETS) + 1) + [0.0, 0]
+            s[i] += 1
+            s[-2] += seconds
+            s[-1] += 1
+
+    def render(self) -> list[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(k, list(v)) for k, v in sorted(self._series.items())]
+        for labels, s in items:
+            lbl = ",".join(f'{n}="{v}"' for n, v in zip(self.label_names, labels))
+            sep = "," if lbl else ""
+            cum = 0
+            for b, c in zip(BUCKETS, s):
+                cum += c
+                out.append(f'{self.name}_bucket{{{lbl}{sep}le="{b}"}} {cum}')
+            cum += s[len(BUCKETS)]
+            out.append(f'{self.name}_bucket{{{lbl}{sep}le="+Inf"}} {cum}')
+            braced = f"{{{lbl}}}" if lbl else ""
+            out.append(f"{self.name}_sum{braced} {s[-2]:.6f}")
+            out.append(f"{self.name}_count{braced} {s[-1]}")
+        return out
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: tuple):
+        self.name = name
+        self.help = help_text
+        self.label_names = label_names
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, labels: tuple, n: int = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + n
+
+    def render(self) -> list[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, v in items:
+            lbl = ",".join(f'{n}="{val}"' for n, val in zip(self.label_names, labels))
+            out.append(f"{self.name}{{{lbl}}} {v}")
+        return out
+
+
+REQUEST_SECONDS = Histogram("fcs_request_duration_seconds", "SRU-Request-Dauer", ("operation",))
+PHASE_SECONDS = Histogram("fcs_phase_duration_seconds", "Dauer einzelner Verarbeitungsphasen", ("phase",))
+REQUESTS = Counter("fcs_requests_total", "SRU-Requests nach Operation und Ergebnis", ("operation", "outcome"))
+
+
+class _Phase:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        dt = time.perf_counter() - self.t0
+        phases = getattr(_tls, "phases", None)
+        if phases is not None:
+            phases[self.name] = phases.get(self.name, 0.0) + dt
+        return False
+
+
+def phase(name: str):
+    """Kontextmanager für eine Phase; mehrfach genutzte Phasen (z.B. stored pro Treffer) werden addiert."""
+    return _Phase(name) if ENABLED else _NULL
+
+
+def _operation() -> str:
+    if request.path == "/related":
+        return "related"
+    if "x-fcs-endpoint-description" in request.args:
+        return "probe"
+    op = (request.args.get("operation") or "searchRetrieve").strip().lower()
+    return op if op in OPERATIONS else "other"
+
+
+def _before():
+    if request.path in TIMED_PATHS:
+        _tls.phases = {}
+        _tls.t0 = time.perf_counter()
+    else:
+        _tls.phases = None
+
+
+def _after(resp: Response):
+    phases = getattr(_tls, "phases", None)
+    if phases is None:
+        return resp
+    total = time.perf_counter() - _tls.t0
+    _tls.phases = None
+
+    op = _operation()
+    outcome = "ok"
+    if resp.status_code >= 400:
+        outcome = "error"
+    elif not resp.direct_passthrough:
+        body = resp.get_data()
+        if b"info:srw/diagnostic/1/1<" in body:  # Systemfehler
+            outcome = "error"
+        elif b"info:srw/diagnostic/1/" in body:
+            outcome = "diagnostic"
+
+    REQUEST_SECONDS.observe((op,), total)
+    REQUESTS.inc((op, outcome))
+    for name, dt in phases.items():
+        PHASE_SECONDS.observe((name,), dt)
+
+    timing = [f"{name};dur={dt * 1000:.2f}" for name, dt in phases.items()]
+    timing.append(f"total;dur={total * 1000:.2f}")
+    resp.headers["Server-Timing"] = ", ".join(timing)
+    return resp
+
+
+def render() -> str:
+    lines = []
+    for m in (REQUESTS, REQUEST_SECONDS, PHASE_SECONDS):
+        lines.extend(m.render())
+    return "\n".join(lines) + "\n"
+
+
+def install(app):
+    """before/after_request-Hooks und /metrics an der Flask-App registrieren."""
+    if ENABLED:
+        app.before_request(_before)
+        app.after_request(_after)
+
+    @app.route("/metrics", methods=["GET"])
+    def metrics():
+        body = render() if ENABLED else "# fcs metrics disabled (FCS_METRICS=0)\n"
+        return Response(body, mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,163 @@
+# scripts/FCS/fcs_serve.py
+# Produktionsmodus für den FCS-Endpoint: Pre-Fork-WSGI-Server nur mit der Standardbibliothek.
+#
+#   python scripts/FCS/fcs_serve.py --bind 127.0.0.1:8088 --workers 4 --threads 8
+#
+# Der Elternprozess bindet den Socket und startet N Worker per fork(). Jeder Worker
+# initialisiert danach seine eigene JVM, öffnet einen mmap-Reader (fcs_endpoint.init_worker)
+# und bedient Requests aus einem festen Thread-Pool, dessen Threads schon beim Start
+# an die JVM gehängt werden. Der Elternprozess startet abgestürzte Worker neu.
+#
+# Hinweis: Die JVM ist nicht fork-fest – im Elternprozess darf lucene.initVM() nie laufen.
+# (Mit gunicorn ginge dasselbe über einen post_worker_init-Hook, der init_worker() aufruft.)
+import argparse, os, signal, socket, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.simple_server import WSGIServer, WSGIRequestHandler
+
+import fcs_endpoint
+
+
+class _Handler(WSGIRequestHandler):
+    quiet = False
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            sys.stderr.write("[%d] %s - %s\n" % (os.getpid(), self.address_string(), format % args))
+
+
+class PooledWSGIServer(WSGIServer):
+    """WSGIServer auf einem geerbten Socket; Requests laufen im vorab angehängten Thread-Pool."""
+
+    def __init__(self, sock, threads, handler=_Handler):
+        super().__init__(sock.getsockname()[:2], handler, bind_and_activate=False)
+        self.socket.close()
+        self.socket = sock
+        host, port = sock.getsockname()[:2]
+        self.server_name = socket.getfqdn(host)
+        self.server_port = port
+        self.setup_environ()
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="fcs",
+                                       initializer=fcs_endpoint.attach_thread)
+        # alle Threads sofort starten (und damit anhängen), nicht erst beim ersten Request;
+        # die Barriere verhindert, dass der Pool einen schon freien Thread wiederverwendet
+        barrier = threading.Barrier(threads)
+        for f in [self.pool.submit(barrier.wait, 10) for _ in range(threads)]:
+            f.result()
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            request.setblocking(True)
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        self.pool.shutdown(wait=False)
+        super().server_close()
+
+
+def _parse_bind(bind: str):
+    host, _, port = bind.rpartition(":")
+    return (host or "127.0.0.1"), int(port)
+
+
+def _listen(bind: str, backlog: int):
+    host, port = _parse_bind(bind)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    # nicht blockierend: mehrere Worker warten auf demselben Socket, wer zu spät kommt, geht leer aus
+    sock.setblocking(False)
+    return sock
+
+
+def _worker(sock, args):
+    def _stop(signum, frame):
+        raise SystemExit(0)
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    t0 = time.perf_counter()
+    fcs_endpoint.init_worker(index_dir=args.index_dir, mmap=not args.no_mmap, warmup=True)
+    _Handler.quiet = args.quiet
+    server = PooledWSGIServer(sock, args.threads)
+    server.set_app(fcs_endpoint.app)
+    print(f"👷 Worker {os.getpid()} bereit ({time.perf_counter() - t0:.2f}s, {args.threads} Threads)", flush=True)
+    try:
+        server.serve_forever(poll_interval=0.5)
+    finally:
+        server.server_close()
+        fcs_endpoint._close_lucene()
+
+
+def _spawn(sock, args) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _worker(sock, args)
+        except SystemExit as e:
+            code = e.code or 0
+        except Exception as e:
+            print(f"❌ Worker {os.getpid()} abgebrochen: {e}", file=sys.stderr, flush=True)
+            code = 1
+        os._exit(code)
+    return pid
+
+
+def main():
+    ap = argparse.ArgumentParser(description="FCS-Endpoint Produktionsserver (Pre-Fork, JVM-Preload)")
+    ap.add_argument("--bind", default="127.0.0.1:8088", help="host:port (Default: 127.0.0.1:8088)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Anzahl Worker-Prozesse")
+    ap.add_argument("--threads", type=int, default=8, help="Request-Threads je Worker")
+    ap.add_argument("--backlog", type=int, default=256, help="listen()-Backlog")
+    ap.add_argument("--index-dir", default=None, help="Indexpfad (Default: fcs_endpoint.INDEX_DIR)")
+    ap.add_argument("--no-mmap", action="store_true", help="FSDirectory statt MMapDirectory")
+    ap.add_argument("--quiet", action="store_true", help="keine Access-Logs")
+    args = ap.parse_args()
+
+    sock = _listen(args.bind, args.backlog)
+    print(f"🚀 FCS-Server auf {args.bind} – {args.workers} Worker × {args.threads} Threads", flush=True)
+
+    workers = set()
+    stopping = False
+
+    def _shutdown(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    for _ in range(args.workers):
+        workers.add(_spawn(sock, args))
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        workers.discard(pid)
+        if not stopping:
+            print(f"⚠️ Worker {pid} beendet (Status {status}) – starte neu", file=sys.stderr, flush=True)
+            time.sleep(0.5)  # kein Crash-Loop im Takt der CPU
+            workers.add(_spawn(sock, args))
+
+    sock.close()
+    print("✅ FCS-Server beendet.")
+
+
+if __name__ == "__main__":
+    main()
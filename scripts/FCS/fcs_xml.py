@@ -102,6 +102,7 @@ def fcs_searchretrieve_xml(*, records, total, start_record, maximum_records, que
             ("magazine", r.get("magazine","")),
             ("issue",    r.get("issue_label","")),
             ("date",     r.get("issue_date_iso","")),
+            ("hits",     r.get("group_hits","")),   # nur bei x-group: Treffer in der Gruppe
         ]:
             if val:
                 x = etree.SubElement(exts, etree.QName(NS_FCS, "extent"))
@@ -135,4 +136,24 @@ def sru_diagnostic_xml(*, code: str, message: str = "", details: str = "", versi
     if details:
         etree.SubElement(d, etree.QName(NS_SRU, "details")).text = details
 
-    return etree.tostring(root, xml_declaration=True, encoding="UTF-8")
\ No newline at end of file
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8")
+
+def sru_scan_xml(*, terms, scan_clause, response_position, maximum_terms, version: str = "2.0") -> bytes:
+    """terms: Liste von (value, numberOfRecords) in Indexreihenfolge."""
+    root = _sru_root("scanResponse")
+    etree.SubElement(root, etree.QName(NS_SRU, "version")).text = version
+
+    tl = etree.SubElement(root, etree.QName(NS_SRU, "terms"))
+    for value, count in terms:
+        t = etree.SubElement(tl, etree.QName(NS_SRU, "term"))
+        etree.SubElement(t, etree.QName(NS_SRU, "value")).text           = value
+        etree.SubElement(t, etree.QName(NS_SRU, "numberOfRecords")).text = str(count)
+        etree.SubElement(t, etree.QName(NS_SRU, "displayTerm")).text     = value
+
+    echo = etree.SubElement(root, etree.QName(NS_SRU, "echoedScanRequest"))
+    etree.SubElement(echo, etree.QName(NS_SRU, "version")).text          = version
+    etree.SubElement(echo, etree.QName(NS_SRU, "scanClause")).text       = scan_clause or ""
+    etree.SubElement(echo, etree.QName(NS_SRU, "responsePosition")).text = str(response_position)
+    etree.SubElement(echo, etree.QName(NS_SRU, "maximumTerms")).text     = str(maximum_terms)
+
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8")
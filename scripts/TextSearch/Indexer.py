@@ -1,15 +1,32 @@
-import os, json, lucene
+import os, sys, json, hashlib, argparse, lucene
 from datetime import datetime
 from java.nio.file import Paths
+from java.util import HashMap, HashSet
 from org.apache.lucene.analysis.standard import StandardAnalyzer
+from org.apache.lucene.analysis.miscellaneous import PerFieldAnalyzerWrapper
 from org.apache.lucene.document import (
     Document, Field, TextField, StringField,
     StoredField, IntPoint, LongPoint,
     NumericDocValuesField
 )
-from org.apache.lucene.index import IndexWriter, IndexWriterConfig
+from org.apache.lucene.index import (
+    DirectoryReader, IndexWriter, IndexWriterConfig, MultiBits, Term, TieredMergePolicy
+)
 from org.apache.lucene.store import FSDirectory
 
+from infix import TRIGRAM_FIELD, trigram_analyzer, trigram_field
+import dedup
+import meta_table
+import sorting
+import grouping
+import related
+import semantic
+
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+from zxpress import hashstore  # noqa: E402
+
 CORPUS_ROOT = "/Users/stoia1/Desktop/Website/DigitProject/data/zxpress/magazines"
 INDEX_DIR   = "/Users/stoia1/Desktop/Website/DigitProject/index_dir"
 
@@ -25,20 +42,170 @@ def iso_to_epoch(iso_date):
         return None
 
 
-def build_index():
-    lucene.initVM(vmargs=['-Djava.awt.headless=true'])
-    print("✅ JVM bereit – starte Indexaufbau")
+def ensure_vm():
+    """JVM nur einmal starten; weitere Aufrufe (z.B. aus Benchmark/Wartung) hängen nur den Thread an."""
+    env = lucene.getVMEnv()
+    if env is None:
+        lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+    else:
+        env.attachCurrentThread()
+
+
+def make_codec(stored_mode="speed"):
+    """
+    Default-Codec der installierten Lucene-Version mit BEST_SPEED oder BEST_COMPRESSION
+    für die Stored Fields. None, falls keine bekannte Codec-Klasse gefunden wird.
+    """
+    for name in ("Lucene101Codec", "Lucene100Codec", "Lucene99Codec", "Lucene95Codec"):
+        try:
+            mod = __import__(f"org.apache.lucene.codecs.{name[:-5].lower()}", fromlist=[name])
+            cls = getattr(mod, name)
+        except (ImportError, AttributeError):
+            continue
+        mode = cls.Mode.BEST_COMPRESSION if stored_mode == "compression" else cls.Mode.BEST_SPEED
+        return cls(mode)
+    return None
 
-    store = FSDirectory.open(Paths.get(INDEX_DIR))
-    analyzer = StandardAnalyzer()
+
+def make_writer_config(analyzer, stored_mode="speed", compound=True, index_sort=True):
+    """
+    IndexWriterConfig mit Codec-Modus, Compound-/Non-Compound-Segmenten und Index-Sortierung
+    (Datum → Magazin → order, siehe sorting.py).
+    """
     config = IndexWriterConfig(analyzer)
-    config.setOpenMode(IndexWriterConfig.OpenMode.CREATE)
+    if index_sort:
+        config.setIndexSort(sorting.index_sort())
+    codec = make_codec(stored_mode)
+    if codec is not None:
+        config.setCodec(codec)
+    config.setUseCompoundFile(compound)
+    mp = TieredMergePolicy()
+    mp.setNoCFSRatio(1.0 if compound else 0.0)
+    config.setMergePolicy(mp)
+    return config
+
+
+def make_analyzer():
+    # content/title: Standard; content_tri: Zeichen-Trigramme für Infix-Suche
+    per_field = HashMap()
+    per_field.put(TRIGRAM_FIELD, trigram_analyzer())
+    return PerFieldAnalyzerWrapper(StandardAnalyzer(), per_field)
+
+
+def existing_fingerprints(store):
+    """
+    doc_key → source_sha1 aller lebenden Dokumente eines vorhandenen Index.
+    None, wenn kein Index existiert oder er noch ohne doc_key gebaut wurde (dann Vollaufbau).
+    """
+    if not DirectoryReader.indexExists(store):
+        return None
+    reader = DirectoryReader.open(store)
+    try:
+        live = MultiBits.getLiveDocs(reader)
+        sf = reader.storedFields()
+        fields = HashSet()
+        fields.add("doc_key")
+        fields.add("source_sha1")
+        out = {}
+        for i in range(reader.maxDoc()):
+            if live is not None and not live.get(i):
+                continue
+            d = sf.document(i, fields)
+            key = d.get("doc_key")
+            if key is None:
+                return None
+            out[key] = d.get("source_sha1")
+        return out
+    finally:
+        reader.close()
+
+
+def source_fingerprint(*digests):
+    """Gesamt-Fingerabdruck eines Artikels: Text + meta.json + issue.json + magazine.json."""
+    return hashlib.sha1("|".join(d or "-" for d in digests).encode("ascii")).hexdigest()
+
+
+def build_index(corpus_root=CORPUS_ROOT, index_dir=INDEX_DIR, stored_mode="speed", compound=True,
+                incremental=False, dedup_signatures=True, skip_exact_dups=False, build_meta=True,
+                term_vectors=True, lsa_model=None):
+    """
+    Vollaufbau (Default) oder inkrementell: Artikel, deren Fingerabdruck (sha1 aus dem HashStore,
+    d.h. nur stat()-Kosten) sich nicht geändert hat, werden übersprungen; geänderte per
+    updateDocument(doc_key) ersetzt, verschwundene gelöscht.
+
+    dedup_signatures: MinHash-Signatur pro Artikel → <index_dir>_dedup (siehe dedup.py).
+    skip_exact_dups: Artikel mit bereits indexiertem content_sha1 nicht erneut indexieren
+    (nur in der Dublettenliste geführt). Nach Löschungen im Korpus ggf. Vollaufbau.
+    build_meta: spaltenorientierte Metadatentabelle → <index_dir>_meta (siehe meta_table.py).
+    term_vectors: Term-Vektoren für content speichern (ähnliche Artikel, siehe related.py).
+    lsa_model: Ordner eines mit semantic.py trainierten LSA-Modells → Dokumentvektoren (HNSW)
+    für die semantische Suche; die model_id landet in den Commit-Daten.
+    """
+    ensure_vm()
+    print(f"✅ JVM bereit – starte Indexaufbau (stored={stored_mode}, compound={compound}, "
+          f"incremental={incremental})")
+
+    store = FSDirectory.open(Paths.get(index_dir))
+    existing = existing_fingerprints(store) if incremental else None
+    if incremental and existing is None:
+        print("ℹ️  Kein Index mit doc_key vorhanden – Vollaufbau")
+        incremental = False
+    if incremental and not sorting.index_is_sorted(store):
+        print("ℹ️  Vorhandener Index ohne Index-Sortierung – Vollaufbau")
+        incremental = False
+    if incremental and not grouping.index_has_groups(store):
+        print("ℹ️  Vorhandener Index ohne Ausgaben-Gruppierung (group_issue) – Vollaufbau")
+        incremental = False
+    if incremental and related.index_term_vectors(store) not in (None, term_vectors):
+        print("ℹ️  Term-Vektoren von content weichen vom vorhandenen Index ab – Vollaufbau")
+        incremental = False
+    model = None
+    if lsa_model:
+        model = semantic.LsaModel.load(lsa_model)
+        if model is None:
+            raise SystemExit(f"❌ Kein LSA-Modell in {lsa_model} – zuerst semantic.py train ausführen")
+        print(f"🧭 LSA-Modell {model.model_id} ({model.dims} Dimensionen) → Feld {semantic.VECTOR_FIELD}")
+        if incremental and semantic.stored_model_id(store) != model.model_id:
+            print("ℹ️  Vorhandene Vektoren stammen aus einem anderen Modell – Vollaufbau")
+            incremental = False
+    elif incremental and semantic.stored_model_id(store):
+        # Index hat Vektoren: neue/geänderte Artikel brauchen sie auch, sonst wäre der Index nur
+        # teilweise semantisch durchsuchbar → passendes Modell neben dem Index weiterverwenden
+        stored = semantic.stored_model_id(store)
+        model = semantic.LsaModel.load(semantic.lsa_dir_for(index_dir))
+        if model is not None and model.model_id == stored:
+            print(f"🧭 Vorhandene Vektoren: LSA-Modell {stored} aus {semantic.lsa_dir_for(index_dir)} weiterverwendet")
+        else:
+            model = None
+            print(f"ℹ️  Index enthält Vektoren des LSA-Modells {stored}, das Modell liegt nicht mehr in "
+                  f"{semantic.lsa_dir_for(index_dir)} – Vollaufbau ohne Vektoren "
+                  f"(semantische Suche erst wieder nach Indexer.py --lsa-model)")
+            incremental = False
+    analyzer = make_analyzer()
+
+    config = make_writer_config(analyzer, stored_mode=stored_mode, compound=compound)
+    config.setOpenMode(IndexWriterConfig.OpenMode.CREATE_OR_APPEND if incremental
+                       else IndexWriterConfig.OpenMode.CREATE)
     writer = IndexWriter(store, config)
+    hashes = hashstore.get()
+
+    dedup_path = dedup.dedup_dir_for(index_dir)
+    dups = None
+    if dedup_signatures or skip_exact_dups:
+        dups = (dedup.DupIndex.load(dedup_path) if incremental else None) or dedup.DupIndex()
+    first_by_sha1 = {}
+    if incremental and dups is not None:
+        for key, h in dups.sha1.items():
+            if h and key in existing and key not in dups.skipped:
+                first_by_sha1.setdefault(h, key)
 
     article_count = 0
+    unchanged = 0
+    skipped_dups = 0
+    seen = set()
 
-    for mag in os.listdir(CORPUS_ROOT):
-        mag_path = os.path.join(CORPUS_ROOT, mag)
+    for mag in os.listdir(corpus_root):
+        mag_path = os.path.join(corpus_root, mag)
         if not os.path.isdir(mag_path):
             continue
 
@@ -48,6 +215,7 @@ def build_index():
             continue
         with open(mag_meta_path, "r", encoding="utf-8") as f:
             mag_meta = json.load(f)
+        mag_sha1 = hashes.sha1(mag_meta_path)
 
         magazine_name = mag_meta.get("magazine_name")
         magazine_id   = mag_meta.get("magazine_id")
@@ -72,6 +240,7 @@ def build_index():
                 continue
             with open(issue_meta_path, "r", encoding="utf-8") as f:
                 issue_meta = json.load(f)
+            issue_sha1 = hashes.sha1(issue_meta_path)
 
             issue_label = issue_meta.get("issue_label")
             issue_date_iso = issue_meta.get("issue_date_iso")
@@ -89,20 +258,58 @@ def build_index():
                 if not (os.path.exists(meta_path) and os.path.exists(text_path)):
                     continue
 
+                doc_key = "/".join((mag, "issues", issue, "articles", art))
+                content_sha1 = hashes.sha1(text_path)
+                source_sha1 = source_fingerprint(content_sha1, hashes.sha1(meta_path), issue_sha1, mag_sha1)
+                seen.add(doc_key)
+                if incremental and existing.get(doc_key) == source_sha1:
+                    unchanged += 1
+                    if dups is not None and doc_key not in dups:
+                        with open(text_path, "r", encoding="utf-8") as f:
+                            dups.add(doc_key, content_sha1, f.read())
+                    continue
+
+                if skip_exact_dups and content_sha1:
+                    canonical = first_by_sha1.setdefault(content_sha1, doc_key)
+                    if canonical != doc_key and canonical in dups:
+                        dups.add_skipped(doc_key, canonical)
+                        if incremental and doc_key in existing:
+                            writer.deleteDocuments(Term("doc_key", doc_key))
+                        skipped_dups += 1
+                        continue
+
                 with open(meta_path, "r", encoding="utf-8") as f:
                     meta = json.load(f)
                 with open(text_path, "r", encoding="utf-8") as f:
                     content = f.read()
+                if dups is not None:
+                    dups.add(doc_key, content_sha1, content)
 
                 doc = Document()
 
-                # Volltext
-                doc.add(TextField("content", content, Field.Store.YES))
+                # Volltext (mit Term-Vektoren für MoreLikeThis)
+                doc.add(related.content_field(content, term_vectors))
+                # Trigramm-Unterfeld (nicht gespeichert) für Teilwortsuche
+                doc.add(trigram_field(content))
+                # Dokumentvektor (LSA) für die semantische Suche
+                if model is not None:
+                    vec = model.embed_text(content, analyzer)
+                    if vec is not None:
+                        doc.add(semantic.vector_field(vec))
 
                 # Basis-Metadaten
                 doc.add(StringField("filename", os.path.basename(text_path), Field.Store.YES))
+                # Änderungserkennung: Schlüssel (relativer Artikelpfad) und Hashes
+                doc.add(StringField("doc_key", doc_key, Field.Store.YES))
+                if content_sha1:
+                    doc.add(StringField("content_sha1", content_sha1, Field.Store.YES))
+                doc.add(StoredField("source_sha1", source_sha1))
                 if magazine_name:
                     doc.add(StringField("magazine", magazine_name, Field.Store.YES))
+                # für Sortierung (Leseordnung, Index-Sortierung):
+                sorting.sort_fields(doc, magazine_name, issue_label)
+                # für Gruppierung nach Ausgabe:
+                grouping.group_fields(doc, grouping.issue_group_key(mag, issue))
                 if magazine_id:
                     doc.add(IntPoint("magazine_id", int(magazine_id)))
                     doc.add(StoredField("magazine_id_s", int(magazine_id)))
@@ -143,21 +350,76 @@ def build_index():
 
                 title = meta.get("title_h1") or meta.get("title_link")
                 if title:
-                    doc.add(StoredField("title", " ".join(title.split())))
+                    # indexiert (Suche über content+title, SRU-Scan auf title) und gespeichert
+                    doc.add(TextField("title", " ".join(title.split()), Field.Store.YES))
                 if meta.get("article_url"):
                     doc.add(StoredField("article_url", meta["article_url"]))
                 if meta.get("print_url"):
                     doc.add(StoredField("print_url", meta["print_url"]))
 
-                writer.addDocument(doc)
+                if incremental:
+                    writer.updateDocument(Term("doc_key", doc_key), doc)
+                else:
+                    writer.addDocument(doc)
                 article_count += 1
                 if article_count % 500 == 0:
                     print(f"… {article_count} Artikel indexiert")
 
+    removed = 0
+    if incremental:
+        for key in existing.keys() - seen:
+            writer.deleteDocuments(Term("doc_key", key))
+            removed += 1
+
+    writer.setLiveCommitData(semantic.commit_data(model))
     writer.commit()
     writer.close()
-    print(f"🎉 Fertig: {article_count} Artikel indexiert → {INDEX_DIR}")
+
+    if build_meta:
+        mt = meta_table.build_for_index(index_dir)
+        print(f"🧮 Metadatentabelle: {mt.info['num_docs']} Docs → {mt.path}")
+
+    if dups is not None:
+        for key in [k for k in dups.sigs if k not in seen]:
+            dups.remove(key)
+        dups.build_clusters()
+        dups.save(dedup_path)
+        print(f"🧬 Dubletten: {len(dups.clusters)} Cluster, {skipped_dups} exakte Dubletten übersprungen → {dedup_path}")
+    if incremental:
+        print(f"🎉 Fertig: {article_count} Artikel neu/geändert, {unchanged} unverändert, "
+              f"{removed} entfernt → {index_dir}")
+    else:
+        print(f"🎉 Fertig: {article_count} Artikel indexiert → {index_dir}")
+    return article_count
+
+
+def main():
+    ap = argparse.ArgumentParser(description="ZXpress Lucene-Indexaufbau")
+    ap.add_argument("--corpus-root", default=CORPUS_ROOT, help="Wurzel der Magazinordner")
+    ap.add_argument("--index-dir", default=INDEX_DIR, help="Zielordner des Index")
+    ap.add_argument("--stored-mode", choices=["speed", "compression"], default="speed",
+                    help="Stored-Fields-Codec: BEST_SPEED (schnelles Laden) oder BEST_COMPRESSION (kleiner)")
+    ap.add_argument("--no-compound", action="store_true",
+                    help="Segmente als Einzeldateien statt .cfs (weniger Indirektion beim mmap-Lesen)")
+    ap.add_argument("--incremental", action="store_true",
+                    help="nur neue/geänderte Artikel (re)indexieren, entfernte löschen")
+    ap.add_argument("--no-dedup", action="store_true",
+                    help="keine MinHash-Signaturen/Dubletten-Cluster (<index_dir>_dedup) erzeugen")
+    ap.add_argument("--skip-exact-dups", action="store_true",
+                    help="Artikel mit identischem Text (content_sha1) nur einmal indexieren")
+    ap.add_argument("--no-term-vectors", action="store_true",
+                    help="content ohne Term-Vektoren (kleinerer Index, ähnliche Artikel dann per Neu-Analyse)")
+    ap.add_argument("--no-meta-table", action="store_true",
+                    help="keine NumPy-Metadatentabelle (<index_dir>_meta) erzeugen")
+    ap.add_argument("--lsa-model", nargs="?", const="", default=None, metavar="DIR",
+                    help="Dokumentvektoren mit LSA-Modell (Default-Ordner: <index_dir>_lsa, siehe semantic.py)")
+    args = ap.parse_args()
+    build_index(args.corpus_root, args.index_dir, stored_mode=args.stored_mode, compound=not args.no_compound,
+                incremental=args.incremental, dedup_signatures=not args.no_dedup,
+                skip_exact_dups=args.skip_exact_dups, build_meta=not args.no_meta_table,
+                term_vectors=not args.no_term_vectors,
+                lsa_model=(args.lsa_model or semantic.lsa_dir_for(args.index_dir)) if args.lsa_model is not None else None)
 
 
 if __name__ == "__main__":
-    build_index()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -1,7 +1,9 @@
 # scripts/TextSearch/Searcher.py
-import argparse, lucene
+import argparse, json, sys, time, lucene
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from java.nio.file import Paths
+from java.util.concurrent import Executors
 from org.apache.lucene.store import FSDirectory
 from org.apache.lucene.index import DirectoryReader
 from org.apache.lucene.analysis.standard import StandardAnalyzer
@@ -10,6 +12,15 @@ from org.apache.lucene.index import Term
 from org.apache.lucene.queryparser.classic import QueryParser
 from org.apache.lucene.document import LongPoint
 
+from infix import build_infix_query, verify as infix_verify
+import dedup
+import meta_table
+import sorting
+import grouping
+import related
+import semantic
+from doc_loader import DocLoader, KEY_FIELDS, LIST_FIELDS, KWIC_FIELDS
+
 INDEX_DIR = "/Users/stoia1/Desktop/Website/DigitProject/index_dir"
 
 # -------------------
@@ -63,12 +74,36 @@ def _parse_kv_line(line, defaults):
                 out["kwic_window"] = int(v)
             except ValueError:
                 pass
+        elif k in ("infix", "sub"):
+            out["infix"] = v.lower() in ("1", "true", "yes", "ja")
+        elif k == "mode":
+            out["infix"] = v.lower() == "infix"
+            out["semantic"] = v.lower() == "semantic"
+        elif k in ("semantic", "sem"):
+            out["semantic"] = v.lower() in ("1", "true", "yes", "ja")
+        elif k in ("dedup", "collapse"):
+            out["collapse_dups"] = v.lower() in ("1", "true", "yes", "ja")
+        elif k in ("related", "like"):
+            try:
+                out["related"] = int(v)
+            except ValueError:
+                pass
+        elif k in ("other", "other_magazines"):
+            out["other_magazines"] = v.lower() in ("1", "true", "yes", "ja")
+        elif k in ("group", "groupby"):
+            out["group"] = v.lower() if v.lower() in grouping.GROUP_MODES else None
+        elif k in ("sort", "order"):
+            if v.lower() in sorting.SORT_MODES:
+                out["sort"] = v.lower()
     return out
 
+DEFAULTS = dict(q="", magazine=None, form=None, lang="ru",
+                year_from=None, year_to=None, limit=10,
+                kwic_term=None, kwic_window=5, infix=False, collapse_dups=False, sort="relevance",
+                group=None, related=None, other_magazines=False, semantic=False)
+
 def prompt_inputs():
-    defaults = dict(q="", magazine=None, form=None, lang="ru",
-                    year_from=None, year_to=None, limit=10,
-                    kwic_term=None, kwic_window=5)
+    defaults = dict(DEFAULTS)
 
     print("\n====== Einfache Suche ======")
     print("Drücken Sie einfach ENTER, um einen Wert zu überspringen.\n")
@@ -121,18 +156,22 @@ def iso_to_epoch_ms(date_iso):
     dt = datetime.fromisoformat(date_iso).replace(tzinfo=timezone.utc)
     return int(dt.timestamp()*1000)
 
-def kwic(txt, term, window=5, max_snips=3):
-    words = txt.split()
+def kwic_iter(txt, term, window=5):
+    """Alle KWIC-Stellen als (links, Treffer, rechts) – Generator, für Konkordanz-Export ohne Obergrenze."""
     term_low = (term or "").lower()
-    out = []
     if not term_low:
-        return out
+        return
+    words = txt.split()
     for i, w in enumerate(words):
         if term_low in w.lower():
-            s = max(0, i - window); e = min(len(words), i + window + 1)
-            out.append(" ".join(words[s:e]))
-            if len(out) >= max_snips:
-                break
+            yield " ".join(words[max(0, i - window):i]), w, " ".join(words[i + 1:i + window + 1])
+
+def kwic(txt, term, window=5, max_snips=3):
+    out = []
+    for left, match, right in kwic_iter(txt, term, window):
+        out.append(" ".join(p for p in (left, match, right) if p))
+        if len(out) >= max_snips:
+            break
     return out
 
 def _normalize_form(value):
@@ -166,12 +205,22 @@ def _fallback_snippet(text: str, needle: str, chars: int = 180):
     return snippet.strip()
 
 # ---- NEU: Magazin-Resolver ohne TermsEnum ----
+_MAGS_CACHE = {}  # reader.getVersion() -> sortierte Magazinliste (warm im Daemon-Modus)
+
 def _list_magazines(reader):
+    version = reader.getVersion()
+    if version not in _MAGS_CACHE:
+        # Metadatentabelle (Wörterbuch der Magazin-Spalte) statt Stored-Field-Scan, falls aktuell
+        mt = meta_table.load_current(INDEX_DIR, reader)
+        _MAGS_CACHE[version] = mt.live_values("magazine") if mt is not None else _scan_magazines(reader)
+    return _MAGS_CACHE[version]
+
+def _scan_magazines(reader):
     mags = set()
     maxdoc = reader.maxDoc()
-    sf = reader.storedFields()
+    loader = DocLoader(reader, ("magazine",))
     for doc_id in range(maxdoc):
-        d = sf.document(doc_id)
+        d = loader.load(doc_id)
         if d is None:
             continue
         m = d.get("magazine")
@@ -246,10 +295,65 @@ def build_query(qtext, magazine, form, lang, year_from, year_to):
 
     return b.build()
 
+def build_infix(needle, magazine, form, lang, year_from, year_to):
+    """Infix-Modus: Trigramm-Kandidaten (FILTER) + dieselben Metadatenfilter wie build_query."""
+    b = BooleanQuery.Builder()
+    b.add(build_query("", magazine, form, lang, year_from, year_to), BooleanClause.Occur.MUST)
+    b.add(build_infix_query(needle), BooleanClause.Occur.FILTER)
+    return b.build()
+
+def _page(searcher, qry, n, last=None, sort=None):
+    """Eine Trefferseite (Relevanz oder Feldsortierung), ab `last` fortgesetzt."""
+    if sort is None:
+        return searcher.search(qry, n) if last is None else searcher.searchAfter(last, qry, n)
+    return searcher.search(qry, n, sort) if last is None else searcher.searchAfter(last, qry, n, sort)
+
+def infix_search(searcher, reader, qry, needle, limit, batch=200, sort=None, loader=None):
+    """
+    Kandidaten aus den Trigramm-Postings seitenweise holen und per Text verifizieren,
+    bis `limit` echte Treffer gefunden sind. Liefert (Kandidaten gesamt, [(doc_id, Document)]).
+    Die Verifikation braucht content – geladen werden nur die KWIC-Felder.
+    """
+    candidates = searcher.count(qry)
+    out = []
+    loader = loader or DocLoader(reader, KWIC_FIELDS)
+    last = None
+    while len(out) < limit:
+        top = _page(searcher, qry, batch, last, sort)
+        if not top.scoreDocs:
+            break
+        for sd in top.scoreDocs:
+            d = loader.load(sd.doc, KWIC_FIELDS)
+            if infix_verify(d.get("content") or "", needle):
+                out.append((sd.doc, d))
+                if len(out) >= limit:
+                    break
+        last = top.scoreDocs[-1]
+    return candidates, out
+
+def collapsed_search(searcher, reader, qry, limit, dups, batch=100, max_scan=None, sort=None, loader=None):
+    """
+    Seitenweise suchen und pro Dubletten-Cluster nur den besten Treffer behalten, bis `limit`
+    verschiedene Texte gefunden sind. Liefert ([(doc_id, score, Document)], Collapser).
+    Für die Entscheidung wird nur doc_key gelesen; die Anzeige-Felder (Default-Feldsatz des
+    Loaders) erst für die behaltenen Treffer, in docid-Reihenfolge.
+    """
+    loader = loader or DocLoader(reader, KWIC_FIELDS)
+    hits, col = dedup.collapse_hits(searcher, qry, limit, dups, lambda doc_id: loader.load(doc_id, KEY_FIELDS).get("doc_key"),
+                                    batch=batch, max_scan=max_scan, sort=sort)
+    docs = loader.load_all([sd.doc for sd in hits])
+    return [(sd.doc, sd.score, d) for sd, d in zip(hits, docs)], col
+
 # -------------------
 # Execution
 # -------------------
-def _run_once(args_map, searcher, reader):
+def search_once(args_map, searcher, reader):
+    """
+    Führt eine Suche aus und liefert ein strukturiertes Ergebnis (für CLI-Ausgabe, Daemon und Batch):
+      {"total", "candidates" (nur infix), "groups" (nur group), "hits": [{doc, score, title, magazine,
+       issue_label, issue_date_iso, article_url, kwic, fallback, [duplicates], [group_hits]}],
+       "error", "suggestions"}
+    """
     qtext      = args_map.get("q") or ""
     magazine   = args_map.get("magazine")
     form       = args_map.get("form")
@@ -259,52 +363,202 @@ def _run_once(args_map, searcher, reader):
     limit      = int(args_map.get("limit") or 10)
     kwic_term  = args_map.get("kwic_term")
     kwic_win   = int(args_map.get("kwic_window") or 5)
+    sort_mode  = args_map.get("sort") or "relevance"
+    sort       = sorting.make_sort(sort_mode)
+
+    if args_map.get("related"):
+        # ähnliche Artikel (MoreLikeThis über Term-Vektoren) – Filter/Query werden ignoriert
+        rel = related.related(reader, searcher, args_map["related"], limit, bool(args_map.get("other_magazines")))
+        if rel is None:
+            return {"error": "article_not_found", "article_id": args_map["related"], "total": 0, "hits": []}
+        hits = [{**h, "kwic": [], "fallback": None} for h in rel["hits"]]
+        return {"error": None, "mode": "related", "limit": limit, "source": rel["source"],
+                "cached": rel["cached"], "total": len(hits), "hits": hits}
 
     resolved_mag, suggestions = _resolve_magazine(reader, magazine)
     if magazine and not resolved_mag:
-        print("⚠️ Magazin nicht eindeutig. Meinten Sie eines von:")
-        for s in suggestions:
-            print(f"   • {s}")
+        return {"error": "magazine_ambiguous", "suggestions": suggestions, "total": 0, "hits": []}
+
+    res = {"error": None, "limit": limit, "sort": sort_mode}
+    # KWIC-Begriff normalisieren (Wildcards raus) NUR für Snippet-Anzeige; ohne Begriff kein content laden
+    term_for_kwic = _normalize_kwic_term(kwic_term or qtext)
+    loader = DocLoader(reader, KWIC_FIELDS if term_for_kwic else LIST_FIELDS)
+    if args_map.get("infix") and qtext:
+        # Teilwortsuche: q ist eine wörtliche Zeichenkette, keine Lucene-Syntax
+        qry = build_infix(qtext, resolved_mag, form, lang, year_from, year_to)
+        candidates, docs = infix_search(searcher, reader, qry, qtext, limit, sort=sort, loader=loader)
+        res.update(mode="infix", candidates=candidates, total=len(docs))
+        docs = [(doc_id, None, d) for doc_id, d in docs]
+    elif args_map.get("semantic") and qtext:
+        # semantische Suche: LSA-Vektor der Anfrage → HNSW (KnnFloatVectorQuery), Metadaten als Vorfilter
+        model = semantic.load_cached(INDEX_DIR)
+        if model is None:
+            return {"error": "no_lsa_model", "total": 0, "hits": []}
+        if semantic.index_model_id(reader) != model.model_id:
+            return {"error": "lsa_model_mismatch", "model_id": model.model_id, "total": 0, "hits": []}
+        has_filter = bool(resolved_mag or _normalize_form(form) or lang or year_from or year_to)
+        knn_filter = build_query("", resolved_mag, form, lang, year_from, year_to) if has_filter else None
+        qry = semantic.knn_query(model, qtext, limit, knn_filter)
+        top = searcher.search(qry, limit) if qry is not None else None
+        score_docs = list(top.scoreDocs) if top is not None else []
+        res.update(mode="semantic", total=len(score_docs), sort="relevance")
+        loaded = loader.load_all([sd.doc for sd in score_docs])
+        docs = [(sd.doc, sd.score, d) for sd, d in zip(score_docs, loaded)]
+    elif args_map.get("group"):
+        # ein Eintrag pro Ausgabe/Magazin: bester Artikel + Trefferzahl der Gruppe
+        qry = build_query(qtext, resolved_mag, form, lang, year_from, year_to)
+        groups, total_groups, total = grouping.grouped_search(searcher, qry, args_map["group"], limit, sort=sort)
+        res.update(mode="query", total=total, group=args_map["group"], groups=total_groups)
+        loaded = loader.load_all([sd.doc for _, sd, _ in groups])
+        docs = [(sd.doc, None if sort is not None else sd.score, d) for (_, sd, _), d in zip(groups, loaded)]
+        group_hits = [n for _, _, n in groups]
+    else:
+        qry = build_query(qtext, resolved_mag, form, lang, year_from, year_to)
+        # sort=date entspricht der Index-Sortierung: Lucene bricht nach den ersten `limit` Treffern
+        # je Segment ab, totalHits ist dann nur eine Untergrenze → exakte Zahl über count()
+        hits = _page(searcher, qry, limit, sort=sort)
+        th = hits.totalHits
+        try:
+            total = th.value() if callable(getattr(th, "value", None)) else th.value
+            if sort is not None and str(th.relation) != "EQUAL_TO":
+                total = searcher.count(qry)
+        except Exception:
+            total = len(hits.scoreDocs)
+        res.update(mode="query", total=total)
+        dups = dedup.load_cached(INDEX_DIR) if args_map.get("collapse_dups") else None
+        col = None
+        if dups is not None:
+            docs, col = collapsed_search(searcher, reader, qry, limit, dups, sort=sort, loader=loader)
+            res["collapsed"] = col.collapsed
+        else:
+            loaded = loader.load_all([sd.doc for sd in hits.scoreDocs])
+            docs = [(sd.doc, sd.score, d) for sd, d in zip(hits.scoreDocs, loaded)]
+        if sort is not None:
+            # Feldsortierung: keine Scores (FieldDoc.score ist NaN)
+            docs = [(doc_id, None, d) for doc_id, _, d in docs]
+
+    out_hits = []
+    for i, (doc_id, score, d) in enumerate(docs):
+        txt = d.get("content") or ""
+        snips, fb = [], None
+        if term_for_kwic:
+            snips = kwic(txt, term_for_kwic, window=kwic_win, max_snips=3)
+            if not snips:
+                fb = _fallback_snippet(txt, term_for_kwic, chars=180)
+        out_hits.append({
+            "doc": doc_id,
+            "score": score,
+            "title": d.get("title") or d.get("filename"),
+            "magazine": d.get("magazine"),
+            "issue_label": d.get("issue_label"),
+            "issue_date_iso": d.get("issue_date_iso"),
+            "article_url": d.get("article_url"),
+            "kwic": snips,
+            "fallback": fb,
+        })
+        if res.get("collapsed") is not None:
+            out_hits[-1]["duplicates"] = col.hidden.get(i, 0)
+        if res.get("group"):
+            out_hits[-1]["group_hits"] = group_hits[i]
+    res["hits"] = out_hits
+    return res
+
+def _print_result(res, out=None):
+    out = out or sys.stdout
+    if res.get("error") == "magazine_ambiguous":
+        print("⚠️ Magazin nicht eindeutig. Meinten Sie eines von:", file=out)
+        for s in res.get("suggestions") or []:
+            print(f"   • {s}", file=out)
         return
 
-    qry = build_query(qtext, resolved_mag, form, lang, year_from, year_to)
-    hits = searcher.search(qry, limit)
-    th = hits.totalHits
-    try:
-        total = th.value() if callable(getattr(th, "value", None)) else th.value
-    except Exception:
-        total = len(hits.scoreDocs)
-
-    print(f"Treffer: {total} (zeige bis {limit})")
-
-    # KWIC-Begriff normalisieren (Wildcards raus) NUR für Snippet-Anzeige
-    raw_kwic = kwic_term or (qtext if qtext else "")
-    term_for_kwic = _normalize_kwic_term(raw_kwic)
+    if res.get("error") == "article_not_found":
+        print(f"⚠️ Artikel {res.get('article_id')} nicht im Index", file=out)
+        return
 
-    for sd in hits.scoreDocs:
-        d = reader.storedFields().document(sd.doc)
-        title   = d.get("title") or d.get("filename")
-        mag     = d.get("magazine")
-        label   = d.get("issue_label")
-        dateiso = d.get("issue_date_iso")
-        url     = d.get("article_url")
-        txt     = d.get("content") or ""
+    if res.get("error") == "no_lsa_model":
+        print("⚠️ Kein LSA-Modell – zuerst semantic.py train, dann Indexer.py --lsa-model", file=out)
+        return
 
-        print(f"\n— {mag} {label} {dateiso} {title}")
+    if res.get("error") == "lsa_model_mismatch":
+        print(f"⚠️ Index enthält keine Vektoren des Modells {res.get('model_id')} – Indexer.py --lsa-model ausführen",
+              file=out)
+        return
 
-        if term_for_kwic:
-            snips = kwic(txt, term_for_kwic, window=kwic_win, max_snips=3)
-            if snips:
-                for s in snips:
-                    print(f"   ... {s} ...")
-            else:
-                fb = _fallback_snippet(txt, term_for_kwic, chars=180)
-                if fb:
-                    print(f"   … {fb} …  [fallback]")
-        if url:
-            print(f"   ↪ {url}")
+    limit = res.get("limit")
+    if res.get("mode") == "related":
+        src = res["source"]
+        cached = " [Cache]" if res.get("cached") else ""
+        print(f"🔗 Ähnliche Artikel zu: {src['title']} ({src['magazine']} {src['issue_label']}){cached}", file=out)
+    elif res.get("mode") == "semantic":
+        print(f"🧭 Semantisch nächste Artikel: {res['total']} (zeige bis {limit})", file=out)
+    elif res.get("mode") == "infix":
+        print(f"Infix-Kandidaten: {res['candidates']} | verifiziert: {res['total']} (zeige bis {limit})", file=out)
+    else:
+        order = f", sortiert: {res['sort']}" if res.get("sort") not in (None, "relevance") else ""
+        print(f"Treffer: {res['total']} (zeige bis {limit}{order})", file=out)
+    if res.get("group"):
+        label = "Ausgaben" if res["group"] == "issue" else "Magazine"
+        print(f"📚 gruppiert: {res['groups']} {label}", file=out)
+    if res.get("collapsed"):
+        print(f"🧬 {res['collapsed']} Dubletten/Nachdrucke ausgeblendet", file=out)
+
+    for h in res["hits"]:
+        dup = f"  [+{h['duplicates']} Dubletten]" if h.get("duplicates") else ""
+        if h.get("group_hits"):
+            dup += f"  [{h['group_hits']} Treffer in der Gruppe]"
+        print(f"\n— {h['magazine']} {h['issue_label']} {h['issue_date_iso']} {h['title']}{dup}", file=out)
+        for s in h["kwic"]:
+            print(f"   ... {s} ...", file=out)
+        if h["fallback"]:
+            print(f"   … {h['fallback']} …  [fallback]", file=out)
+        if h["article_url"]:
+            print(f"   ↪ {h['article_url']}", file=out)
+
+def _run_once(args_map, searcher, reader, out=None):
+    _print_result(search_once(args_map, searcher, reader), out)
 
-def main():
+# -------------------
+# Batch
+# -------------------
+def run_batch(path, out_path, reader, threads=4):
+    """
+    Batch-Modus: eine Query pro Zeile (_parse_kv_line-Syntax, '#' = Kommentar).
+    Queries laufen parallel in Python-Threads; der IndexSearcher bekommt zusätzlich einen
+    Java-Executor und durchsucht die Segmente einer Query parallel. Ergebnis als JSONL
+    (Eingabereihenfolge bleibt erhalten).
+    """
+    jexec = Executors.newFixedThreadPool(threads)
+    searcher = IndexSearcher(reader, jexec)
+
+    with open(path, "r", encoding="utf-8") as f:
+        lines = [(i, l.strip()) for i, l in enumerate(f, 1) if l.strip() and not l.lstrip().startswith("#")]
+
+    def _one(item):
+        lucene.getVMEnv().attachCurrentThread()
+        line_no, line = item
+        t0 = time.perf_counter()
+        try:
+            res = search_once(_parse_kv_line(line, DEFAULTS), searcher, reader)
+        except Exception as e:
+            res = {"error": str(e), "total": 0, "hits": []}
+        res.update(line_no=line_no, query=line, ms=round((time.perf_counter() - t0) * 1000, 2))
+        return res
+
+    t_all = time.perf_counter()
+    n = 0
+    try:
+        with ThreadPoolExecutor(max_workers=threads) as pool, open(out_path, "w", encoding="utf-8") as out:
+            for res in pool.map(_one, lines):
+                out.write(json.dumps(res, ensure_ascii=False) + "\n")
+                n += 1
+                if n % 100 == 0:
+                    print(f"… {n}/{len(lines)} Queries")
+    finally:
+        jexec.shutdown()
+    dt = time.perf_counter() - t_all
+    print(f"✅ {n} Queries in {dt:.1f}s ({n / dt if dt else 0:.1f} q/s) → {out_path}")
+
+def build_argparser():
     ap = argparse.ArgumentParser(description="ZXpress Volltextsuche (Lucene)")
     ap.add_argument("--q", default="", help="Query (Lucene Syntax, z.B. covox OR ковокс, Wildcards erlaubt)")
     ap.add_argument("--magazine", help="Exakter Magazin-Name (z.B. Spectrofon)")
@@ -315,61 +569,68 @@ def main():
     ap.add_argument("--limit", type=int, default=10, help="Max. Treffer")
     ap.add_argument("--kwic-term", help="Begriff für KWIC (falls anders als --q; Wildcards werden für Snippets ignoriert)")
     ap.add_argument("--kwic-window", type=int, default=5, help="KWIC Fenster (Wörter)")
-    args = ap.parse_args()
+    ap.add_argument("--infix", action="store_true",
+                    help="Teilwortsuche: --q als wörtliche Zeichenkette (auch innerhalb von Wörtern) über das Trigramm-Feld")
+    ap.add_argument("--collapse-dups", action="store_true",
+                    help="Nachdrucke/Dubletten (Cluster aus dedup.py) zu einem Treffer zusammenfassen")
+    ap.add_argument("--sort", choices=sorting.SORT_MODES, default="relevance",
+                    help="Reihenfolge: relevance | date (chronologisch) | date-desc | reading (Magazin → Ausgabe → Artikel)")
+    ap.add_argument("--group", choices=sorted(grouping.GROUP_MODES),
+                    help="ein Treffer pro Ausgabe (issue) bzw. Magazin (magazine) mit Trefferzahl der Gruppe")
+    ap.add_argument("--related", type=int, metavar="ARTICLE_ID",
+                    help="ähnliche Artikel zu dieser article_id (MoreLikeThis, Query/Filter werden ignoriert)")
+    ap.add_argument("--other-magazines", action="store_true",
+                    help="bei --related nur Artikel aus anderen Magazinen")
+    ap.add_argument("--semantic", action="store_true",
+                    help="semantische Suche (LSA-Vektoren, HNSW); Filter wirken als Vorfilter, siehe semantic.py")
+    ap.add_argument("--batch", help="Datei mit einer Query pro Zeile (key=value-Syntax) → JSONL")
+    ap.add_argument("--out", default="batch_results.jsonl", help="Ausgabe für --batch (JSONL)")
+    ap.add_argument("--threads", type=int, default=4, help="Parallele Queries/Segment-Threads für --batch")
+    return ap
+
+def params_from_args(args):
+    return dict(
+        q=args.q,
+        magazine=args.magazine,
+        form=args.form,
+        lang=args.lang,
+        year_from=args.year_from,
+        year_to=args.year_to,
+        limit=args.limit,
+        kwic_term=args.kwic_term,
+        kwic_window=args.kwic_window,
+        infix=args.infix,
+        collapse_dups=args.collapse_dups,
+        sort=args.sort,
+        group=args.group,
+        related=args.related,
+        other_magazines=args.other_magazines,
+        semantic=args.semantic,
+    )
+
+def main():
+    args = build_argparser().parse_args()
 
     lucene.initVM()
     reader = DirectoryReader.open(FSDirectory.open(Paths.get(INDEX_DIR)))
+    if args.batch:
+        run_batch(args.batch, args.out, reader, threads=args.threads)
+        reader.close()
+        return
+
     searcher = IndexSearcher(reader)
 
     if (args.q == "" and args.magazine is None and args.form is None and
         (args.lang == "ru") and args.year_from is None and args.year_to is None and
-        args.limit == 10 and args.kwic_term is None and args.kwic_window == 5):
+        args.limit == 10 and args.kwic_term is None and args.kwic_window == 5 and not args.infix and
+        not args.collapse_dups and args.sort == "relevance" and
+        args.group is None and args.related is None and not args.semantic):
         params = prompt_inputs()
         _run_once(params, searcher, reader)
         reader.close()
         return
 
-    resolved_mag, suggestions = _resolve_magazine(reader, args.magazine)
-    if args.magazine and not resolved_mag:
-        print("⚠️ Magazin nicht eindeutig. Meinten Sie eines von:")
-        for s in suggestions:
-            print(f"   • {s}")
-        reader.close()
-        return
-
-    qry = build_query(args.q, resolved_mag, args.form, args.lang, args.year_from, args.year_to)
-    hits = searcher.search(qry, args.limit)
-    th = hits.totalHits
-    try:
-        total_cli = th.value() if callable(getattr(th, "value", None)) else th.value
-    except Exception:
-        total_cli = len(hits.scoreDocs)
-    print(f"Treffer: {total_cli} (zeige bis {args.limit})")
-
-    raw_kwic = args.kwic_term or (args.q if args.q else "")
-    term_for_kwic = _normalize_kwic_term(raw_kwic)
-
-    for sd in hits.scoreDocs:
-        d = reader.storedFields().document(sd.doc)
-        title   = d.get("title") or d.get("filename")
-        mag     = d.get("magazine")
-        label   = d.get("issue_label")
-        dateiso = d.get("issue_date_iso")
-        url     = d.get("article_url")
-        txt     = d.get("content") or ""
-
-        print(f"\n— {mag} {label} {dateiso} {title}")
-        if term_for_kwic:
-            snips = kwic(txt, term_for_kwic, window=args.kwic_window, max_snips=3)
-            if snips:
-                for s in snips:
-                    print(f"   ... {s} ...")
-            else:
-                fb = _fallback_snippet(txt, term_for_kwic, chars=180)
-                if fb:
-                    print(f"   … {fb} …  [fallback]")
-        if url:
-            print(f"   ↪ {url}")
+    _run_once(params_from_args(args), searcher, reader)
 
     reader.close()
 
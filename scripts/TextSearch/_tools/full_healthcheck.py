@@ -1,9 +1,9 @@
 # /Users/stoia1/Desktop/Website/DigitProject/scripts/TextSearch/full_healthcheck.py
 # Vollständiger Gesundheitscheck: Lucene-Index + Datei-/Metadatenquerschnitt
 
-import os, json, lucene, re
-from collections import Counter, defaultdict
+import os, sys, json, lucene, re
 from datetime import datetime
+import numpy as np
 from java.nio.file import Paths
 from org.apache.lucene.store import FSDirectory
 from org.apache.lucene.index import DirectoryReader
@@ -11,6 +11,9 @@ from org.apache.lucene.index import DirectoryReader
 CORPUS_ROOT = "/Users/stoia1/Desktop/Website/DigitProject/data/zxpress/magazines"
 INDEX_DIR   = "/Users/stoia1/Desktop/Website/DigitProject/index_dir"
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import meta_table  # noqa: E402
+
 def count_files():
     txt = 0
     meta = 0
@@ -75,74 +78,38 @@ def human_epoch(ms):
     except:
         return None
 
+def _examples(r, docids, fallback_field="title", k=10):
+    """Stichprobe: Titel bzw. Dateiname der ersten k docids (nur diese werden geladen)."""
+    sf = r.storedFields()
+    out = []
+    for doc_id in docids[:k]:
+        d = sf.document(int(doc_id))
+        out.append(d.get(fallback_field) or d.get("filename") or f"doc:{doc_id}")
+    return out
+
 def audit_index():
     lucene.initVM()
     r = DirectoryReader.open(FSDirectory.open(Paths.get(INDEX_DIR)))
     n = r.numDocs()
 
+    # Spaltentabelle (<index_dir>_meta); fehlt sie oder ist veraltet, einmal neu bauen
+    mt = meta_table.load_current(INDEX_DIR, r) or meta_table.build(r, meta_table.meta_dir_for(INDEX_DIR))
+    live = mt["live"]
+
     # Feldabdeckung
-    fields = ["content", "magazine", "magazine_id_s", "form", "language", "city", "country",
-              "issue_label", "issue_date_iso", "issue_date_epoch_ms", "article_id_s", "title", "article_url",
-              "print_url"]
-
-    coverage = Counter()
-    empty_issue_date = 0
-    placeholder_date = 0  # 0000-01-01
-    years = Counter()
-    forms = Counter()
-    langs = Counter()
-    mags = Counter()
-    cities = Counter()
-    countries = Counter()
-    epoch_min, epoch_max = None, None
-
-    # Stichprobenlisten (klein halten)
-    missing_city_country_examples = []
-    placeholder_examples = []
-    missing_title_examples = []
-
-    for doc_id in range(r.maxDoc()):
-        d = r.storedFields().document(doc_id)
-        for f in fields:
-            if d.get(f): coverage[f] += 1
-
-        mag = d.get("magazine")
-        if mag: mags[mag] += 1
-
-        f = d.get("form")
-        if f: forms[f] += 1
-
-        lg = d.get("language")
-        if lg: langs[lg] += 1
-
-        ct = d.get("city"); co = d.get("country")
-        if ct: cities[ct] += 1
-        if co: countries[co] += 1
-        if not ct or not co:
-            if len(missing_city_country_examples) < 10:
-                missing_city_country_examples.append(d.get("title") or d.get("filename") or f"doc:{doc_id}")
-
-        iso = d.get("issue_date_iso")
-        if not iso: empty_issue_date += 1
-        else:
-            if iso == "0000-01-01":
-                placeholder_date += 1
-                if len(placeholder_examples) < 10:
-                    placeholder_examples.append(d.get("title") or d.get("filename") or f"doc:{doc_id}")
-            yr = parse_year(iso)
-            if yr: years[yr] += 1
-
-        epoch = d.get("issue_date_epoch_ms")
-        if epoch:
-            try:
-                ms = int(epoch)
-                epoch_min = ms if epoch_min is None else min(epoch_min, ms)
-                epoch_max = ms if epoch_max is None else max(epoch_max, ms)
-            except:
-                pass
-
-        if not d.get("title") and len(missing_title_examples) < 10:
-            missing_title_examples.append(d.get("filename") or f"doc:{doc_id}")
+    fields = list(meta_table.COVERAGE_FIELDS)
+    coverage = mt.coverage()
+
+    year = mt["year"]
+    empty_issue_date = int(np.count_nonzero(live & (year == meta_table.YEAR_MISSING)))
+    placeholder_date = int(np.count_nonzero(live & (year == meta_table.YEAR_PLACEHOLDER)))
+    epoch_min, epoch_max = mt.date_span()
+
+    # Stichprobenlisten (klein halten) – nur diese Dokumente werden geladen
+    no_place = live & ~(mt.has("city") & mt.has("country"))
+    missing_city_country_examples = _examples(r, mt.docids(no_place))
+    placeholder_examples = _examples(r, mt.docids(live & (year == meta_table.YEAR_PLACEHOLDER)))
+    missing_title_examples = _examples(r, mt.docids(live & ~mt.has("title")), fallback_field="filename")
 
     r.close()
 
@@ -151,12 +118,12 @@ def audit_index():
         "coverage": {k: f"{coverage[k]}/{n}" for k in fields},
         "missing_issue_date_count": empty_issue_date,
         "placeholder_date_count": placeholder_date,
-        "years_top": years.most_common(12),
-        "forms": forms.most_common(),
-        "languages": langs.most_common(),
-        "magazines_top": mags.most_common(15),
-        "cities_top": cities.most_common(15),
-        "countries_top": countries.most_common(15),
+        "years_top": mt.distribution("year", top=12),
+        "forms": mt.distribution("form"),
+        "languages": mt.distribution("language"),
+        "magazines_top": mt.distribution("magazine", top=15),
+        "cities_top": mt.distribution("city", top=15),
+        "countries_top": mt.distribution("country", top=15),
         "epoch_span": {
             "min_epoch": epoch_min, "min_human": human_epoch(epoch_min) if epoch_min else None,
             "max_epoch": epoch_max, "max_human": human_epoch(epoch_max) if epoch_max else None,
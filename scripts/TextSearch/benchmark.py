@@ -0,0 +1,210 @@
+# scripts/TextSearch/benchmark.py
+# Reproduzierbarer Benchmark: Indexaufbau, Indexgröße, Query-Latenz und KWIC-Kosten.
+#
+#   python scripts/TextSearch/benchmark.py                             # data_small, temporärer Index
+#   python scripts/TextSearch/benchmark.py --corpus /pfad/magazines --repeat 50
+#   python scripts/TextSearch/benchmark.py --scale 10 --seed 42                # synthetische 10x-Kopie
+#   python scripts/TextSearch/benchmark.py --compare logs/benchmark/bench_20250101_120000.json
+#
+# Ergebnis: JSON mit Git-Hash, Umgebung und allen Messwerten (Default: logs/benchmark/bench_<ts>.json),
+# damit Läufe über die Zeit verglichen werden können.
+import os, sys, json, time, shutil, argparse, platform, subprocess, tempfile
+import lucene
+from java.nio.file import Paths
+from org.apache.lucene.store import FSDirectory
+from org.apache.lucene.index import DirectoryReader
+from org.apache.lucene.search import IndexSearcher
+
+import Indexer
+import dedup
+import meta_table
+from Searcher import build_query, kwic, _list_magazines
+from doc_loader import DocLoader, KWIC_FIELDS
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_CORPUS = os.path.join(REPO_ROOT, "data_small", "zxpress", "magazines")
+DEFAULT_OUT_DIR = os.path.join(REPO_ROOT, "logs", "benchmark")
+
+sys.path.insert(0, os.path.join(REPO_ROOT, "scripts", "light"))
+import scale_corpus
+
+# feste Query-Mischung: Kategorie → [(q, magazine, (year_from, year_to))]
+# "{mag}" wird durch das erste Magazin des Index ersetzt, damit der Filter auf jedem Korpus greift.
+QUERY_MIX = {
+    "term":       [("spectrum", None, None), ("программа", None, None), ("covox", None, None)],
+    "phrase":     [('"zx spectrum"', None, None), ('"в этом номере"', None, None)],
+    "wildcard":   [("прог*", None, None), ("disk*", None, None)],
+    "filtered":   [("spectrum", "{mag}", None), ("игра", "{mag}", None)],
+    "year-range": [("", None, (1996, 1998)), ("spectrum", None, (1998, 2000))],
+}
+KWIC_TERM = "spectrum"
+
+
+def git_info() -> dict:
+    def _git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True,
+                                  text=True, timeout=10).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return ""
+    return {"commit": _git("rev-parse", "HEAD") or None, "dirty": bool(_git("status", "--porcelain"))}
+
+
+def percentiles(samples: list[float]) -> dict:
+    if not samples:
+        return {"n": 0}
+    s = sorted(samples)
+    pick = lambda p: s[min(len(s) - 1, int(p * len(s)))]
+    return {"n": len(s), "mean_ms": round(sum(s) / len(s), 3), "p50_ms": round(pick(0.50), 3),
+            "p95_ms": round(pick(0.95), 3), "p99_ms": round(pick(0.99), 3), "max_ms": round(s[-1], 3)}
+
+
+def bench_build(corpus: str, index_dir: str, stored_mode: str, compound: bool) -> dict:
+    # nur der Lucene-Index: MinHash-Signaturen und Metadatentabelle würden Zeit messen, die
+    # index_bytes nicht enthält (und Geschwisterordner neben dem Index hinterlassen)
+    t0 = time.perf_counter()
+    docs = Indexer.build_index(corpus, index_dir, stored_mode=stored_mode, compound=compound,
+                               dedup_signatures=False, build_meta=False)
+    secs = time.perf_counter() - t0
+    size = sum(os.path.getsize(os.path.join(index_dir, f)) for f in os.listdir(index_dir))
+    return {"docs": docs, "seconds": round(secs, 3), "docs_per_sec": round(docs / secs, 1) if secs else None,
+            "index_bytes": size, "bytes_per_doc": round(size / docs, 1) if docs else None}
+
+
+def bench_queries(searcher, reader, repeat: int, top_n: int = 10) -> dict:
+    mags = _list_magazines(reader)
+    first_mag = mags[0] if mags else None
+    out = {}
+    for category, specs in QUERY_MIX.items():
+        queries = []
+        for q, mag, years in specs:
+            mag = first_mag if mag == "{mag}" else mag
+            yf, yt = years or (None, None)
+            queries.append(build_query(q, mag, None, None, yf, yt))
+        for q in queries:  # Aufwärmen
+            searcher.search(q, top_n)
+        samples, hits = [], 0
+        for _ in range(repeat):
+            for q in queries:
+                t = time.perf_counter()
+                top = searcher.search(q, top_n)
+                samples.append((time.perf_counter() - t) * 1000)
+                hits += len(top.scoreDocs)
+        out[category] = {**percentiles(samples), "queries": len(queries), "avg_hits": round(hits / len(samples), 1)}
+    return out
+
+
+def bench_kwic(searcher, reader, max_hits: int = 200, window: int = 5) -> dict:
+    """Kosten pro Treffer: Stored-Fields-Laden und KWIC-Berechnung getrennt gemessen."""
+    top = searcher.search(build_query(KWIC_TERM, None, None, None, None, None), max_hits)
+    loader = DocLoader(reader, KWIC_FIELDS)  # wie Searcher: nur Anzeige-Felder + content
+    load_ms, kwic_ms, chars = [], [], 0
+    for sd in top.scoreDocs:
+        t = time.perf_counter()
+        d = loader.load(sd.doc)
+        load_ms.append((time.perf_counter() - t) * 1000)
+        txt = d.get("content") or ""
+        chars += len(txt)
+        t = time.perf_counter()
+        kwic(txt, KWIC_TERM, window=window)
+        kwic_ms.append((time.perf_counter() - t) * 1000)
+    n = len(load_ms)
+    return {"term": KWIC_TERM, "hits": n, "avg_chars": round(chars / n) if n else 0,
+            "stored_load": percentiles(load_ms), "kwic": percentiles(kwic_ms),
+            "us_per_hit": round((sum(load_ms) + sum(kwic_ms)) * 1000 / n, 1) if n else None}
+
+
+def compare(old: dict, new: dict):
+    """Kurzer Vergleich der Kernkennzahlen zweier Läufe."""
+    def row(label, a, b, lower_is_better=True):
+        if a is None or b is None:
+            return
+        delta = (b - a) / a * 100 if a else 0.0
+        better = (delta < 0) == lower_is_better
+        mark = "✅" if abs(delta) < 5 or better else "⚠️"
+        print(f"  {mark} {label:28s} {a:>12} → {b:<12} ({delta:+.1f}%)")
+
+    print(f"\n📊 Vergleich mit {(old.get('git', {}).get('commit') or '?')[:10]}:")
+    row("build docs/sec", old["build"]["docs_per_sec"], new["build"]["docs_per_sec"], lower_is_better=False)
+    row("index bytes/doc", old["build"]["bytes_per_doc"], new["build"]["bytes_per_doc"])
+    for cat in QUERY_MIX:
+        o, n = old["queries"].get(cat, {}), new["queries"].get(cat, {})
+        row(f"{cat} p50 ms", o.get("p50_ms"), n.get("p50_ms"))
+        row(f"{cat} p95 ms", o.get("p95_ms"), n.get("p95_ms"))
+    row("kwic µs/hit", old["kwic"].get("us_per_hit"), new["kwic"].get("us_per_hit"))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark: Indexaufbau, Query-Latenz, KWIC-Kosten")
+    ap.add_argument("--corpus", default=DEFAULT_CORPUS, help="Magazin-Wurzel (Default: data_small)")
+    ap.add_argument("--scale", type=float, default=None,
+                    help="statt --corpus eine synthetische Kopie mit diesem Faktor benchmarken (scale_corpus.py)")
+    ap.add_argument("--seed", type=int, default=42, help="Seed für --scale")
+    ap.add_argument("--index-dir", default=None, help="Zielindex (Default: temporär, wird danach gelöscht)")
+    ap.add_argument("--stored-mode", choices=["speed", "compression"], default="speed")
+    ap.add_argument("--no-compound", action="store_true")
+    ap.add_argument("--repeat", type=int, default=30, help="Wiederholungen je Query")
+    ap.add_argument("--out", default=None, help="Ergebnis-JSON (Default: logs/benchmark/bench_<ts>.json)")
+    ap.add_argument("--compare", default=None, help="früheres Ergebnis-JSON zum Vergleich")
+    args = ap.parse_args()
+
+    if not os.path.isdir(args.corpus):
+        print(f"❌ Korpus nicht gefunden: {args.corpus}")
+        sys.exit(2)
+
+    corpus, tmp_corpus, scaled = args.corpus, None, None
+    if args.scale:
+        tmp_corpus = tempfile.mkdtemp(prefix="zxbench_corpus_")
+        print(f"🧪 Synthetischer Korpus ×{args.scale} (Seed {args.seed}) → {tmp_corpus}")
+        scaled = scale_corpus.generate(args.corpus, tmp_corpus, factor=args.scale, seed=args.seed, force=True)
+        corpus = tmp_corpus
+
+    tmp_index = args.index_dir is None
+    index_dir = args.index_dir or tempfile.mkdtemp(prefix="zxbench_idx_")
+    try:
+        build = bench_build(corpus, index_dir, args.stored_mode, not args.no_compound)
+        print(f"🏗  Build: {build['docs']} Docs in {build['seconds']}s "
+              f"({build['docs_per_sec']} Docs/s, {build['index_bytes'] / 1e6:.2f} MB)")
+
+        reader = DirectoryReader.open(FSDirectory.open(Paths.get(index_dir)))
+        searcher = IndexSearcher(reader)
+        queries = bench_queries(searcher, reader, args.repeat)
+        for cat, r in queries.items():
+            print(f"🔎 {cat:10s} p50 {r.get('p50_ms')} ms | p95 {r.get('p95_ms')} ms | p99 {r.get('p99_ms')} ms")
+        kw = bench_kwic(searcher, reader)
+        print(f"🧾 KWIC: {kw['hits']} Treffer, {kw['us_per_hit']} µs/Treffer "
+              f"(Laden p50 {kw['stored_load'].get('p50_ms')} ms, KWIC p50 {kw['kwic'].get('p50_ms')} ms)")
+        reader.close()
+    finally:
+        if tmp_index:
+            for d in (index_dir, dedup.dedup_dir_for(index_dir), meta_table.meta_dir_for(index_dir)):
+                shutil.rmtree(d, ignore_errors=True)
+        if tmp_corpus:
+            shutil.rmtree(tmp_corpus, ignore_errors=True)
+
+    result = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git": git_info(),
+        "env": {"python": platform.python_version(), "lucene": getattr(lucene, "VERSION", None),
+                "platform": platform.platform(), "cpus": os.cpu_count()},
+        "config": {"corpus": os.path.abspath(args.corpus), "stored_mode": args.stored_mode,
+                   "compound": not args.no_compound, "repeat": args.repeat,
+                   "scale": args.scale, "seed": args.seed if args.scale else None, "scaled": scaled},
+        "build": build,
+        "queries": queries,
+        "kwic": kw,
+    }
+
+    out = args.out or os.path.join(DEFAULT_OUT_DIR, f"bench_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"📝 Ergebnis: {out}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(json.load(f), result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# scripts/TextSearch/concordance.py
+# Vollständiger Konkordanz-Export: alle Treffer einer Anfrage, alle KWIC-Stellen, ohne Top-N-Grenze.
+#
+#   python scripts/TextSearch/concordance.py --q covox --out covox.csv
+#   python scripts/TextSearch/concordance.py --q "прог*" --kwic-term прог --format jsonl --out prog.jsonl
+#   python scripts/TextSearch/concordance.py --q spectrum --magazine Spectrofon --years 1996-1998 --window 8 --out -
+#
+# Statt searcher.search(qry, n) wird pro Segment ein Scorer mit ScoreMode.COMPLETE_NO_SCORES
+# in docid-Reihenfolge durchlaufen: kein Scoring, kein Heap, gelöschte Dokumente über liveDocs
+# übersprungen. Jede KWIC-Zeile wird sofort geschrieben – Speicherbedarf unabhängig von der Trefferzahl.
+import sys, csv, json, time, argparse, lucene
+from java.nio.file import Paths
+from java.util import HashSet
+from org.apache.lucene.store import FSDirectory
+from org.apache.lucene.index import DirectoryReader
+from org.apache.lucene.search import IndexSearcher, ScoreMode, DocIdSetIterator
+
+from Searcher import (INDEX_DIR, build_query, kwic_iter, _normalize_kwic_term, _parse_years,
+                      _resolve_magazine)
+
+FIELDS = ("doc_key", "magazine", "issue_label", "issue_date_iso", "title", "article_url")
+COLUMNS = ("doc", *FIELDS, "left", "match", "right")
+
+
+def iter_matches(searcher, reader, qry):
+    """Alle lebenden Treffer-Docs als (leaf_ctx, lokale docid) in Index-Reihenfolge, ohne Scores."""
+    weight = searcher.createWeight(searcher.rewrite(qry), ScoreMode.COMPLETE_NO_SCORES, 1.0)
+    for ctx in reader.leaves():
+        scorer = weight.scorer(ctx)
+        if scorer is None:
+            continue
+        live = ctx.reader().getLiveDocs()
+        it = scorer.iterator()
+        doc = it.nextDoc()
+        while doc != DocIdSetIterator.NO_MORE_DOCS:
+            if live is None or live.get(doc):
+                yield ctx, doc
+            doc = it.nextDoc()
+
+
+def iter_concordance(searcher, reader, qry, term, window=5, max_per_doc=None):
+    """
+    KWIC-Zeilen als dicts (COLUMNS). Lädt pro Treffer nur content + Anzeige-Felder,
+    StoredFields einmal pro Segment.
+    """
+    wanted = HashSet()
+    for f in ("content", *FIELDS):
+        wanted.add(f)
+    leaf, sf = None, None
+    for ctx, doc in iter_matches(searcher, reader, qry):
+        if ctx is not leaf:
+            leaf, sf = ctx, ctx.reader().storedFields()
+        d = sf.document(doc, wanted)
+        meta = {f: d.get(f) for f in FIELDS}
+        for n, (left, match, right) in enumerate(kwic_iter(d.get("content") or "", term, window)):
+            if max_per_doc and n >= max_per_doc:
+                break
+            yield {"doc": ctx.docBase + doc, **meta, "left": left, "match": match, "right": right}
+
+
+class _CsvSink:
+    def __init__(self, fh):
+        self.w = csv.DictWriter(fh, fieldnames=COLUMNS)
+        self.w.writeheader()
+
+    def write(self, row):
+        self.w.writerow(row)
+
+
+class _JsonlSink:
+    def __init__(self, fh):
+        self.fh = fh
+
+    def write(self, row):
+        self.fh.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def export(searcher, reader, qry, term, out_path, fmt="csv", window=5, max_per_doc=None, limit=None):
+    """Schreibt die Konkordanz zeilenweise nach out_path ('-' = stdout). Liefert (Zeilen, Dokumente)."""
+    fh = sys.stdout if out_path == "-" else open(out_path, "w", encoding="utf-8", newline="")
+    sink = _CsvSink(fh) if fmt == "csv" else _JsonlSink(fh)
+    lines, docs, last_doc = 0, 0, None
+    try:
+        for row in iter_concordance(searcher, reader, qry, term, window, max_per_doc):
+            sink.write(row)
+            lines += 1
+            if row["doc"] != last_doc:
+                docs += 1
+                last_doc = row["doc"]
+            if lines % 10000 == 0:
+                print(f"… {lines} Zeilen aus {docs} Artikeln", file=sys.stderr)
+            if limit and lines >= limit:
+                break
+    finally:
+        if fh is not sys.stdout:
+            fh.close()
+    return lines, docs
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Konkordanz-Export (alle Treffer, CSV/JSONL, konstanter Speicher)")
+    ap.add_argument("--q", required=True, help="Query (Lucene-Syntax wie Searcher.py)")
+    ap.add_argument("--kwic-term", help="Begriff für die KWIC-Zeilen (Default: --q ohne Wildcards)")
+    ap.add_argument("--magazine", help="Magazin (Auflösung wie Searcher.py)")
+    ap.add_argument("--form", help="Form (Журнал | Газета)")
+    ap.add_argument("--lang", default="ru", help="Sprache (default: ru)")
+    ap.add_argument("--years", help="z.B. 1996 oder 1995-1997")
+    ap.add_argument("--window", type=int, default=5, help="KWIC-Fenster (Wörter je Seite)")
+    ap.add_argument("--max-per-doc", type=int, default=None, help="höchstens so viele Zeilen pro Artikel")
+    ap.add_argument("--limit", type=int, default=None, help="nach so vielen Zeilen abbrechen")
+    ap.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    ap.add_argument("--out", default="concordance.csv", help="Ausgabedatei, '-' = stdout")
+    ap.add_argument("--index-dir", default=INDEX_DIR)
+    args = ap.parse_args()
+
+    lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+    reader = DirectoryReader.open(FSDirectory.open(Paths.get(args.index_dir)))
+    searcher = IndexSearcher(reader)
+    try:
+        magazine, suggestions = _resolve_magazine(reader, args.magazine)
+        if args.magazine and not magazine:
+            print("⚠️ Magazin nicht eindeutig. Meinten Sie eines von:", file=sys.stderr)
+            for s in suggestions:
+                print(f"   • {s}", file=sys.stderr)
+            sys.exit(2)
+        year_from, year_to = _parse_years(args.years)
+        qry = build_query(args.q, magazine, args.form, args.lang, year_from, year_to)
+        term = _normalize_kwic_term(args.kwic_term or args.q)
+
+        t0 = time.perf_counter()
+        lines, docs = export(searcher, reader, qry, term, args.out, args.format, args.window,
+                             args.max_per_doc, args.limit)
+        dt = time.perf_counter() - t0
+        print(f"✅ {lines} KWIC-Zeilen aus {docs} Artikeln in {dt:.1f}s → {args.out}", file=sys.stderr)
+    finally:
+        reader.close()
+
+
+if __name__ == "__main__":
+    main()
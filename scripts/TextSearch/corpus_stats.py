@@ -0,0 +1,418 @@
+# scripts/TextSearch/corpus_stats.py
+# Frequenzstatistik über den ganzen Korpus: Uni-/Bigramme pro (Magazin, Jahr) als vorberechnete Tabellen.
+#
+#   python scripts/TextSearch/corpus_stats.py build                        # inkrementell (nur geänderte Partitionen)
+#   python scripts/TextSearch/corpus_stats.py build --full
+#   python scripts/TextSearch/corpus_stats.py freq --magazine Spectrofon --years 1996-1998 --top 50
+#   python scripts/TextSearch/corpus_stats.py freq --bigrams --top 30
+#   python scripts/TextSearch/corpus_stats.py keyness --magazine "ZX-Format" --top 40   # gegen den Rest
+#   python scripts/TextSearch/corpus_stats.py trend covox --magazine Spectrofon
+#
+# Tokenisierung mit demselben Analyzer wie der Indexer (Feld "content"), damit Zählungen und
+# Suchtreffer zusammenpassen. Ablage neben dem Index in <index_dir>_stats/:
+#   vocab.txt                    – ein Term pro Zeile, Zeilennummer = Term-ID (nur angehängt, IDs bleiben stabil)
+#   partitions.json              – Partition-ID → Magazin, Jahr, Tokens, Docs, Fingerabdruck
+#   <pid>.uni.ids/.cnt.npy       – sortierte Term-IDs + Häufigkeiten (COO)
+#   <pid>.bi.keys/.cnt.npy       – Bigramm-Schlüssel id1 << 32 | id2 + Häufigkeiten
+# Abfragen laden die Arrays per mmap und brauchen weder JVM noch Index.
+import os, sys, json, time, hashlib, argparse
+from collections import Counter, defaultdict
+
+import numpy as np
+
+CORPUS_ROOT = "/Users/stoia1/Desktop/Website/DigitProject/data/zxpress/magazines"
+INDEX_DIR   = "/Users/stoia1/Desktop/Website/DigitProject/index_dir"
+
+FORMAT_VERSION = 1
+UNKNOWN_YEAR = 0
+
+
+def stats_dir_for(index_dir: str) -> str:
+    return index_dir.rstrip("/\\") + "_stats"
+
+
+def _year_of(issue_meta: dict) -> int:
+    iso = (issue_meta.get("issue_date_iso") or "")[:4]
+    return int(iso) if iso.isdigit() and iso != "0000" else UNKNOWN_YEAR
+
+
+def _pid(magazine: str, year: int) -> str:
+    return hashlib.sha1(f"{magazine}\x1f{year}".encode("utf-8")).hexdigest()[:16]
+
+
+def _parse_years(value):
+    if not value:
+        return None, None
+    if "-" in value:
+        a, b = value.split("-", 1)
+        return (int(a) if a.strip() else None, int(b) if b.strip() else None)
+    return int(value), int(value)
+
+
+# -------------------
+# Korpus lesen
+# -------------------
+def walk_partitions(corpus_root: str, hashes) -> dict:
+    """
+    (Magazin, Jahr) → {"docs": [(doc_key, text_path)], "fingerprint": sha1 über doc_key:content_sha1}.
+    Kostet nur stat() pro Artikel (content_sha1 aus dem HashStore).
+    """
+    parts = defaultdict(list)
+    for mag in sorted(os.listdir(corpus_root)):
+        mag_path = os.path.join(corpus_root, mag)
+        mag_meta_path = os.path.join(mag_path, "magazine.json")
+        issues_path = os.path.join(mag_path, "issues")
+        if not (os.path.isfile(mag_meta_path) and os.path.isdir(issues_path)):
+            continue
+        with open(mag_meta_path, "r", encoding="utf-8") as f:
+            magazine = json.load(f).get("magazine_name") or mag
+        for issue in sorted(os.listdir(issues_path)):
+            issue_meta_path = os.path.join(issues_path, issue, "issue.json")
+            articles_path = os.path.join(issues_path, issue, "articles")
+            if not (os.path.isfile(issue_meta_path) and os.path.isdir(articles_path)):
+                continue
+            with open(issue_meta_path, "r", encoding="utf-8") as f:
+                year = _year_of(json.load(f))
+            for art in sorted(os.listdir(articles_path)):
+                text_path = os.path.join(articles_path, art, "text.txt")
+                if os.path.isfile(text_path):
+                    doc_key = "/".join((mag, "issues", issue, "articles", art))
+                    parts[(magazine, year)].append((doc_key, text_path, hashes.sha1(text_path)))
+
+    out = {}
+    for key, docs in parts.items():
+        h = hashlib.sha1()
+        for doc_key, _, digest in docs:
+            h.update(f"{doc_key}:{digest}\n".encode("utf-8"))
+        out[key] = {"docs": [(k, p) for k, p, _ in docs], "fingerprint": h.hexdigest()}
+    return out
+
+
+def tokenize(analyzer, text: str, term_attr_cls, string_reader_cls):
+    ts = analyzer.tokenStream("content", string_reader_cls(text))
+    term_attr = ts.addAttribute(term_attr_cls)
+    ts.reset()
+    out = []
+    try:
+        while ts.incrementToken():
+            out.append(term_attr.toString())
+        ts.end()
+    finally:
+        ts.close()
+    return out
+
+
+# -------------------
+# Tabellen
+# -------------------
+class Vocab:
+    def __init__(self, terms=None):
+        self.terms: list[str] = list(terms or [])
+        self.ids: dict[str, int] = {t: i for i, t in enumerate(self.terms)}
+        self._saved = len(self.terms)
+
+    def id(self, term: str) -> int:
+        i = self.ids.get(term)
+        if i is None:
+            i = self.ids[term] = len(self.terms)
+            self.terms.append(term)
+        return i
+
+    def __len__(self):
+        return len(self.terms)
+
+    @classmethod
+    def load(cls, path: str) -> "Vocab":
+        if not os.path.exists(path):
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(line.rstrip("\n") for line in f)
+
+    def save(self, path: str):
+        # nur anhängen: bestehende IDs (und damit alle Partitionsdateien) bleiben gültig
+        with open(path, "a", encoding="utf-8") as f:
+            for t in self.terms[self._saved:]:
+                f.write(t + "\n")
+        self._saved = len(self.terms)
+
+
+def _coo(counter: Counter, dtype):
+    if not counter:
+        return np.empty(0, dtype=dtype), np.empty(0, dtype=np.int64)
+    keys = np.fromiter(counter.keys(), dtype=dtype, count=len(counter))
+    cnts = np.fromiter(counter.values(), dtype=np.int64, count=len(counter))
+    order = np.argsort(keys)
+    return keys[order], cnts[order]
+
+
+class StatsStore:
+    def __init__(self, path: str):
+        self.path = path
+        self.meta = {"version": FORMAT_VERSION, "partitions": {}}
+        mp = os.path.join(path, "partitions.json")
+        if os.path.exists(mp):
+            with open(mp, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") == FORMAT_VERSION:
+                self.meta = meta
+        self._vocab = None
+        self._arrays = {}
+
+    @property
+    def vocab(self) -> Vocab:
+        if self._vocab is None:
+            self._vocab = Vocab.load(os.path.join(self.path, "vocab.txt"))
+        return self._vocab
+
+    @property
+    def partitions(self) -> dict:
+        return self.meta["partitions"]
+
+    def _file(self, pid, name):
+        return os.path.join(self.path, f"{pid}.{name}.npy")
+
+    def arrays(self, pid: str, kind: str = "uni"):
+        """(Schlüssel, Häufigkeiten) einer Partition, gemappt statt geladen."""
+        key = (pid, kind)
+        if key not in self._arrays:
+            k = "ids" if kind == "uni" else "keys"
+            self._arrays[key] = (np.load(self._file(pid, f"{kind}.{k}"), mmap_mode="r"),
+                                 np.load(self._file(pid, f"{kind}.cnt"), mmap_mode="r"))
+        return self._arrays[key]
+
+    # ---------- Aufbau ----------
+    def build(self, corpus_root: str, full: bool = False):
+        import Indexer  # JVM/Analyzer nur für den Aufbau
+        from zxpress import hashstore
+        from java.io import StringReader
+        from org.apache.lucene.analysis.tokenattributes import CharTermAttribute
+
+        Indexer.ensure_vm()
+        analyzer = Indexer.make_analyzer()
+        os.makedirs(self.path, exist_ok=True)
+        if full:
+            for name in os.listdir(self.path):
+                if name.endswith(".npy") or name in ("vocab.txt", "partitions.json"):
+                    os.remove(os.path.join(self.path, name))
+            self.meta = {"version": FORMAT_VERSION, "partitions": {}}
+            self._vocab = Vocab()
+
+        t0 = time.perf_counter()
+        current = walk_partitions(corpus_root, hashstore.get())
+        vocab = self.vocab
+        old = self.partitions
+        new = {}
+        rebuilt = 0
+        for (magazine, year), info in sorted(current.items()):
+            pid = _pid(magazine, year)
+            prev = old.get(pid)
+            if prev and prev["fingerprint"] == info["fingerprint"]:
+                new[pid] = prev
+                continue
+
+            uni, bi, tokens = Counter(), Counter(), 0
+            for _, text_path in info["docs"]:
+                with open(text_path, "r", encoding="utf-8") as f:
+                    toks = tokenize(analyzer, f.read(), CharTermAttribute.class_, StringReader)
+                ids = [vocab.id(t) for t in toks]
+                uni.update(ids)
+                bi.update((a << 32) | b for a, b in zip(ids, ids[1:]))
+                tokens += len(ids)
+
+            for kind, counter, dtype in (("uni", uni, np.int32), ("bi", bi, np.int64)):
+                keys, cnts = _coo(counter, dtype)
+                np.save(self._file(pid, f"{kind}.{'ids' if kind == 'uni' else 'keys'}"), keys)
+                np.save(self._file(pid, f"{kind}.cnt"), cnts)
+            new[pid] = {"magazine": magazine, "year": year, "docs": len(info["docs"]), "tokens": tokens,
+                        "types": len(uni), "fingerprint": info["fingerprint"]}
+            rebuilt += 1
+            print(f"… {magazine} {year or '?'}: {len(info['docs'])} Artikel, {tokens} Tokens")
+
+        for pid in set(old) - set(new):  # Partition verschwunden
+            for name in ("uni.ids", "uni.cnt", "bi.keys", "bi.cnt"):
+                if os.path.exists(self._file(pid, name)):
+                    os.remove(self._file(pid, name))
+
+        vocab.save(os.path.join(self.path, "vocab.txt"))
+        self.meta["partitions"] = new
+        self.meta["built_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        tmp = os.path.join(self.path, "partitions.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, os.path.join(self.path, "partitions.json"))
+        self._arrays.clear()
+        print(f"🎉 {rebuilt} von {len(new)} Partitionen neu gezählt, {len(vocab)} Terme "
+              f"({time.perf_counter() - t0:.1f}s) → {self.path}")
+
+    # ---------- Abfragen ----------
+    def select(self, magazine=None, year_from=None, year_to=None, exclude=None) -> list[str]:
+        out = []
+        for pid, p in self.partitions.items():
+            if magazine and p["magazine"].lower() != magazine.lower():
+                continue
+            if year_from and p["year"] < year_from:
+                continue
+            if year_to and p["year"] > year_to:
+                continue
+            if exclude and pid in exclude:
+                continue
+            out.append(pid)
+        return sorted(out)
+
+    def totals(self, pids) -> int:
+        return sum(self.partitions[p]["tokens"] for p in pids)
+
+    def counts(self, pids, kind: str = "uni"):
+        """Summierte Häufigkeiten über Partitionen → (Schlüssel, Häufigkeiten), nach Schlüssel sortiert."""
+        if not pids:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        if kind == "uni":
+            acc = np.zeros(len(self.vocab), dtype=np.int64)
+            for pid in pids:
+                ids, cnt = self.arrays(pid, "uni")
+                acc[ids] += cnt  # IDs sind innerhalb einer Partition eindeutig
+            keys = np.flatnonzero(acc)
+            return keys, acc[keys]
+        keys = np.concatenate([self.arrays(pid, "bi")[0] for pid in pids])
+        cnts = np.concatenate([self.arrays(pid, "bi")[1] for pid in pids])
+        uniq, inv = np.unique(keys, return_inverse=True)
+        return uniq, np.bincount(inv.ravel(), weights=cnts, minlength=uniq.size).astype(np.int64)
+
+    def label(self, key: int, kind: str = "uni") -> str:
+        t = self.vocab.terms
+        return t[key] if kind == "uni" else f"{t[key >> 32]} {t[key & 0xFFFFFFFF]}"
+
+    def key_of(self, text: str):
+        """'covox' → Term-ID, 'zx spectrum' → Bigramm-Schlüssel; None, wenn unbekannt."""
+        words = text.lower().split()
+        ids = [self.vocab.ids.get(w) for w in words]
+        if not words or len(words) > 2 or None in ids:
+            return None, None
+        return (ids[0], "uni") if len(ids) == 1 else ((ids[0] << 32) | ids[1], "bi")
+
+    def frequency(self, pids, top=50, kind="uni", min_count=1):
+        keys, cnts = self.counts(pids, kind)
+        total = self.totals(pids) or 1
+        mask = cnts >= min_count
+        keys, cnts = keys[mask], cnts[mask]
+        order = np.argsort(-cnts, kind="stable")[:top]
+        return [{"term": self.label(int(keys[i]), kind), "count": int(cnts[i]),
+                 "per_million": round(float(cnts[i]) * 1e6 / total, 2)} for i in order]
+
+    def keyness(self, target, reference, top=50, kind="uni", min_count=5):
+        """Log-Likelihood (G²) Ziel vs. Referenz; positiv = im Ziel überrepräsentiert."""
+        tk, tc = self.counts(target, kind)
+        rk, rc = self.counts(reference, kind)
+        c, d = self.totals(target), self.totals(reference)
+        if not c or not d:
+            return []
+        keys = np.union1d(tk, rk)
+        a = np.zeros(keys.size); a[np.searchsorted(keys, tk)] = tc
+        b = np.zeros(keys.size); b[np.searchsorted(keys, rk)] = rc
+        mask = (a + b) >= min_count
+        keys, a, b = keys[mask], a[mask], b[mask]
+        e1 = c * (a + b) / (c + d)
+        e2 = d * (a + b) / (c + d)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            g2 = 2 * (np.where(a > 0, a * np.log(a / e1), 0) + np.where(b > 0, b * np.log(b / e2), 0))
+        g2 = np.where(a / c >= b / d, g2, -g2)
+        order = np.argsort(-g2, kind="stable")[:top]
+        return [{"term": self.label(int(keys[i]), kind), "g2": round(float(g2[i]), 2),
+                 "target": int(a[i]), "reference": int(b[i]),
+                 "target_pm": round(float(a[i]) * 1e6 / c, 2), "reference_pm": round(float(b[i]) * 1e6 / d, 2)} for i in order]
+
+    def trend(self, text, pids):
+        """Häufigkeit pro Jahr (absolut und pro Million Tokens) für einen Term oder ein Bigramm."""
+        key, kind = self.key_of(text)
+        per_year = defaultdict(lambda: [0, 0])
+        for pid in pids:
+            p = self.partitions[pid]
+            per_year[p["year"]][1] += p["tokens"]
+            if key is None:
+                continue
+            keys, cnt = self.arrays(pid, kind)
+            i = int(np.searchsorted(keys, key))
+            if i < keys.size and keys[i] == key:
+                per_year[p["year"]][0] += int(cnt[i])
+        return [{"year": y or None, "count": c, "tokens": t, "per_million": round(c * 1e6 / t, 2) if t else 0.0}
+                for y, (c, t) in sorted(per_year.items())]
+
+
+# -------------------
+# CLI
+# -------------------
+def _print_rows(rows, cols):
+    for r in rows:
+        print("  " + "  ".join(f"{r[c]!s:>12}" if c != "term" else f"{r[c]!s:<30}" for c in cols))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Frequenzlisten, Keyness und Trends aus vorberechneten Korpustabellen")
+    ap.add_argument("--index-dir", default=INDEX_DIR, help="Tabellen liegen in <index_dir>_stats")
+    ap.add_argument("--stats-dir", default=None, help="abweichender Ablageort")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    b = sub.add_parser("build", help="Tabellen (inkrementell) aufbauen")
+    b.add_argument("--corpus-root", default=CORPUS_ROOT)
+    b.add_argument("--full", action="store_true", help="alles neu zählen")
+
+    def _sel(p, prefix=""):
+        p.add_argument(f"--{prefix}magazine", help="Magazin (exakt, ohne Groß/Klein)")
+        p.add_argument(f"--{prefix}years", help="z.B. 1996 oder 1995-1997")
+        if not prefix:
+            p.add_argument("--json", action="store_true", help="Ergebnis als JSON")
+
+    f = sub.add_parser("freq", help="Frequenzliste")
+    _sel(f)
+    f.add_argument("--top", type=int, default=50)
+    f.add_argument("--bigrams", action="store_true")
+    f.add_argument("--min-count", type=int, default=1)
+
+    k = sub.add_parser("keyness", help="Schlüsselwörter Ziel vs. Referenz (Default: Rest des Korpus)")
+    _sel(k)
+    _sel(k, "ref-")
+    k.add_argument("--top", type=int, default=50)
+    k.add_argument("--bigrams", action="store_true")
+    k.add_argument("--min-count", type=int, default=5)
+
+    t = sub.add_parser("trend", help="Verlauf eines Terms/Bigramms pro Jahr")
+    t.add_argument("term")
+    _sel(t)
+    args = ap.parse_args()
+
+    store = StatsStore(args.stats_dir or stats_dir_for(args.index_dir))
+    if args.cmd == "build":
+        store.build(args.corpus_root, full=args.full)
+        return
+    if not store.partitions:
+        print(f"❌ Keine Tabellen in {store.path} – zuerst 'build' ausführen.")
+        sys.exit(2)
+
+    t0 = time.perf_counter()
+    kind = "bi" if getattr(args, "bigrams", False) else "uni"
+    if args.cmd == "freq":
+        pids = store.select(args.magazine, *_parse_years(args.years))
+        rows = store.frequency(pids, args.top, kind, args.min_count)
+        cols = ["term", "count", "per_million"]
+    elif args.cmd == "keyness":
+        target = store.select(args.magazine, *_parse_years(args.years))
+        if args.ref_magazine or args.ref_years:
+            reference = store.select(args.ref_magazine, *_parse_years(args.ref_years))
+        else:
+            reference = store.select(exclude=set(target))
+        rows = store.keyness(target, reference, args.top, kind, args.min_count)
+        cols = ["term", "g2", "target", "reference", "target_pm", "reference_pm"]
+    else:
+        rows = store.trend(args.term, store.select(args.magazine, *_parse_years(args.years)))
+        cols = ["year", "count", "tokens", "per_million"]
+    ms = (time.perf_counter() - t0) * 1000
+
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+        return
+    print(f"📊 {args.cmd}: {len(rows)} Zeilen ({ms:.1f} ms)")
+    _print_rows(rows, cols)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+# scripts/TextSearch/dedup.py
+# Nachdruck-/Dubletten-Erkennung per MinHash + LSH (Locality Sensitive Hashing).
+#
+#   python scripts/TextSearch/dedup.py clusters                   # größte Dubletten-Cluster
+#   python scripts/TextSearch/dedup.py clusters --min-size 3 --json
+#   python scripts/TextSearch/dedup.py show "<doc_key>"            # Cluster eines Artikels
+#   python scripts/TextSearch/dedup.py rebuild --threshold 0.7     # Cluster mit anderem Schwellwert neu bilden
+#
+# Der Indexer berechnet pro Artikel eine MinHash-Signatur (128 Permutationen über Wort-5-Gramme)
+# und legt sie neben dem Index ab: <index_dir>_dedup/{signatures.npy, docs.json, clusters.json}.
+# Kandidaten entstehen nur über gleiche LSH-Bänder (16 × 8 Zeilen) und werden gegen den
+# Cluster-Repräsentanten verifiziert – kein paarweiser Vergleich über den ganzen Korpus.
+# Reines numpy, kein Lucene: auch aus FCS-Endpoint und Searcher ohne Zusatzkosten nutzbar.
+import os, re, sys, json, zlib, argparse
+import numpy as np
+
+INDEX_DIR = "/Users/stoia1/Desktop/Website/DigitProject/index_dir"
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE = 5
+THRESHOLD = 0.8          # geschätzte Jaccard-Ähnlichkeit für "Nachdruck"
+FORMAT_VERSION = 1
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_PRIME = np.uint64(4294967311)          # kleinste Primzahl > 2^32
+_rng = np.random.RandomState(20240501)  # feste Permutationen → Signaturen über Läufe vergleichbar
+_A = _rng.randint(1, 2 ** 31, NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, 2 ** 32, NUM_PERM, dtype=np.int64).astype(np.uint64)
+_EMPTY = np.full(NUM_PERM, 0xFFFFFFFF, dtype=np.uint32)
+_CHUNK = 4096
+
+
+def dedup_dir_for(index_dir: str) -> str:
+    return index_dir.rstrip("/\\") + "_dedup"
+
+
+def shingle_hashes(text: str) -> np.ndarray:
+    words = _WORD.findall((text or "").lower())
+    if not words:
+        return np.empty(0, dtype=np.uint64)
+    if len(words) <= SHINGLE:
+        grams = [" ".join(words)]
+    else:
+        grams = (" ".join(words[i:i + SHINGLE]) for i in range(len(words) - SHINGLE + 1))
+    hv = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64)
+    return np.unique(hv)
+
+
+def signature(text: str) -> np.ndarray:
+    """MinHash-Signatur (uint32[NUM_PERM]); leerer Text → Sentinel, der nie geclustert wird."""
+    hv = shingle_hashes(text)
+    if hv.size == 0:
+        return _EMPTY.copy()
+    sig = np.full(NUM_PERM, np.iinfo(np.uint64).max, dtype=np.uint64)
+    for i in range(0, hv.size, _CHUNK):
+        part = hv[i:i + _CHUNK, None]
+        np.minimum(sig, ((part * _A + _B) % _PRIME).min(axis=0), out=sig)
+    return sig.astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Geschätzte Jaccard-Ähnlichkeit zweier Signaturen."""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+class DupIndex:
+    """
+    Signaturen + Cluster aller Artikel, Schlüssel ist der doc_key des Index
+    (<magazin>/issues/<issue>/articles/<artikel>).
+    """
+
+    def __init__(self):
+        self.sigs: dict[str, np.ndarray] = {}
+        self.sha1: dict[str, str | None] = {}
+        self.skipped: set[str] = set()     # exakte Dubletten, die nicht indexiert wurden
+        self.clusters: list[list[str]] = []
+        self.cluster_of: dict[str, int] = {}
+        self.threshold = THRESHOLD
+
+    # ---------- Pflege ----------
+    def add(self, key: str, sha1: str | None, text: str | None = None, sig: np.ndarray | None = None):
+        self.sigs[key] = sig if sig is not None else signature(text or "")
+        self.sha1[key] = sha1
+        self.skipped.discard(key)
+
+    def add_skipped(self, key: str, canonical: str):
+        """Exakte Dublette von canonical: Signatur übernehmen, aber als nicht indexiert markieren."""
+        self.sigs[key] = self.sigs[canonical]
+        self.sha1[key] = self.sha1.get(canonical)
+        self.skipped.add(key)
+
+    def remove(self, key: str):
+        self.sigs.pop(key, None)
+        self.sha1.pop(key, None)
+        self.skipped.discard(key)
+
+    def __contains__(self, key):
+        return key in self.sigs
+
+    def __len__(self):
+        return len(self.sigs)
+
+    # ---------- Cluster ----------
+    def build_clusters(self, threshold: float | None = None):
+        """
+        Union-Find über LSH-Buckets: gleiche sha1 → sofort ein Cluster; sonst nur Paare,
+        die in mindestens einem Band kollidieren und die Schwelle erreichen.
+        """
+        if threshold is not None:
+            self.threshold = threshold
+        keys = sorted(self.sigs)
+        n = len(keys)
+        parent = list(range(n))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        def union(i, j):
+            ri, rj = find(i), find(j)
+            if ri != rj:
+                parent[max(ri, rj)] = min(ri, rj)
+
+        by_sha1 = {}
+        for i, k in enumerate(keys):
+            h = self.sha1.get(k)
+            if h:
+                if h in by_sha1:
+                    union(by_sha1[h], i)
+                else:
+                    by_sha1[h] = i
+
+        if n > 1:
+            S = np.stack([self.sigs[k] for k in keys])
+            live = np.flatnonzero(~(S == _EMPTY).all(axis=1))
+            for b in range(BANDS):
+                band = S[live, b * ROWS:(b + 1) * ROWS]
+                _, inv = np.unique(band, axis=0, return_inverse=True)
+                inv = inv.ravel()
+                order = np.argsort(inv, kind="stable")
+                cuts = np.flatnonzero(np.diff(inv[order])) + 1
+                for group in np.split(order, cuts):
+                    if group.size < 2:
+                        continue
+                    rep = live[group[0]]
+                    for g in group[1:]:
+                        j = live[g]
+                        if find(rep) != find(j) and similarity(S[rep], S[j]) >= self.threshold:
+                            union(rep, j)
+
+        groups: dict[int, list[str]] = {}
+        for i, k in enumerate(keys):
+            groups.setdefault(find(i), []).append(k)
+        self.clusters = sorted((g for g in groups.values() if len(g) > 1), key=lambda g: (-len(g), g[0]))
+        self.cluster_of = {k: cid for cid, g in enumerate(self.clusters) for k in g}
+        return self.clusters
+
+    def cluster(self, key: str | None) -> int | None:
+        return self.cluster_of.get(key) if key else None
+
+    # ---------- Persistenz ----------
+    def save(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        keys = sorted(self.sigs)
+        sigs = np.stack([self.sigs[k] for k in keys]) if keys else np.empty((0, NUM_PERM), dtype=np.uint32)
+        np.save(os.path.join(path, "signatures.npy"), sigs)
+        with open(os.path.join(path, "docs.json"), "w", encoding="utf-8") as f:
+            json.dump({"version": FORMAT_VERSION, "num_perm": NUM_PERM, "bands": BANDS, "shingle": SHINGLE,
+                       "keys": keys, "sha1": [self.sha1.get(k) for k in keys],
+                       "skipped": sorted(self.skipped)}, f, ensure_ascii=False)
+        with open(os.path.join(path, "clusters.json"), "w", encoding="utf-8") as f:
+            json.dump({"threshold": self.threshold, "clusters": self.clusters}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> "DupIndex | None":
+        docs_path = os.path.join(path, "docs.json")
+        if not os.path.exists(docs_path):
+            return None
+        with open(docs_path, "r", encoding="utf-8") as f:
+            docs = json.load(f)
+        if docs.get("version") != FORMAT_VERSION or docs.get("num_perm") != NUM_PERM:
+            return None
+        sigs = np.load(os.path.join(path, "signatures.npy"))
+        d = cls()
+        d.sigs = {k: sigs[i] for i, k in enumerate(docs["keys"])}
+        d.sha1 = dict(zip(docs["keys"], docs["sha1"]))
+        d.skipped = set(docs.get("skipped") or [])
+        cpath = os.path.join(path, "clusters.json")
+        if os.path.exists(cpath):
+            with open(cpath, "r", encoding="utf-8") as f:
+                c = json.load(f)
+            d.threshold = c.get("threshold", THRESHOLD)
+            d.clusters = c.get("clusters") or []
+            d.cluster_of = {k: cid for cid, g in enumerate(d.clusters) for k in g}
+        return d
+
+
+_CACHE = {}  # dedup-Pfad -> (mtime_ns von clusters.json, DupIndex)
+
+
+def load_cached(index_dir: str) -> DupIndex | None:
+    """Für Searcher/Daemon/FCS: einmal laden, neu laden nur wenn der Indexer clusters.json ersetzt hat."""
+    path = dedup_dir_for(index_dir)
+    try:
+        mtime = os.stat(os.path.join(path, "clusters.json")).st_mtime_ns
+    except OSError:
+        return None
+    hit = _CACHE.get(path)
+    if hit is None or hit[0] != mtime:
+        hit = _CACHE[path] = (mtime, DupIndex.load(path))
+    return hit[1]
+
+
+class Collapser:
+    """
+    Ein Treffer pro Dubletten-Cluster: accept(doc_key) ist True für den ersten (besten) Treffer
+    eines Clusters bzw. für Artikel ohne Cluster; weitere werden gezählt (hidden[cluster]).
+    """
+
+    def __init__(self, dups: DupIndex | None):
+        self.dups = dups
+        self.first: dict[int, int] = {}   # cluster -> Position des behaltenen Treffers
+        self.hidden: dict[int, int] = {}  # Position -> Anzahl ausgeblendeter Dubletten
+        self.kept = 0
+        self.collapsed = 0
+
+    def accept(self, key: str | None) -> bool:
+        cid = self.dups.cluster(key) if self.dups is not None else None
+        if cid is not None and cid in self.first:
+            pos = self.first[cid]
+            self.hidden[pos] = self.hidden.get(pos, 0) + 1
+            self.collapsed += 1
+            return False
+        if cid is not None:
+            self.first[cid] = self.kept
+        self.kept += 1
+        return True
+
+
+def collapse_hits(searcher, qry, limit, dups, load_key, batch=100, max_scan=None, sort=None):
+    """
+    Treffer seitenweise holen (search/searchAfter, mit oder ohne Sort) und pro Dubletten-Cluster nur
+    den besten behalten, bis `limit` verschiedene Texte vorliegen oder `max_scan` Treffer geprüft
+    sind. load_key(doc_id) liefert den doc_key eines Treffers (nur dieses Feld laden).
+    Liefert ([ScoreDoc], Collapser) – gemeinsamer Kern für Searcher und FCS-Endpoint.
+    """
+    max_scan = max_scan or max(limit * 20, batch)
+    col = Collapser(dups)
+    out, scanned, last = [], 0, None
+    while len(out) < limit and scanned < max_scan:
+        if sort is None:
+            top = searcher.search(qry, batch) if last is None else searcher.searchAfter(last, qry, batch)
+        else:
+            top = searcher.search(qry, batch, sort) if last is None else searcher.searchAfter(last, qry, batch, sort)
+        if not top.scoreDocs:
+            break
+        for sd in top.scoreDocs:
+            scanned += 1
+            if col.accept(load_key(sd.doc)):
+                out.append(sd)
+                if len(out) >= limit:
+                    break
+        last = top.scoreDocs[-1]
+    return out, col
+
+
+# -------------------
+# CLI
+# -------------------
+def _print_cluster(cid, keys, dups):
+    print(f"\n🧬 Cluster {cid} ({len(keys)} Artikel)")
+    base = dups.sigs[keys[0]]
+    for k in keys:
+        mark = "  [nicht indexiert]" if k in dups.skipped else ""
+        print(f"   • {k}  (≈{similarity(base, dups.sigs[k]):.2f}){mark}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Dubletten-/Nachdruck-Cluster (MinHash-LSH) neben dem Lucene-Index")
+    ap.add_argument("--index-dir", default=INDEX_DIR, help="Lucene-Index; Signaturen liegen in <index_dir>_dedup")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    c = sub.add_parser("clusters", help="Cluster nach Größe auflisten")
+    c.add_argument("--min-size", type=int, default=2)
+    c.add_argument("--top", type=int, default=50)
+    c.add_argument("--json", action="store_true")
+    s = sub.add_parser("show", help="Cluster eines Artikels (doc_key)")
+    s.add_argument("doc_key")
+    r = sub.add_parser("rebuild", help="Cluster mit neuem Schwellwert aus den gespeicherten Signaturen bilden")
+    r.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = ap.parse_args()
+
+    path = dedup_dir_for(args.index_dir)
+    dups = DupIndex.load(path)
+    if dups is None:
+        print(f"❌ Keine Signaturen in {path} – Index mit Indexer.py (ohne --no-dedup) bauen.")
+        sys.exit(2)
+
+    if args.cmd == "rebuild":
+        dups.build_clusters(args.threshold)
+        dups.save(path)
+        print(f"✅ {len(dups.clusters)} Cluster bei Schwelle {dups.threshold} → {path}")
+        return
+
+    if args.cmd == "show":
+        cid = dups.cluster(args.doc_key)
+        if cid is None:
+            print("ℹ️  Keine Dubletten bekannt." if args.doc_key in dups else "❌ doc_key unbekannt.")
+            return
+        _print_cluster(cid, dups.clusters[cid], dups)
+        return
+
+    rows = [(cid, g) for cid, g in enumerate(dups.clusters) if len(g) >= args.min_size][:args.top]
+    if args.json:
+        print(json.dumps([{"cluster": cid, "size": len(g), "docs": g} for cid, g in rows], ensure_ascii=False, indent=2))
+        return
+    in_clusters = sum(len(g) for g in dups.clusters)
+    print(f"📚 {len(dups)} Artikel, {len(dups.clusters)} Dubletten-Cluster mit {in_clusters} Artikeln "
+          f"(Schwelle {dups.threshold}, {len(dups.skipped)} exakte Dubletten nicht indexiert)")
+    for cid, g in rows:
+        _print_cluster(cid, g, dups)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# scripts/TextSearch/doc_loader.py
+# Feldselektives Laden gespeicherter Felder für die Trefferanzeige.
+#
+# storedFields().document(doc) dekodiert jedes gespeicherte Feld – auch den kompletten "content".
+# Eine Trefferliste ohne KWIC braucht davon nur ein paar kurze Metadatenfelder. DocLoader lädt
+# pro Ansicht nur die benötigten Felder (StoredFields.document(doc, Set<String>)), verwendet eine
+# StoredFields-Instanz pro Anfrage (nicht threadsicher → nicht über Threads teilen) und liest
+# mehrere Treffer in docid-Reihenfolge (aufeinanderfolgende Blöcke statt Sprüngen im .fdt).
+from java.util import HashSet
+
+# Feldsätze der Ansichten
+KEY_FIELDS = ("doc_key",)
+LIST_FIELDS = ("title", "filename", "magazine", "issue_label", "issue_date_iso", "article_url")
+KWIC_FIELDS = LIST_FIELDS + ("content",)
+RECORD_FIELDS = ("title", "magazine", "issue_label", "issue_date_iso")  # SRU-Record (Header + Extents)
+
+_SETS = {}  # Feld-Tupel -> java.util.HashSet (erst nach lucene.initVM() erzeugbar, nur gelesen)
+
+
+def field_set(fields):
+    key = tuple(fields)
+    s = _SETS.get(key)
+    if s is None:
+        s = HashSet()
+        for f in key:
+            s.add(f)
+        _SETS[key] = s
+    return s
+
+
+class DocLoader:
+    """Lädt Dokumente einer Anfrage mit einer StoredFields-Instanz und festem Default-Feldsatz."""
+
+    def __init__(self, reader, fields=LIST_FIELDS):
+        self.sf = reader.storedFields()
+        self.fields = field_set(fields)
+
+    def load(self, doc_id, fields=None):
+        return self.sf.document(int(doc_id), field_set(fields) if fields else self.fields)
+
+    def load_all(self, doc_ids, fields=None) -> list:
+        """Alle docids in aufsteigender Reihenfolge lesen, Ergebnis in Eingabereihenfolge."""
+        fs = field_set(fields) if fields else self.fields
+        out = [None] * len(doc_ids)
+        for i in sorted(range(len(doc_ids)), key=doc_ids.__getitem__):
+            out[i] = self.sf.document(int(doc_ids[i]), fs)
+        return out
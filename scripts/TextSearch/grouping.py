@@ -0,0 +1,85 @@
+# scripts/TextSearch/grouping.py
+# Treffer nach Ausgabe oder Magazin gruppieren: ein Eintrag pro Gruppe mit bestem Artikel und Trefferzahl.
+#
+# GroupingSearch arbeitet auf SortedDocValues und braucht zwei Durchläufe über die Treffer:
+# 1. die besten offset+limit Gruppen (Heap fester Größe), 2. Top-Dokument + Trefferzahl nur für diese.
+# Der zweite Durchlauf liest die Treffer aus einem auf CACHE_MB begrenzten Cache statt die Query
+# erneut auszuführen; die Menge aller Gruppen (für die Gesamtzahl) wächst nur mit der Gruppenanzahl.
+# Speicher ist damit unabhängig von der Trefferzahl.
+from org.apache.lucene.document import SortedDocValuesField
+from org.apache.lucene.index import DirectoryReader, FieldInfos
+from org.apache.lucene.search import FieldExistsQuery, IndexSearcher, Sort
+from org.apache.lucene.search.grouping import GroupingSearch
+from org.apache.lucene.util import BytesRef
+
+ISSUE_GROUP_FIELD = "group_issue"   # <Magazinordner>/issues/<Ausgabeordner>, SortedDocValues (Indexer)
+GROUP_MODES = {"issue": ISSUE_GROUP_FIELD, "magazine": "magazine"}
+CACHE_MB = 8.0
+
+
+def issue_group_key(mag_dir: str, issue_dir: str) -> str:
+    return "/".join((mag_dir, "issues", issue_dir))
+
+
+def group_fields(doc, issue_key: str):
+    """DocValues für die Ausgaben-Gruppierung (magazine hat schon SortedDocValues, siehe sorting.py)."""
+    doc.add(SortedDocValuesField(ISSUE_GROUP_FIELD, BytesRef(issue_key)))
+
+
+def index_has_groups(store) -> bool:
+    """
+    True, wenn jedes lebende Dokument des vorhandenen Index group_issue trägt. Ältere Indizes
+    (ohne das Feld) brauchen einen Vollaufbau – sonst fielen unveränderte Artikel einer
+    inkrementellen Aktualisierung alle in dieselbe Gruppe None.
+    """
+    reader = DirectoryReader.open(store)
+    try:
+        if FieldInfos.getMergedFieldInfos(reader).fieldInfo(ISSUE_GROUP_FIELD) is None:
+            return reader.numDocs() == 0
+        return IndexSearcher(reader).count(FieldExistsQuery(ISSUE_GROUP_FIELD)) == reader.numDocs()
+    finally:
+        reader.close()
+
+
+def _attr(obj, name):
+    """Feld (Lucene 9) oder Record-Accessor (Lucene 10, z.B. GroupDocs.scoreDocs())."""
+    v = getattr(obj, name)
+    return v() if callable(v) else v
+
+
+def _count(total_hits):
+    """GroupDocs.totalHits: TotalHits (Lucene ≥ 9) oder long."""
+    return int(_attr(total_hits, "value") if hasattr(total_hits, "value") else total_hits)
+
+
+def grouped_search(searcher, qry, mode: str, limit: int, offset: int = 0, sort=None):
+    """
+    Gruppierte Suche. mode: "issue" | "magazine"; sort: None = Relevanz, sonst Feldsortierung
+    (Gruppen werden nach ihrem besten Dokument geordnet). Liefert
+      (groups=[(Gruppenwert oder None, ScoreDoc des Top-Artikels, Treffer in der Gruppe)],
+       total_groups, total_hits)
+    Dokumente ohne Gruppenfeld (z.B. aus älteren Indexständen) landen in der Gruppe None.
+    """
+    field = GROUP_MODES.get(mode)
+    if field is None:
+        raise ValueError(f"Unbekannte Gruppierung: {mode} (erlaubt: {', '.join(GROUP_MODES)})")
+    gs = GroupingSearch(field)
+    order = sort or Sort.RELEVANCE
+    gs.setGroupSort(order)
+    gs.setSortWithinGroup(order)
+    gs.setGroupDocsLimit(1)
+    gs.setAllGroups(True)
+    gs.setCachingInMB(CACHE_MB, sort is None)
+    top = gs.search(searcher, qry, offset, limit)
+    if top is None:
+        return [], 0, 0
+    groups = []
+    for g in _attr(top, "groups"):
+        value = _attr(g, "groupValue")
+        label = BytesRef.cast_(value).utf8ToString() if value is not None else None
+        score_docs = _attr(g, "scoreDocs")
+        if score_docs:
+            groups.append((label, score_docs[0], _count(_attr(g, "totalHits"))))
+    total_groups = _attr(top, "totalGroupCount")
+    total_groups = int(total_groups.intValue()) if hasattr(total_groups, "intValue") else int(total_groups or len(groups))
+    return groups, total_groups, int(_attr(top, "totalHitCount"))
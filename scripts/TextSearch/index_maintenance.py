@@ -0,0 +1,171 @@
+# scripts/TextSearch/index_maintenance.py
+# Index-Wartung: Segmentstatistik, forceMerge und Codec-/Compound-Wahl mit Vorher/Nachher-Vergleich.
+#
+#   python scripts/TextSearch/index_maintenance.py stats
+#   python scripts/TextSearch/index_maintenance.py merge --max-segments 1
+#   python scripts/TextSearch/index_maintenance.py merge --max-segments 1 --stored-mode compression --no-compound
+#   python scripts/TextSearch/index_maintenance.py probe            # nur Query-Latenz messen
+#
+# Hinweis zum Codec: Beim forceMerge schreibt der IndexWriter die neuen Segmente mit seinem Codec.
+# Ist der Index schon auf max-segments, wird nichts umgeschrieben – für einen reinen Codec-Wechsel
+# den Index mit Indexer.py --stored-mode … neu bauen.
+import os, json, argparse, time
+from java.nio.file import Paths
+from org.apache.lucene.store import FSDirectory
+from org.apache.lucene.index import DirectoryReader, IndexWriter, IndexWriterConfig, SegmentInfos
+from org.apache.lucene.search import IndexSearcher
+
+from Indexer import INDEX_DIR, ensure_vm, make_analyzer, make_writer_config
+from Searcher import build_query
+import meta_table
+from sorting import index_is_sorted
+
+STORED_MODE_ATTR = "Lucene90StoredFieldsFormat.mode"
+
+# feste Query-Mischung für den Latenzvergleich (q, magazine, years)
+PROBE_QUERIES = [
+    ("covox", None, None),
+    ("ковокс OR covox", None, None),
+    ('"sound blaster"', None, None),
+    ("прог*", None, None),
+    ("", None, (1996, 1997)),
+    ("demo", None, (1995, 1999)),
+]
+
+
+def dir_size(index_dir: str) -> int:
+    return sum(os.path.getsize(os.path.join(index_dir, f)) for f in os.listdir(index_dir)
+               if os.path.isfile(os.path.join(index_dir, f)))
+
+
+def segment_stats(index_dir: str) -> dict:
+    """Pro Segment: Docs, Löschungen, Größe, Compound, Codec, Stored-Fields-Modus."""
+    store = FSDirectory.open(Paths.get(index_dir))
+    infos = SegmentInfos.readLatestCommit(store)
+    segs = []
+    for i in range(infos.size()):
+        sci = infos.info(i)
+        si = sci.info
+        segs.append({
+            "name": si.name,
+            "max_doc": si.maxDoc(),
+            "del_count": sci.getDelCount(),
+            "size_bytes": sci.sizeInBytes(),
+            "compound": bool(si.getUseCompoundFile()),
+            "codec": si.getCodec().getName(),
+            "stored_mode": si.getAttribute(STORED_MODE_ATTR),
+        })
+    store.close()
+    return {
+        "generation": infos.getGeneration(),
+        "segments": segs,
+        "docs": sum(s["max_doc"] - s["del_count"] for s in segs),
+        "deleted": sum(s["del_count"] for s in segs),
+        "dir_bytes": dir_size(index_dir),
+    }
+
+
+def latency_probe(index_dir: str, repeat: int = 20) -> dict:
+    """p50/p95 (ms) über die feste Query-Mischung, nach einem Aufwärmdurchlauf."""
+    reader = DirectoryReader.open(FSDirectory.open(Paths.get(index_dir)))
+    searcher = IndexSearcher(reader)
+    queries = [build_query(q, mag, None, "ru", *(years or (None, None))) for q, mag, years in PROBE_QUERIES]
+    for q in queries:
+        searcher.search(q, 10)
+    samples = []
+    for _ in range(repeat):
+        for q in queries:
+            t = time.perf_counter()
+            top = searcher.search(q, 10)
+            sf = reader.storedFields()
+            for sd in top.scoreDocs:
+                sf.document(sd.doc)
+            samples.append((time.perf_counter() - t) * 1000)
+    reader.close()
+    samples.sort()
+    pick = lambda p: samples[min(len(samples) - 1, int(p * len(samples)))]
+    return {"n": len(samples), "p50_ms": round(pick(0.50), 3), "p95_ms": round(pick(0.95), 3)}
+
+
+def force_merge(index_dir: str, max_segments: int = 1, stored_mode: str = "speed", compound: bool = True):
+    store = FSDirectory.open(Paths.get(index_dir))
+    # Index-Sortierung nur beibehalten, nicht nachträglich einführen (das erlaubt der IndexWriter nicht)
+    config = make_writer_config(make_analyzer(), stored_mode=stored_mode, compound=compound,
+                                index_sort=index_is_sorted(store))
+    config.setOpenMode(IndexWriterConfig.OpenMode.APPEND)
+    writer = IndexWriter(store, config)
+    try:
+        writer.forceMerge(max_segments)
+        writer.commit()
+    finally:
+        writer.close()
+        store.close()
+    # docids haben sich verschoben – Metadatentabelle passend zum neuen Stand neu bauen
+    if os.path.isdir(meta_table.meta_dir_for(index_dir)):
+        meta_table.build_for_index(index_dir)
+
+
+def _print_stats(st: dict):
+    print(f"Commit-Generation {st['generation']} | Docs {st['docs']} | gelöscht {st['deleted']} | "
+          f"{len(st['segments'])} Segmente | {st['dir_bytes'] / 1e6:.1f} MB")
+    print(f"  {'Segment':8s} {'Docs':>7s} {'Del':>6s} {'MB':>8s}  {'CFS':3s}  Codec / Stored-Modus")
+    for s in st["segments"]:
+        print(f"  {s['name']:8s} {s['max_doc']:7d} {s['del_count']:6d} {s['size_bytes'] / 1e6:8.2f}  "
+              f"{'ja' if s['compound'] else 'nein':3s}  {s['codec']} / {s['stored_mode'] or '?'}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Lucene-Index: Segmentstatistik, forceMerge, Codec-Wahl")
+    ap.add_argument("command", choices=["stats", "merge", "probe"])
+    ap.add_argument("--index-dir", default=INDEX_DIR)
+    ap.add_argument("--max-segments", type=int, default=1, help="Ziel-Segmentanzahl für merge")
+    ap.add_argument("--stored-mode", choices=["speed", "compression"], default="speed",
+                    help="Codec für neu geschriebene Segmente")
+    ap.add_argument("--no-compound", action="store_true", help="Ergebnis-Segmente ohne .cfs")
+    ap.add_argument("--repeat", type=int, default=20, help="Wiederholungen der Query-Mischung")
+    ap.add_argument("--json", help="Bericht zusätzlich als JSON schreiben")
+    args = ap.parse_args()
+
+    ensure_vm()
+    report = {"index_dir": args.index_dir, "command": args.command}
+
+    if args.command == "stats":
+        report["stats"] = segment_stats(args.index_dir)
+        _print_stats(report["stats"])
+
+    elif args.command == "probe":
+        report["latency"] = latency_probe(args.index_dir, args.repeat)
+        print(f"⏱  Latenz: {report['latency']}")
+
+    else:
+        before = segment_stats(args.index_dir)
+        lat_before = latency_probe(args.index_dir, args.repeat)
+        print("— vorher —")
+        _print_stats(before)
+        print(f"⏱  Latenz vorher: {lat_before}")
+
+        t0 = time.perf_counter()
+        force_merge(args.index_dir, args.max_segments, args.stored_mode, not args.no_compound)
+        merge_s = time.perf_counter() - t0
+
+        after = segment_stats(args.index_dir)
+        lat_after = latency_probe(args.index_dir, args.repeat)
+        print(f"\n— nachher (forceMerge {merge_s:.1f}s) —")
+        _print_stats(after)
+        print(f"⏱  Latenz nachher: {lat_after}")
+        print(f"\n📉 Größe: {before['dir_bytes'] / 1e6:.1f} MB → {after['dir_bytes'] / 1e6:.1f} MB | "
+              f"p50: {lat_before['p50_ms']} → {lat_after['p50_ms']} ms | "
+              f"p95: {lat_before['p95_ms']} → {lat_after['p95_ms']} ms")
+        report.update(before=before, after=after, latency_before=lat_before,
+                      latency_after=lat_after, merge_seconds=round(merge_s, 2),
+                      max_segments=args.max_segments, stored_mode=args.stored_mode,
+                      compound=not args.no_compound)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"📝 Bericht: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# scripts/TextSearch/infix.py
+# Trigramm-Unterfeld für Infix-/Teilwortsuche (ZX-Jargon, Hex-Adressen, zusammengesetzte Bezeichner).
+# Der Index beantwortet Infix-Anfragen über die Schnittmenge der Trigramm-Postings,
+# die Kandidaten werden danach per str-Vergleich verifiziert.
+from java.io import StringReader
+from java.util import HashMap
+from org.apache.lucene.analysis.custom import CustomAnalyzer
+from org.apache.lucene.analysis.tokenattributes import CharTermAttribute
+from org.apache.lucene.document import Field, FieldType
+from org.apache.lucene.index import IndexOptions, Term
+from org.apache.lucene.search import BooleanQuery, BooleanClause, TermQuery, WildcardQuery
+
+TRIGRAM_FIELD = "content_tri"
+GRAM = 3
+
+
+def trigram_analyzer():
+    """Zeichen-Trigramme, kleingeschrieben (identisch für Index und Anfrage)."""
+    params = HashMap()
+    params.put("minGramSize", str(GRAM))
+    params.put("maxGramSize", str(GRAM))
+    return (CustomAnalyzer.builder()
+            .withTokenizer("nGram", params)
+            .addTokenFilter("lowercase", HashMap())
+            .build())
+
+
+def _trigram_field_type():
+    # Nur DOCS: keine Frequenzen/Positionen nötig, Verifikation passiert im Text
+    ft = FieldType()
+    ft.setIndexOptions(IndexOptions.DOCS)
+    ft.setTokenized(True)
+    ft.setStored(False)
+    ft.setOmitNorms(True)
+    ft.freeze()
+    return ft
+
+
+_TRIGRAM_TYPE = None  # erst nach lucene.initVM() erzeugbar
+
+
+def trigram_field(content: str):
+    global _TRIGRAM_TYPE
+    if _TRIGRAM_TYPE is None:
+        _TRIGRAM_TYPE = _trigram_field_type()
+    return Field(TRIGRAM_FIELD, content, _TRIGRAM_TYPE)
+
+
+def trigrams(needle: str, analyzer=None) -> list[str]:
+    """Eindeutige Trigramme der Suchzeichenkette (über denselben Analyzer wie beim Indexieren)."""
+    if not needle:
+        return []
+    analyzer = analyzer or trigram_analyzer()
+    ts = analyzer.tokenStream(TRIGRAM_FIELD, StringReader(needle))
+    term_attr = ts.addAttribute(CharTermAttribute.class_)
+    ts.reset()
+    out, seen = [], set()
+    while ts.incrementToken():
+        t = term_attr.toString()
+        if t not in seen:
+            seen.add(t)
+            out.append(t)
+    ts.end()
+    ts.close()
+    return out
+
+
+def build_infix_query(needle: str, analyzer=None):
+    """
+    Kandidaten-Query: alle Trigramme als FILTER-Klauseln (reine Postings-Schnittmenge, kein Scoring).
+    Kürzer als 3 Zeichen → WildcardQuery auf content (langsam, aber korrekt).
+    """
+    grams = trigrams(needle, analyzer)
+    if not grams:
+        return WildcardQuery(Term("content", f"*{(needle or '').lower()}*"))
+    b = BooleanQuery.Builder()
+    for g in grams:
+        b.add(TermQuery(Term(TRIGRAM_FIELD, g)), BooleanClause.Occur.FILTER)
+    return b.build()
+
+
+def verify(text: str, needle: str) -> bool:
+    """Trigramm-Treffer sind nur Kandidaten – erst der Textvergleich bestätigt den Infix."""
+    if not text or not needle:
+        return False
+    return needle.lower() in text.lower()
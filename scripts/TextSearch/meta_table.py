@@ -0,0 +1,363 @@
+# scripts/TextSearch/meta_table.py
+# Spaltenorientierte Metadatentabelle: eine Zeile pro Lucene-docid, NumPy-Arrays per mmap.
+#
+#   python scripts/TextSearch/meta_table.py build                  # (macht der Indexer automatisch)
+#   python scripts/TextSearch/meta_table.py info
+#   python scripts/TextSearch/meta_table.py dist magazine --top 20
+#   python scripts/TextSearch/meta_table.py dist year --magazine Spectrofon
+#   python scripts/TextSearch/meta_table.py group magazine year --years 1996-1998
+#
+# Ablage neben dem Index in <index_dir>_meta/:
+#   table.json          – Format, Index-Version (DirectoryReader.getVersion), maxDoc, Spaltenliste
+#   dicts.json          – Wörterbücher der kategorialen Spalten (Code = Listenposition, -1 = fehlt)
+#   <spalte>.npy        – ein Array der Länge maxDoc pro Spalte
+# Die Zeilennummer ist die globale docid; nach jedem Commit/Merge ändern sich docids, deshalb gilt
+# die Tabelle nur für die Index-Version, mit der sie gebaut wurde (load_current prüft das).
+# Filtern, Gruppieren und Verteilungen sind Vektoroperationen – Abfragen brauchen weder JVM noch Index.
+import os, sys, json, time, argparse
+
+import numpy as np
+
+INDEX_DIR = "/Users/stoia1/Desktop/Website/DigitProject/index_dir"
+
+FORMAT_VERSION = 1
+
+# gespeicherte Felder, deren Vorhandensein pro Dokument als Bit in "coverage" steht (Healthcheck)
+COVERAGE_FIELDS = ("content", "magazine", "magazine_id_s", "form", "language", "city", "country",
+                   "issue_label", "issue_date_iso", "issue_date_epoch_ms", "article_id_s", "title",
+                   "article_url", "print_url")
+CATEGORIES = ("magazine", "form", "language", "city", "country")
+
+MISSING = -1                       # int-Spalten und Kategorie-Codes
+NO_DATE = np.iinfo(np.int64).min   # date_ms
+YEAR_MISSING, YEAR_PLACEHOLDER, YEAR_INVALID = -1, 0, -2
+
+COLUMNS = {
+    "live": np.bool_,
+    "article_id": np.int32,
+    "magazine_id": np.int32,
+    "date_ms": np.int64,
+    "year": np.int16,
+    "order": np.int32,
+    "text_len": np.int32,
+    "coverage": np.uint16,
+    **{c: np.int32 for c in CATEGORIES},
+}
+_FILLS = {"live": False, "date_ms": NO_DATE, "year": YEAR_MISSING, "text_len": 0, "coverage": 0}
+
+
+def meta_dir_for(index_dir: str) -> str:
+    return index_dir.rstrip("/\\") + "_meta"
+
+
+def _int(value, default=MISSING):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _year(iso):
+    if not iso:
+        return YEAR_MISSING
+    if iso.startswith("0000"):
+        return YEAR_PLACEHOLDER
+    y = iso[:4]
+    return int(y) if y.isdigit() and len(iso) >= 10 else YEAR_INVALID
+
+
+# -------------------
+# Aufbau (einziger Teil, der Lucene braucht)
+# -------------------
+def build(reader, path: str) -> "MetaTable":
+    """Tabelle aus den gespeicherten Feldern eines geöffneten DirectoryReader bauen und ablegen."""
+    from java.util import HashSet
+    from org.apache.lucene.index import MultiBits
+
+    n = reader.maxDoc()
+    cols = {name: np.full(n, _FILLS.get(name, MISSING), dtype=dt) for name, dt in COLUMNS.items()}
+    dicts = {c: {} for c in CATEGORIES}
+
+    wanted = HashSet()
+    for f in (*COVERAGE_FIELDS, "order_s"):
+        wanted.add(f)
+    live = MultiBits.getLiveDocs(reader)
+    sf = reader.storedFields()
+    for i in range(n):
+        if live is not None and not live.get(i):
+            continue
+        d = sf.document(i, wanted)
+        cov = 0
+        for bit, f in enumerate(COVERAGE_FIELDS):
+            if d.get(f):
+                cov |= 1 << bit
+        cols["live"][i] = True
+        cols["coverage"][i] = cov
+        cols["text_len"][i] = len(d.get("content") or "")
+        cols["article_id"][i] = _int(d.get("article_id_s"))
+        cols["magazine_id"][i] = _int(d.get("magazine_id_s"))
+        cols["order"][i] = _int(d.get("order_s"))
+        cols["date_ms"][i] = _int(d.get("issue_date_epoch_ms"), NO_DATE)
+        cols["year"][i] = _year(d.get("issue_date_iso"))
+        for c in CATEGORIES:
+            v = d.get(c)
+            if v:
+                cols[c][i] = dicts[c].setdefault(v, len(dicts[c]))
+
+    os.makedirs(path, exist_ok=True)
+    for name, arr in cols.items():
+        tmp = os.path.join(path, f"{name}.npy.tmp")
+        with open(tmp, "wb") as f:
+            np.save(f, arr)
+        os.replace(tmp, os.path.join(path, f"{name}.npy"))
+    _write_json(os.path.join(path, "dicts.json"), {c: list(d) for c, d in dicts.items()})
+    # table.json zuletzt: erst damit wird die neue Tabelle für load_current sichtbar
+    _write_json(os.path.join(path, "table.json"), {
+        "format": FORMAT_VERSION, "index_version": int(reader.getVersion()), "max_doc": n,
+        "num_docs": int(reader.numDocs()), "columns": list(COLUMNS), "built": time.strftime("%Y-%m-%d %H:%M:%S"),
+    })
+    return MetaTable.load(path)
+
+
+def build_for_index(index_dir: str) -> "MetaTable":
+    """Index öffnen, Tabelle nach <index_dir>_meta schreiben (JVM muss laufen)."""
+    from java.nio.file import Paths
+    from org.apache.lucene.index import DirectoryReader
+    from org.apache.lucene.store import FSDirectory
+
+    reader = DirectoryReader.open(FSDirectory.open(Paths.get(index_dir)))
+    try:
+        return build(reader, meta_dir_for(index_dir))
+    finally:
+        reader.close()
+
+
+def _write_json(path, obj):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+# -------------------
+# Abfragen
+# -------------------
+class MetaTable:
+    def __init__(self, path: str, info: dict, cols: dict, dicts: dict):
+        self.path = path
+        self.info = info
+        self.cols = cols
+        self.dicts = dicts
+        self._codes = {c: {v: i for i, v in enumerate(vals)} for c, vals in dicts.items()}
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "MetaTable | None":
+        try:
+            with open(os.path.join(path, "table.json"), "r", encoding="utf-8") as f:
+                info = json.load(f)
+            with open(os.path.join(path, "dicts.json"), "r", encoding="utf-8") as f:
+                dicts = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if info.get("format") != FORMAT_VERSION:
+            return None
+        mode = "r" if mmap else None
+        cols = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode) for name in info["columns"]}
+        return cls(path, info, cols, dicts)
+
+    def __len__(self):
+        return self.info["max_doc"]
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.cols[name]
+
+    def matches(self, reader) -> bool:
+        """Gehört die Tabelle zu genau diesem Reader-Stand (gleiche docids)?"""
+        return (self.info.get("index_version") == int(reader.getVersion())
+                and self.info.get("max_doc") == reader.maxDoc())
+
+    # ---- Wörterbücher ----
+    def values(self, name: str) -> list:
+        return self.dicts[name]
+
+    def code(self, name: str, value, ignore_case: bool = False) -> int:
+        if value is None:
+            return MISSING
+        code = self._codes[name].get(value)
+        if code is None and ignore_case:
+            low = value.lower()
+            code = next((i for i, v in enumerate(self.dicts[name]) if v.lower() == low), None)
+        return MISSING if code is None else code
+
+    def decode(self, name: str, code: int):
+        return self.dicts[name][code] if code >= 0 else None
+
+    # ---- Filter ----
+    def mask(self, magazine=None, form=None, language=None, year_from=None, year_to=None,
+             live_only: bool = True) -> np.ndarray:
+        """Boolesche Zeilenmaske; Kategorien exakt (Magazin ohne Groß/Klein), Jahre inklusiv."""
+        m = self.cols["live"].copy() if live_only else np.ones(len(self), dtype=np.bool_)
+        for name, value in (("magazine", magazine), ("form", form), ("language", language)):
+            if value:
+                code = self.code(name, value, ignore_case=(name == "magazine"))
+                if code == MISSING:
+                    return np.zeros(len(self), dtype=np.bool_)
+                m &= self.cols[name] == code
+        if year_from is not None or year_to is not None:
+            year = self.cols["year"]
+            m &= year > 0
+            if year_from is not None:
+                m &= year >= year_from
+            if year_to is not None:
+                m &= year <= year_to
+        return m
+
+    def docids(self, mask: np.ndarray) -> np.ndarray:
+        return np.flatnonzero(mask)
+
+    # ---- Aggregation ----
+    def live_values(self, name: str) -> list:
+        """Sortierte Werte einer Kategorie, die in lebenden Dokumenten vorkommen."""
+        codes = np.unique(self.cols[name][self.cols["live"]])
+        return sorted(self.dicts[name][c] for c in codes if c >= 0)
+
+    def distribution(self, name: str, mask: np.ndarray | None = None, top: int | None = None) -> list:
+        """[(Wert, Anzahl)] absteigend; fehlende Werte (-1/NO_DATE) werden nicht gezählt."""
+        mask = self.cols["live"] if mask is None else mask
+        col = self.cols[name][mask]
+        if name in CATEGORIES:
+            counts = np.bincount(col[col >= 0], minlength=len(self.dicts[name]))
+            keys = np.flatnonzero(counts)
+            pairs = [(self.dicts[name][k], int(counts[k])) for k in keys]
+        else:
+            col = col[col > 0] if name == "year" else col[col != (NO_DATE if name == "date_ms" else MISSING)]
+            keys, counts = np.unique(col, return_counts=True)
+            pairs = [(k.item(), int(c)) for k, c in zip(keys, counts)]
+        pairs.sort(key=lambda p: -p[1])
+        return pairs[:top] if top else pairs
+
+    def group(self, names, mask: np.ndarray | None = None, top: int | None = None) -> list:
+        """Kreuztabelle über mehrere Spalten: [((wert1, wert2, …), Anzahl)] absteigend."""
+        mask = self.cols["live"] if mask is None else mask
+        stacked = np.stack([self.cols[n][mask].astype(np.int64) for n in names], axis=1)
+        if not len(stacked):
+            return []
+        keys, counts = np.unique(stacked, axis=0, return_counts=True)
+        order = np.argsort(-counts, kind="stable")
+        if top:
+            order = order[:top]
+        out = []
+        for i in order:
+            vals = tuple(self.decode(n, int(k)) if n in CATEGORIES else int(k) for n, k in zip(names, keys[i]))
+            out.append((vals, int(counts[i])))
+        return out
+
+    def coverage(self, mask: np.ndarray | None = None) -> dict:
+        """Gespeichertes Feld → Anzahl Dokumente, in denen es belegt ist."""
+        mask = self.cols["live"] if mask is None else mask
+        cov = self.cols["coverage"][mask]
+        return {f: int(np.count_nonzero(cov & (1 << bit))) for bit, f in enumerate(COVERAGE_FIELDS)}
+
+    def has(self, field: str) -> np.ndarray:
+        return (self.cols["coverage"] & (1 << COVERAGE_FIELDS.index(field))) != 0
+
+    def date_span(self, mask: np.ndarray | None = None):
+        mask = self.cols["live"] if mask is None else mask
+        d = self.cols["date_ms"][mask]
+        d = d[d != NO_DATE]
+        return (int(d.min()), int(d.max())) if len(d) else (None, None)
+
+
+_CACHE: dict = {}  # Pfad -> (mtime von table.json, MetaTable)
+
+
+def load_cached(index_dir: str) -> MetaTable | None:
+    """Einmal laden (mmap), neu laden erst, wenn table.json ersetzt wurde."""
+    path = meta_dir_for(index_dir)
+    try:
+        mtime = os.stat(os.path.join(path, "table.json")).st_mtime_ns
+    except OSError:
+        return None
+    hit = _CACHE.get(path)
+    if hit is None or hit[0] != mtime:
+        hit = _CACHE[path] = (mtime, MetaTable.load(path))
+    return hit[1]
+
+
+def load_current(index_dir: str, reader) -> MetaTable | None:
+    """Wie load_cached, aber nur wenn die Tabelle zum Stand des Readers passt – sonst None."""
+    mt = load_cached(index_dir)
+    return mt if mt is not None and mt.matches(reader) else None
+
+
+# -------------------
+# CLI
+# -------------------
+def _parse_years(value):
+    if not value:
+        return None, None
+    if "-" in value:
+        a, b = value.split("-", 1)
+        return (int(a) if a.strip() else None, int(b) if b.strip() else None)
+    return int(value), int(value)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Spaltenorientierte Artikel-Metadaten (NumPy, mmap)")
+    ap.add_argument("--index-dir", default=INDEX_DIR, help="Tabelle liegt in <index_dir>_meta")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("build", help="Tabelle aus dem Index (neu) aufbauen")
+    sub.add_parser("info", help="Stand und Spalten anzeigen")
+
+    def _sel(p):
+        p.add_argument("--magazine", help="Magazin (exakt, ohne Groß/Klein)")
+        p.add_argument("--form", help="Form (Журнал | Газета)")
+        p.add_argument("--lang", help="Sprache")
+        p.add_argument("--years", help="z.B. 1996 oder 1995-1997")
+        p.add_argument("--top", type=int, default=None)
+        p.add_argument("--json", action="store_true", help="Ergebnis als JSON")
+
+    d = sub.add_parser("dist", help="Verteilung einer Spalte")
+    d.add_argument("column", choices=[c for c in COLUMNS if c not in ("live", "coverage")])
+    _sel(d)
+    g = sub.add_parser("group", help="Kreuztabelle über mehrere Spalten")
+    g.add_argument("columns", nargs="+", choices=[c for c in COLUMNS if c not in ("live", "coverage")])
+    _sel(g)
+    args = ap.parse_args()
+
+    if args.cmd == "build":
+        import lucene
+        lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+        t0 = time.perf_counter()
+        mt = build_for_index(args.index_dir)
+        print(f"✅ Metadatentabelle: {mt.info['num_docs']} Docs, {len(mt.cols)} Spalten "
+              f"in {time.perf_counter() - t0:.1f}s → {mt.path}")
+        return
+
+    mt = MetaTable.load(meta_dir_for(args.index_dir))
+    if mt is None:
+        print(f"❌ Keine Tabelle in {meta_dir_for(args.index_dir)} – zuerst 'build' ausführen.")
+        sys.exit(2)
+    if args.cmd == "info":
+        print(json.dumps(mt.info, ensure_ascii=False, indent=2))
+        print("Kategorien:", {c: len(v) for c, v in mt.dicts.items()})
+        return
+
+    t0 = time.perf_counter()
+    mask = mt.mask(args.magazine, args.form, args.lang, *_parse_years(args.years))
+    if args.cmd == "dist":
+        rows = mt.distribution(args.column, mask, args.top)
+    else:
+        rows = mt.group(args.columns, mask, args.top)
+    ms = (time.perf_counter() - t0) * 1000
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+        return
+    print(f"📊 {args.cmd}: {int(mask.sum())} Docs, {len(rows)} Zeilen ({ms:.1f} ms)")
+    for key, count in rows:
+        label = " | ".join(map(str, key)) if isinstance(key, tuple) else str(key)
+        print(f"  {label:<40s} {count:>8d}")
+
+
+if __name__ == "__main__":
+    main()
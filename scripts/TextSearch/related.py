@@ -0,0 +1,143 @@
+# scripts/TextSearch/related.py
+# "Ähnliche Artikel": MoreLikeThis über gespeicherte Term-Vektoren des Feldes content.
+#
+#   python scripts/TextSearch/Searcher.py --related 12345
+#   python scripts/TextSearch/Searcher.py --related 12345 --other-magazines --limit 20
+#   GET /related?article_id=12345&limit=10&other_magazines=1        (fcs_endpoint.py)
+#
+# Der Indexer speichert für content Term-Vektoren (nur Terme + Häufigkeiten, keine Positionen).
+# MoreLikeThis.like(docid) liest dann die Termliste direkt aus dem Vektor, statt den gespeicherten
+# Text zu dekomprimieren und neu zu analysieren; die Gewichtung (tf·idf) kommt aus den Postings-
+# Statistiken des Index. Ergebnisse werden pro (Index-Version, article_id, Optionen) im LRU gehalten.
+import threading
+from collections import OrderedDict
+
+from org.apache.lucene.analysis.standard import StandardAnalyzer
+from org.apache.lucene.document import Field, FieldType, IntPoint, TextField
+from org.apache.lucene.index import DirectoryReader, FieldInfos, Term
+from org.apache.lucene.queries.mlt import MoreLikeThis
+from org.apache.lucene.search import BooleanQuery, BooleanClause, TermQuery
+
+from doc_loader import DocLoader, LIST_FIELDS
+
+CONTENT_FIELD = "content"
+RELATED_FIELDS = LIST_FIELDS + ("doc_key", "article_id_s")
+
+# MoreLikeThis-Parameter (auf kurze bis mittlere E-Zine-Artikel abgestimmt)
+MIN_TERM_FREQ = 2       # Term muss im Quellartikel mindestens so oft vorkommen
+MIN_DOC_FREQ = 3        # … und im Korpus in mindestens so vielen Artikeln
+MAX_DOC_FREQ_PCT = 25   # Allerweltswörter (in > 25 % der Artikel) ignorieren
+MAX_QUERY_TERMS = 25
+MIN_WORD_LEN = 3
+
+CACHE_MAX = 2048
+
+_CONTENT_TYPE = None  # erst nach lucene.initVM() erzeugbar
+
+
+def _content_type(term_vectors: bool):
+    ft = FieldType(TextField.TYPE_STORED)
+    ft.setStoreTermVectors(term_vectors)
+    ft.freeze()
+    return ft
+
+
+def content_field(content: str, term_vectors: bool = True):
+    """Volltextfeld wie TextField(Store.YES), zusätzlich mit Term-Vektoren für MoreLikeThis."""
+    global _CONTENT_TYPE
+    if not term_vectors:
+        return TextField(CONTENT_FIELD, content, Field.Store.YES)
+    if _CONTENT_TYPE is None:
+        _CONTENT_TYPE = _content_type(True)
+    return Field(CONTENT_FIELD, content, _CONTENT_TYPE)
+
+
+def index_term_vectors(store):
+    """
+    Speichert content im vorhandenen Index Term-Vektoren? None, wenn es (noch) kein content gibt.
+    Lucene lehnt es ab, diese Feldeinstellung in einem bestehenden Index zu ändern – weicht sie von
+    der gewünschten ab, braucht der Indexer einen Vollaufbau.
+    """
+    reader = DirectoryReader.open(store)
+    try:
+        fi = FieldInfos.getMergedFieldInfos(reader).fieldInfo(CONTENT_FIELD)
+    finally:
+        reader.close()
+    if fi is None:
+        return None
+    has = getattr(fi, "hasTermVectors", None) or fi.hasVectors  # Lucene 10 / Lucene 9
+    return bool(has())
+
+
+def find_doc(searcher, article_id: int):
+    """docid eines Artikels über den IntPoint article_id (None, wenn nicht im Index)."""
+    top = searcher.search(IntPoint.newExactQuery("article_id", int(article_id)), 1)
+    return top.scoreDocs[0].doc if top.scoreDocs else None
+
+
+def like_query(reader, doc_id: int, exclude_key=None, exclude_magazine=None):
+    """MoreLikeThis-Query für einen Artikel, ohne den Artikel selbst (und optional ohne sein Magazin)."""
+    mlt = MoreLikeThis(reader)
+    mlt.setFieldNames([CONTENT_FIELD])
+    mlt.setAnalyzer(StandardAnalyzer())  # nur Fallback für Dokumente ohne Term-Vektor
+    mlt.setMinTermFreq(MIN_TERM_FREQ)
+    mlt.setMinDocFreq(MIN_DOC_FREQ)
+    mlt.setMaxDocFreqPct(MAX_DOC_FREQ_PCT)
+    mlt.setMaxQueryTerms(MAX_QUERY_TERMS)
+    mlt.setMinWordLen(MIN_WORD_LEN)
+    b = BooleanQuery.Builder()
+    b.add(mlt.like(doc_id), BooleanClause.Occur.MUST)
+    if exclude_key:
+        b.add(TermQuery(Term("doc_key", exclude_key)), BooleanClause.Occur.MUST_NOT)
+    if exclude_magazine:
+        b.add(TermQuery(Term("magazine", exclude_magazine)), BooleanClause.Occur.MUST_NOT)
+    return b.build()
+
+
+def _view(doc_id, d, score=None):
+    return {
+        "doc": doc_id,
+        "score": score,
+        "article_id": d.get("article_id_s"),
+        "title": d.get("title") or d.get("filename"),
+        "magazine": d.get("magazine"),
+        "issue_label": d.get("issue_label"),
+        "issue_date_iso": d.get("issue_date_iso"),
+        "article_url": d.get("article_url"),
+    }
+
+
+_lock = threading.Lock()
+_cache = OrderedDict()  # (reader_version, article_id, limit, other_magazines) -> Ergebnis
+
+
+def related(reader, searcher, article_id: int, limit: int = 10, other_magazines: bool = False):
+    """
+    Ähnliche Artikel zu article_id. Liefert {"source": {...}, "hits": [{...}], "cached": bool}
+    oder None, wenn der Artikel nicht im Index ist.
+    """
+    key = (reader.getVersion(), int(article_id), int(limit), bool(other_magazines))
+    with _lock:
+        hit = _cache.get(key)
+        if hit is not None:
+            _cache.move_to_end(key)
+            return {**hit, "cached": True}
+
+    doc_id = find_doc(searcher, article_id)
+    if doc_id is None:
+        return None
+    loader = DocLoader(reader, RELATED_FIELDS)
+    src = loader.load(doc_id)
+    qry = like_query(reader, doc_id, src.get("doc_key"), src.get("magazine") if other_magazines else None)
+    top = searcher.search(qry, limit)
+    docs = loader.load_all([sd.doc for sd in top.scoreDocs])
+    res = {
+        "source": _view(doc_id, src),
+        "hits": [_view(sd.doc, d, sd.score) for sd, d in zip(top.scoreDocs, docs)],
+    }
+
+    with _lock:
+        _cache[key] = res
+        if len(_cache) > CACHE_MAX:
+            _cache.popitem(last=False)
+    return {**res, "cached": False}
@@ -0,0 +1,216 @@
+# scripts/TextSearch/search_daemon.py
+# Warmer Such-Daemon: JVM, Reader und Caches bleiben hinter einem lokalen Unix-Socket geladen.
+#
+#   python scripts/TextSearch/search_daemon.py serve                 # Daemon starten (Vordergrund)
+#   python scripts/TextSearch/search_daemon.py query --q covox --magazine Z80
+#   python scripts/TextSearch/search_daemon.py query "covox mag=Z80 years=1996-1998 n=20"
+#   python scripts/TextSearch/search_daemon.py repl                  # interaktive Schleife
+#   python scripts/TextSearch/search_daemon.py stop
+#
+# Protokoll: eine JSON-Zeile pro Anfrage/Antwort.
+#   {"argv": [...]} – dieselben Argumente wie Searcher.py
+#   {"line": "..."} – key=value-Syntax aus Searcher._parse_kv_line
+#   {"cmd": "ping" | "stop"}
+# Der Client importiert weder lucene noch Searcher und startet deshalb sofort.
+import argparse, io, json, os, socket, socketserver, sys, threading, time
+
+DEFAULT_SOCKET = os.environ.get("ZXSEARCH_SOCKET", f"/tmp/zxsearch-{os.getuid()}.sock")
+
+
+# -------------------
+# Server
+# -------------------
+def serve(sock_path: str):
+    import lucene
+    from java.nio.file import Paths
+    from org.apache.lucene.store import FSDirectory
+    from org.apache.lucene.index import DirectoryReader
+    from org.apache.lucene.search import IndexSearcher, MatchAllDocsQuery
+    import Searcher
+
+    if os.path.exists(sock_path):
+        if _ping(sock_path):
+            print(f"⚠️ Daemon läuft bereits: {sock_path}")
+            return 1
+        os.unlink(sock_path)  # verwaister Socket
+
+    t0 = time.perf_counter()
+    lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+    reader = DirectoryReader.open(FSDirectory.open(Paths.get(Searcher.INDEX_DIR)))
+    searcher = IndexSearcher(reader)
+    # Aufwärmen: Stored Fields + Magazinliste einmal laden
+    searcher.search(MatchAllDocsQuery(), 1)
+    Searcher._list_magazines(reader)
+    print(f"✅ Index geladen ({reader.numDocs()} Docs, {time.perf_counter() - t0:.2f}s) → {sock_path}")
+
+    parser = Searcher.build_argparser()
+
+    class _Help(Exception):
+        pass
+
+    # argparse darf im Daemon weder nach stdout schreiben noch sys.exit() aufrufen
+    def _parser_error(message):
+        raise ValueError(message)
+
+    def _print_help(file=None):
+        raise _Help(parser.format_help())
+    parser.error = _parser_error
+    parser.print_help = _print_help
+
+    def run(req: dict) -> dict:
+        if "argv" in req:
+            try:
+                ns = parser.parse_args(req["argv"])
+            except _Help as h:
+                return {"ok": False, "output": str(h)}
+            except SystemExit as e:
+                return {"ok": False, "output": f"❌ Argumente nicht ausführbar (exit {e.code})"}
+            params = Searcher.params_from_args(ns)
+        else:
+            params = Searcher._parse_kv_line(req.get("line") or "", Searcher.DEFAULTS)
+        buf = io.StringIO()
+        t = time.perf_counter()
+        Searcher._run_once(params, searcher, reader, out=buf)
+        return {"ok": True, "output": buf.getvalue(), "ms": round((time.perf_counter() - t) * 1000, 2)}
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            lucene.getVMEnv().attachCurrentThread()
+            for raw in self.rfile:
+                try:
+                    req = json.loads(raw.decode("utf-8"))
+                    cmd = req.get("cmd")
+                    if cmd == "ping":
+                        resp = {"ok": True, "output": "pong"}
+                    elif cmd == "stop":
+                        resp = {"ok": True, "output": "Daemon wird beendet."}
+                        threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    else:
+                        resp = run(req)
+                except Exception as e:
+                    resp = {"ok": False, "output": f"❌ {e}"}
+                self.wfile.write((json.dumps(resp, ensure_ascii=False) + "\n").encode("utf-8"))
+                self.wfile.flush()
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    server = Server(sock_path, Handler)
+    os.chmod(sock_path, 0o600)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(sock_path):
+            os.unlink(sock_path)
+        reader.close()
+    print("👋 Daemon beendet.")
+    return 0
+
+
+# -------------------
+# Client
+# -------------------
+class Client:
+    def __init__(self, sock_path: str):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(sock_path)
+        self.rfile = self.sock.makefile("rb")
+
+    def call(self, req: dict) -> dict:
+        self.sock.sendall((json.dumps(req, ensure_ascii=False) + "\n").encode("utf-8"))
+        line = self.rfile.readline()
+        if not line:
+            raise ConnectionError("Daemon hat die Verbindung geschlossen")
+        return json.loads(line.decode("utf-8"))
+
+    def close(self):
+        self.rfile.close()
+        self.sock.close()
+
+
+def _ping(sock_path: str) -> bool:
+    try:
+        c = Client(sock_path)
+        try:
+            return bool(c.call({"cmd": "ping"}).get("ok"))
+        finally:
+            c.close()
+    except OSError:
+        return False
+
+
+def _connect(sock_path: str) -> Client:
+    try:
+        return Client(sock_path)
+    except OSError:
+        print(f"❌ Kein Daemon unter {sock_path} – zuerst 'search_daemon.py serve' starten.")
+        sys.exit(2)
+
+
+def query(sock_path: str, rest: list[str]) -> int:
+    # Argumente mit '--' → Searcher-CLI, sonst key=value-Zeile
+    req = {"argv": rest} if any(a.startswith("--") or a == "-h" for a in rest) else {"line": " ".join(rest)}
+    c = _connect(sock_path)
+    try:
+        resp = c.call(req)
+    finally:
+        c.close()
+    print(resp.get("output", ""), end="" if resp.get("output", "").endswith("\n") else "\n")
+    if resp.get("ms") is not None:
+        print(f"⏱  {resp['ms']} ms")
+    return 0 if resp.get("ok") else 1
+
+
+def repl(sock_path: str) -> int:
+    c = _connect(sock_path)
+    print("ZXpress-Suche (Daemon). Syntax: covox mag=Z80 years=1996-1998 n=20 kwic=… infix=1  |  :q = Ende")
+    try:
+        while True:
+            try:
+                line = input("zx> ").strip()
+            except EOFError:
+                print()
+                break
+            if not line:
+                continue
+            if line in (":q", ":quit", "exit", "quit"):
+                break
+            resp = c.call({"line": line})
+            print(resp.get("output", "").rstrip("\n"))
+            if resp.get("ms") is not None:
+                print(f"⏱  {resp['ms']} ms")
+    except KeyboardInterrupt:
+        print()
+    finally:
+        c.close()
+    return 0
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Warmer Such-Daemon für Searcher.py (Unix-Socket)")
+    ap.add_argument("--socket", default=DEFAULT_SOCKET, help=f"Socket-Pfad (Default: {DEFAULT_SOCKET})")
+    ap.add_argument("mode", choices=["serve", "query", "repl", "stop", "ping"])
+    args, rest = ap.parse_known_args()
+
+    if args.mode == "serve":
+        sys.exit(serve(args.socket))
+    if args.mode == "query":
+        sys.exit(query(args.socket, rest))
+    if args.mode == "repl":
+        sys.exit(repl(args.socket))
+    if args.mode == "ping":
+        ok = _ping(args.socket)
+        print("✅ Daemon läuft." if ok else "❌ Kein Daemon.")
+        sys.exit(0 if ok else 1)
+    c = _connect(args.socket)
+    try:
+        print(c.call({"cmd": "stop"}).get("output", ""))
+    finally:
+        c.close()
+
+
+if __name__ == "__main__":
+    main()
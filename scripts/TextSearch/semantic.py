@@ -0,0 +1,361 @@
+# scripts/TextSearch/semantic.py
+# Semantische Suche ohne GPU und ohne heruntergeladene Modelle: LSA (TF-IDF + abgeschnittene SVD)
+# lokal mit NumPy trainiert, Dokumentvektoren als KnnFloatVectorField (HNSW) im Lucene-Index.
+#
+#   python scripts/TextSearch/semantic.py train                        # aus den Term-Vektoren des Index
+#   python scripts/TextSearch/semantic.py train --dims 192 --max-docs 80000
+#   python scripts/TextSearch/Indexer.py --lsa-model                   # Vektoren mitschreiben (Vollaufbau)
+#   python scripts/TextSearch/Searcher.py --semantic --q "музыкальный редактор" --magazine Spectrofon
+#
+# Ablauf: Das Training liest die Term-Vektoren von content (siehe related.py) – kein Neu-Analysieren
+# der Texte –, gewichtet sublinear (1 + log tf) · idf, normiert je Artikel und zerlegt die Matrix mit
+# randomisierter SVD (Halko et al.: Zufallsprojektion, Potenziteration, QR). Ein Text wird mit
+# demselben Analyzer tokenisiert und über die Komponenten-Matrix projiziert (L2-normiert →
+# DOT_PRODUCT = Kosinus). Ablage neben dem Index in <index_dir>_lsa/:
+#   terms.txt        – Vokabular (Zeilennummer = Spalte)
+#   idf.npy          – idf je Term (float32)
+#   components.npy   – V × dims Projektionsmatrix (float32)
+#   model.json       – Dimensionen, Trainingsparameter, model_id
+# Der Indexer schreibt die model_id in die Commit-UserData; Searcher verweigert die Suche, wenn Index
+# und Modell nicht zusammenpassen (sonst wären Anfrage- und Dokumentvektoren aus verschiedenen Räumen).
+import os, sys, json, time, hashlib, argparse
+from collections import Counter
+
+import numpy as np
+
+INDEX_DIR = "/Users/stoia1/Desktop/Website/DigitProject/index_dir"
+
+VECTOR_FIELD = "content_vec"
+CONTENT_FIELD = "content"
+COMMIT_KEY = "lsa_model"
+
+DEFAULT_DIMS = 128
+OVERSAMPLE = 10
+POWER_ITERS = 2
+MIN_DF = 3
+MAX_DF_PCT = 50
+MAX_FEATURES = 50000
+ROW_CHUNK = 2048  # Zeilen pro Block im Sparse-Dense-Produkt (begrenzt den Zwischenspeicher)
+
+
+def lsa_dir_for(index_dir: str) -> str:
+    return index_dir.rstrip("/\\") + "_lsa"
+
+
+# -------------------
+# Sparse-Mathematik (CSR als drei Arrays, ohne SciPy)
+# -------------------
+def _csr_matmul(indptr, indices, data, m):
+    """(n × V, CSR) @ (V × k, dicht) blockweise über Zeilen mit np.add.reduceat."""
+    n = len(indptr) - 1
+    out = np.zeros((n, m.shape[1]), dtype=np.float32)
+    for a in range(0, n, ROW_CHUNK):
+        b = min(n, a + ROW_CHUNK)
+        s, e = indptr[a], indptr[b]
+        if s == e:
+            continue
+        prod = data[s:e, None] * m[indices[s:e]]
+        rows = np.flatnonzero(np.diff(indptr[a:b + 1]))
+        out[a + rows] = np.add.reduceat(prod, indptr[a:b][rows] - s, axis=0)
+    return out
+
+
+def _transpose(indptr, indices, data, n_cols):
+    """CSR → CSR der Transponierten (d.h. CSC)."""
+    rows = np.repeat(np.arange(len(indptr) - 1, dtype=np.int32), np.diff(indptr))
+    order = np.argsort(indices, kind="stable")
+    t_indptr = np.zeros(n_cols + 1, dtype=np.int64)
+    np.cumsum(np.bincount(indices, minlength=n_cols), out=t_indptr[1:])
+    return t_indptr, rows[order], data[order]
+
+
+def randomized_svd(x, xt, n_cols, dims, oversample=OVERSAMPLE, n_iter=POWER_ITERS, seed=0):
+    """Rechte Singulärvektoren (V × dims) und Singulärwerte einer CSR-Matrix."""
+    rng = np.random.default_rng(seed)
+    k = min(dims + oversample, n_cols, len(x[0]) - 1)
+    omega = rng.standard_normal((n_cols, k)).astype(np.float32)
+    q, _ = np.linalg.qr(_csr_matmul(*x, omega))
+    for _ in range(n_iter):
+        z, _ = np.linalg.qr(_csr_matmul(*xt, q))
+        q, _ = np.linalg.qr(_csr_matmul(*x, z))
+    b = _csr_matmul(*xt, q).T                     # k × V
+    _, s, vt = np.linalg.svd(b, full_matrices=False)
+    dims = min(dims, len(s))
+    return vt[:dims].T.astype(np.float32), s[:dims]
+
+
+# -------------------
+# Modell
+# -------------------
+class LsaModel:
+    def __init__(self, terms, idf, components, info):
+        self.terms = list(terms)
+        self.ids = {t: i for i, t in enumerate(self.terms)}
+        self.idf = idf
+        self.components = components
+        self.info = info
+
+    @property
+    def dims(self) -> int:
+        return int(self.components.shape[1])
+
+    @property
+    def model_id(self) -> str:
+        return self.info["model_id"]
+
+    def embed_counts(self, counts) -> np.ndarray | None:
+        """{Term: Häufigkeit} → L2-normierter Vektor (float32) oder None ohne bekannte Terme."""
+        idx, tf = [], []
+        for t, c in counts.items():
+            i = self.ids.get(t)
+            if i is not None and c > 0:
+                idx.append(i)
+                tf.append(c)
+        if not idx:
+            return None
+        idx = np.asarray(idx)
+        w = (1.0 + np.log(np.asarray(tf, dtype=np.float32))) * self.idf[idx]
+        v = w @ self.components[idx]
+        n = float(np.linalg.norm(v))
+        return (v / n).astype(np.float32) if n > 0 else None
+
+    def embed_text(self, text: str, analyzer) -> np.ndarray | None:
+        """Text mit dem Index-Analyzer (Feld content) tokenisieren und projizieren."""
+        from java.io import StringReader
+        from org.apache.lucene.analysis.tokenattributes import CharTermAttribute
+
+        counts = Counter()
+        ts = analyzer.tokenStream(CONTENT_FIELD, StringReader(text or ""))
+        term_attr = ts.addAttribute(CharTermAttribute.class_)
+        ts.reset()
+        try:
+            while ts.incrementToken():
+                counts[term_attr.toString()] += 1
+            ts.end()
+        finally:
+            ts.close()
+        return self.embed_counts(counts)
+
+    def save(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "terms.txt"), "w", encoding="utf-8") as f:
+            for t in self.terms:
+                f.write(t + "\n")
+        np.save(os.path.join(path, "idf.npy"), self.idf)
+        np.save(os.path.join(path, "components.npy"), self.components)
+        with open(os.path.join(path, "model.json"), "w", encoding="utf-8") as f:
+            json.dump(self.info, f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> "LsaModel | None":
+        try:
+            with open(os.path.join(path, "model.json"), "r", encoding="utf-8") as f:
+                info = json.load(f)
+            with open(os.path.join(path, "terms.txt"), "r", encoding="utf-8") as f:
+                terms = [line.rstrip("\n") for line in f]
+        except (OSError, ValueError):
+            return None
+        return cls(terms, np.load(os.path.join(path, "idf.npy")),
+                   np.load(os.path.join(path, "components.npy"), mmap_mode="r"), info)
+
+
+def fit(docs, dims=DEFAULT_DIMS, min_df=MIN_DF, max_df_pct=MAX_DF_PCT, max_features=MAX_FEATURES,
+        n_iter=POWER_ITERS, seed=0) -> LsaModel:
+    """
+    docs: Liste von {Term: Häufigkeit} (ein Eintrag pro Artikel).
+    Vokabular: df ≥ min_df, df ≤ max_df_pct % der Artikel, höchstens max_features (nach df).
+    """
+    n_docs = len(docs)
+    df = Counter()
+    for counts in docs:
+        df.update(counts.keys())
+    max_df = max(1, int(n_docs * max_df_pct / 100))
+    vocab = [t for t, c in df.items() if min_df <= c <= max_df]
+    vocab.sort(key=lambda t: (-df[t], t))
+    vocab = vocab[:max_features]
+    if not vocab:
+        raise ValueError("Leeres Vokabular – min_df/max_df_pct prüfen oder mehr Artikel verwenden")
+    ids = {t: i for i, t in enumerate(vocab)}
+    idf = np.log((1 + n_docs) / (1 + np.array([df[t] for t in vocab], dtype=np.float32))) + 1.0
+    idf = idf.astype(np.float32)
+
+    indptr, indices, data = [0], [], []
+    for counts in docs:
+        cols = [(ids[t], c) for t, c in counts.items() if t in ids]
+        if not cols:
+            continue
+        c_idx = np.fromiter((i for i, _ in cols), dtype=np.int32, count=len(cols))
+        tf = np.fromiter((c for _, c in cols), dtype=np.float32, count=len(cols))
+        w = (1.0 + np.log(tf)) * idf[c_idx]
+        w /= np.linalg.norm(w)
+        order = np.argsort(c_idx)
+        indices.append(c_idx[order])
+        data.append(w[order])
+        indptr.append(indptr[-1] + len(cols))
+    if len(indptr) < 3:
+        raise ValueError("Zu wenige Artikel mit Vokabular-Termen für das Training")
+    x = (np.asarray(indptr, dtype=np.int64), np.concatenate(indices), np.concatenate(data).astype(np.float32))
+    xt = _transpose(*x, len(vocab))
+
+    components, s = randomized_svd(x, xt, len(vocab), dims, n_iter=n_iter, seed=seed)
+    h = hashlib.sha1(components[:64].tobytes())
+    h.update("\n".join(vocab[:1000]).encode("utf-8"))
+    info = {
+        "dims": int(components.shape[1]), "terms": len(vocab), "docs": len(indptr) - 1,
+        "min_df": min_df, "max_df_pct": max_df_pct, "power_iters": n_iter, "seed": seed,
+        "singular_values": [round(float(v), 4) for v in s[:10]],
+        "trained": time.strftime("%Y-%m-%d %H:%M:%S"), "model_id": h.hexdigest()[:16],
+    }
+    return LsaModel(vocab, idf, components, info)
+
+
+# -------------------
+# Lucene-Anbindung
+# -------------------
+def _term_vector(reader, doc_id: int):
+    try:
+        return reader.termVectors().get(doc_id, CONTENT_FIELD)
+    except AttributeError:  # Lucene < 9.5
+        return reader.getTermVector(doc_id, CONTENT_FIELD)
+
+
+def read_term_vectors(reader, max_docs=None, seed=0) -> list:
+    """{Term: tf} je lebendem Artikel aus den Term-Vektoren (bei max_docs: Zufallsstichprobe)."""
+    from org.apache.lucene.index import MultiBits
+
+    live = MultiBits.getLiveDocs(reader)
+    doc_ids = [i for i in range(reader.maxDoc()) if live is None or live.get(i)]
+    if max_docs and len(doc_ids) > max_docs:
+        rng = np.random.default_rng(seed)
+        doc_ids = sorted(rng.choice(doc_ids, size=max_docs, replace=False).tolist())
+    docs = []
+    for doc_id in doc_ids:
+        terms = _term_vector(reader, int(doc_id))
+        if terms is None:
+            continue
+        te = terms.iterator()
+        counts = {}
+        br = te.next()
+        while br is not None:
+            counts[br.utf8ToString()] = int(te.totalTermFreq())
+            br = te.next()
+        if counts:
+            docs.append(counts)
+    return docs
+
+
+def vector_field(vec: np.ndarray):
+    from lucene import JArray
+    from org.apache.lucene.document import KnnFloatVectorField
+    from org.apache.lucene.index import VectorSimilarityFunction
+
+    return KnnFloatVectorField(VECTOR_FIELD, JArray('float')(vec.tolist()), VectorSimilarityFunction.DOT_PRODUCT)
+
+
+def commit_data(model: "LsaModel | None"):
+    """
+    Commit-UserData für IndexWriter.setLiveCommitData: welches Modell die Vektoren erzeugt hat.
+    Ohne Modell leer – ein Index mit teilweise fehlenden Vektoren gilt nicht als semantisch durchsuchbar.
+    """
+    from java.util import HashMap
+
+    data = HashMap()
+    if model is not None:
+        data.put(COMMIT_KEY, model.model_id)
+    return data.entrySet()
+
+
+def stored_model_id(store):
+    """model_id im letzten Commit eines Directory (None ohne Index oder ohne Vektoren)."""
+    from org.apache.lucene.index import DirectoryReader, SegmentInfos
+
+    if not DirectoryReader.indexExists(store):
+        return None
+    return SegmentInfos.readLatestCommit(store).getUserData().get(COMMIT_KEY)
+
+
+def index_model_id(reader):
+    """model_id, mit der die Vektoren des Index geschrieben wurden (None = ohne Vektoren)."""
+    return reader.getIndexCommit().getUserData().get(COMMIT_KEY)
+
+
+def knn_query(model: LsaModel, text: str, k: int, filter_query=None, analyzer=None):
+    """KnnFloatVectorQuery (HNSW) für einen Anfragetext; filter_query schränkt vor der Suche ein."""
+    from lucene import JArray
+    from org.apache.lucene.analysis.standard import StandardAnalyzer
+    from org.apache.lucene.search import KnnFloatVectorQuery
+
+    vec = model.embed_text(text, analyzer or StandardAnalyzer())
+    if vec is None:
+        return None
+    return KnnFloatVectorQuery(VECTOR_FIELD, JArray('float')(vec.tolist()), k, filter_query)
+
+
+_CACHE: dict = {}  # Pfad -> (mtime von model.json, LsaModel)
+
+
+def load_cached(index_dir: str) -> LsaModel | None:
+    path = lsa_dir_for(index_dir)
+    try:
+        mtime = os.stat(os.path.join(path, "model.json")).st_mtime_ns
+    except OSError:
+        return None
+    hit = _CACHE.get(path)
+    if hit is None or hit[0] != mtime:
+        hit = _CACHE[path] = (mtime, LsaModel.load(path))
+    return hit[1]
+
+
+# -------------------
+# CLI
+# -------------------
+def main():
+    ap = argparse.ArgumentParser(description="LSA-Modell (TF-IDF + SVD) für die semantische Suche")
+    ap.add_argument("--index-dir", default=INDEX_DIR, help="Modell liegt in <index_dir>_lsa")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    t = sub.add_parser("train", help="Modell aus den Term-Vektoren des Index trainieren")
+    t.add_argument("--dims", type=int, default=DEFAULT_DIMS)
+    t.add_argument("--max-docs", type=int, default=None, help="Zufallsstichprobe für das Training")
+    t.add_argument("--min-df", type=int, default=MIN_DF)
+    t.add_argument("--max-df-pct", type=float, default=MAX_DF_PCT)
+    t.add_argument("--max-features", type=int, default=MAX_FEATURES)
+    t.add_argument("--power-iters", type=int, default=POWER_ITERS)
+    t.add_argument("--seed", type=int, default=0)
+    sub.add_parser("info", help="Modellparameter anzeigen")
+    args = ap.parse_args()
+
+    path = lsa_dir_for(args.index_dir)
+    if args.cmd == "info":
+        model = LsaModel.load(path)
+        if model is None:
+            print(f"❌ Kein Modell in {path} – zuerst 'train' ausführen.")
+            sys.exit(2)
+        print(json.dumps(model.info, ensure_ascii=False, indent=2))
+        return
+
+    import lucene
+    from java.nio.file import Paths
+    from org.apache.lucene.index import DirectoryReader
+    from org.apache.lucene.store import FSDirectory
+
+    lucene.initVM(vmargs=['-Djava.awt.headless=true'])
+    reader = DirectoryReader.open(FSDirectory.open(Paths.get(args.index_dir)))
+    try:
+        t0 = time.perf_counter()
+        docs = read_term_vectors(reader, args.max_docs, args.seed)
+    finally:
+        reader.close()
+    if not docs:
+        print("❌ Keine Term-Vektoren im Index – Index mit Term-Vektoren neu bauen (Indexer.py ohne --no-term-vectors).")
+        sys.exit(2)
+    t1 = time.perf_counter()
+    print(f"📥 {len(docs)} Artikel aus Term-Vektoren in {t1 - t0:.1f}s")
+    model = fit(docs, args.dims, args.min_df, args.max_df_pct, args.max_features, args.power_iters, args.seed)
+    model.save(path)
+    print(f"✅ LSA-Modell {model.model_id}: {model.info['terms']} Terme × {model.dims} Dimensionen "
+          f"(SVD {time.perf_counter() - t1:.1f}s) → {path}")
+    print("ℹ️  Vektoren erst nach Indexer.py --lsa-model (Vollaufbau) im Index")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# scripts/TextSearch/sorting.py
+# Sortierte Trefferlisten und Index-Sortierung (chronologisches Blättern ohne Relevanz-Scoring).
+#
+# Der Index wird mit INDEX_SORT = (Datum, Magazin, order) geschrieben: innerhalb jedes Segments liegen
+# die Dokumente bereits in dieser Reihenfolge. Eine Suche mit sort=date ist ein Präfix davon –
+# der TopFieldCollector bricht pro Segment nach den ersten N Treffern ab (early termination),
+# statt alle Treffer zu sammeln. date-desc und reading sind normale Feldsortierungen über DocValues.
+from java.lang import Integer, Long
+from org.apache.lucene.document import SortedDocValuesField
+from org.apache.lucene.index import SegmentInfos
+from org.apache.lucene.search import Sort, SortField
+from org.apache.lucene.util import BytesRef
+
+DATE_FIELD = "issue_date_epoch_ms"   # NumericDocValuesField (Indexer)
+ORDER_FIELD = "order"                # NumericDocValuesField (Indexer)
+MAGAZINE_FIELD = "magazine"          # SortedDocValuesField (hier)
+ISSUE_FIELD = "issue_label"          # SortedDocValuesField (hier)
+
+SORT_MODES = ("relevance", "date", "date-desc", "reading")
+
+
+def _date(reverse=False):
+    sf = SortField(DATE_FIELD, SortField.Type.LONG, reverse)
+    # Artikel ohne Datum immer ans Ende
+    sf.setMissingValue(Long(Long.MIN_VALUE if reverse else Long.MAX_VALUE))
+    return sf
+
+
+def _string(field):
+    sf = SortField(field, SortField.Type.STRING)
+    sf.setMissingValue(SortField.STRING_LAST)
+    return sf
+
+
+def _order():
+    sf = SortField(ORDER_FIELD, SortField.Type.INT)
+    sf.setMissingValue(Integer(Integer.MAX_VALUE))
+    return sf
+
+
+def index_sort():
+    """Sortierung der Segmente beim Indexieren: Datum → Magazin → Reihenfolge in der Ausgabe."""
+    return Sort([_date(), _string(MAGAZINE_FIELD), _order()])
+
+
+def make_sort(mode: str):
+    """
+    Sort für searcher.search(qry, n, sort) – None = Relevanz.
+      date       – chronologisch, identisch mit der Index-Sortierung (early termination)
+      date-desc  – neueste zuerst
+      reading    – Leseordnung: Magazin → Ausgabe (Datum, Label) → Artikelreihenfolge
+    """
+    if not mode or mode == "relevance":
+        return None
+    if mode == "date":
+        return index_sort()
+    if mode == "date-desc":
+        return Sort([_date(reverse=True), _string(MAGAZINE_FIELD), _order()])
+    if mode == "reading":
+        return Sort([_string(MAGAZINE_FIELD), _date(), _string(ISSUE_FIELD), _order()])
+    raise ValueError(f"Unbekannte Sortierung: {mode} (erlaubt: {', '.join(SORT_MODES)})")
+
+
+def sort_fields(doc, magazine=None, issue_label=None):
+    """DocValues für die String-Sortierungen (Datum/order schreibt der Indexer schon als NumericDocValues)."""
+    if magazine:
+        doc.add(SortedDocValuesField(MAGAZINE_FIELD, BytesRef(magazine)))
+    if issue_label:
+        doc.add(SortedDocValuesField(ISSUE_FIELD, BytesRef(issue_label)))
+
+
+def index_is_sorted(store) -> bool:
+    """
+    True, wenn alle Segmente des vorhandenen Index mit index_sort() geschrieben wurden.
+    Ein IndexWriter darf die Sortierung bestehender Segmente nicht ändern – ältere, unsortierte
+    Indizes brauchen daher einen Vollaufbau (bzw. einen Writer ohne Index-Sortierung).
+    """
+    infos = SegmentInfos.readLatestCommit(store)
+    wanted = index_sort()
+    for i in range(infos.size()):
+        s = infos.info(i).info.getIndexSort()
+        if s is None or not s.equals(wanted):
+            return False
+    return True
@@ -1,6 +1,8 @@
-import os, json, argparse, re, csv
+import os, json, argparse, re, csv, time
 from datetime import datetime
 
+CACHE_VERSION = 1
+
 def load_json(p):
     try:
         with open(p, "r", encoding="utf-8") as f: return json.load(f)
@@ -10,7 +12,74 @@ def load_json(p):
 def count_article_dirs(issue_dir):
     arts = os.path.join(issue_dir, "articles")
     if not os.path.isdir(arts): return None
-    return sum(1 for d in os.listdir(arts) if os.path.isdir(os.path.join(arts, d)))
+    with os.scandir(arts) as it:
+        return sum(1 for e in it if e.is_dir())
+
+# ---------- Fingerprint-Cache ----------
+def _mtime_ns(p):
+    try:
+        return os.stat(p).st_mtime_ns
+    except OSError:
+        return None
+
+def mag_fingerprint(mag_dir):
+    """Ändert sich, sobald Issues hinzukommen/wegfallen oder magazine.json/listing.json neu geschrieben werden."""
+    return [_mtime_ns(mag_dir), _mtime_ns(os.path.join(mag_dir, "issues")),
+            _mtime_ns(os.path.join(mag_dir, "magazine.json")), _mtime_ns(os.path.join(mag_dir, "listing.json"))]
+
+def issue_fingerprint(issue_dir):
+    # Verzeichnis-mtime ändert sich bei jedem neuen/gelöschten/umbenannten Artikelordner
+    return [_mtime_ns(issue_dir), _mtime_ns(os.path.join(issue_dir, "articles"))]
+
+def load_cache(path, root):
+    c = load_json(path) if path else None
+    if not isinstance(c, dict) or c.get("version") != CACHE_VERSION or c.get("root") != os.path.abspath(root):
+        return {"version": CACHE_VERSION, "root": os.path.abspath(root), "mags": {}}
+    return c
+
+def save_cache(path, cache):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def scan_magazine(mag_dir, cached, stats):
+    """
+    Magazin inventarisieren; nur geänderte Teilbäume werden neu gelesen.
+    Liefert den Cache-Eintrag {"fp", "magazine_id", "has_listing", "issues": {folder: {"fp", "articles"}}}.
+    """
+    fp = mag_fingerprint(mag_dir)
+    cached = cached or {}
+    mag_changed = cached.get("fp") != fp
+
+    if mag_changed:
+        mag_json = load_json(os.path.join(mag_dir, "magazine.json")) or {}
+        magazine_id = mag_json.get("magazine_id")
+        has_listing = os.path.isfile(os.path.join(mag_dir, "listing.json"))
+        issues_dir = os.path.join(mag_dir, "issues")
+        issue_folders = []
+        if os.path.isdir(issues_dir):
+            issue_folders = sorted(e.name for e in os.scandir(issues_dir) if e.is_dir())
+    else:
+        magazine_id = cached.get("magazine_id")
+        has_listing = cached.get("has_listing")
+        issue_folders = list(cached.get("issues", {}).keys())
+
+    old_issues = cached.get("issues", {})
+    issues = {}
+    for folder in issue_folders:
+        iid = os.path.join(mag_dir, "issues", folder)
+        ifp = issue_fingerprint(iid)
+        old = old_issues.get(folder)
+        if old is not None and old.get("fp") == ifp:
+            issues[folder] = old
+            stats["issues_cached"] += 1
+        else:
+            issues[folder] = {"fp": ifp, "articles": count_article_dirs(iid)}
+            stats["issues_scanned"] += 1
+    stats["mags_scanned" if mag_changed else "mags_cached"] += 1
+    return {"fp": fp, "magazine_id": magazine_id, "has_listing": has_listing, "issues": issues}
 
 def newest_log_for_mag(log_dir, mag_name):
     if not os.path.isdir(log_dir): return None
@@ -25,6 +94,27 @@ def newest_log_for_mag(log_dir, mag_name):
     candidates = sorted(candidates, key=lambda fn: os.path.getmtime(os.path.join(log_dir, fn)), reverse=True)
     return os.path.join(log_dir, candidates[0])
 
+def load_validation_reports(log_dir):
+    """
+    Strukturierte Berichte (validate_*.json aus validate_corpus.py/run_light_pipeline.py) einlesen.
+    Ältere Berichte zuerst, neuere überschreiben → je Magazinordner gilt das jüngste Ergebnis.
+    """
+    out = {}
+    if not log_dir or not os.path.isdir(log_dir):
+        return out
+    reports = []
+    for fn in os.listdir(log_dir):
+        if fn.startswith("validate_") and fn.endswith(".json"):
+            rep = load_json(os.path.join(log_dir, fn))
+            if isinstance(rep, dict) and isinstance(rep.get("magazines"), list):
+                reports.append((rep.get("generated_at") or "", fn, rep))
+    for generated_at, fn, rep in sorted(reports, key=lambda t: (t[0], t[1])):
+        for r in rep["magazines"]:
+            key = r.get("folder") or os.path.basename(os.path.normpath(r.get("mag_root") or ""))
+            if key:
+                out[key] = {**r, "report": fn, "generated_at": generated_at or None}
+    return out
+
 def parse_validator_status(path):
     if not path or not os.path.exists(path):
         return ("N/A", [])
@@ -50,33 +140,36 @@ def parse_validator_status(path):
 def main():
     ap = argparse.ArgumentParser(description="Audit ZXPress-Korpus")
     ap.add_argument("--root", required=True, help="data/zxpress/magazines")
-    ap.add_argument("--logs", required=False, help="logs/validation")
+    ap.add_argument("--logs", required=False, help="logs/validation (JSON-Berichte, ältere .txt-Logs als Fallback)")
     ap.add_argument("--out", required=False, help="CSV-Ausgabe")
+    ap.add_argument("--cache", nargs="?", const="logs/audit_cache.json", default=None,
+                    help="Fingerprint-Cache: nur geänderte Magazine/Issues neu zählen (Default-Pfad: logs/audit_cache.json)")
     args = ap.parse_args()
 
+    t0 = time.perf_counter()
+    validation = load_validation_reports(args.logs)
+    cache = load_cache(args.cache, args.root)
+    new_cache = {"version": CACHE_VERSION, "root": cache["root"], "mags": {}}
+    stats = {"mags_cached": 0, "mags_scanned": 0, "issues_cached": 0, "issues_scanned": 0}
+
     rows = []
     total_mags = total_issues = total_articles = 0
-    mags = [os.path.join(args.root, d) for d in os.listdir(args.root) if os.path.isdir(os.path.join(args.root, d))]
+    mags = [e.path for e in os.scandir(args.root) if e.is_dir()]
 
     for mag_dir in sorted(mags):
         mag_name = os.path.basename(mag_dir)
-        mag_json = load_json(os.path.join(mag_dir, "magazine.json")) or {}
-        issues_dir = os.path.join(mag_dir, "issues")
-        has_listing = os.path.isfile(os.path.join(mag_dir, "listing.json"))
-
-        issue_folders = []
-        if os.path.isdir(issues_dir):
-            issue_folders = sorted([d for d in os.listdir(issues_dir) if os.path.isdir(os.path.join(issues_dir, d))])
+        entry = scan_magazine(mag_dir, cache["mags"].get(mag_name), stats)
+        new_cache["mags"][mag_name] = entry
+        has_listing = entry["has_listing"]
 
         mag_issue_cnt = 0
         mag_article_cnt = 0
         issues_with_zero_articles = 0
         issues_missing_articles_dir = 0
 
-        for folder in issue_folders:
+        for folder, info in entry["issues"].items():
             mag_issue_cnt += 1
-            iid = os.path.join(issues_dir, folder)
-            n = count_article_dirs(iid)
+            n = info["articles"]
             if n is None:
                 issues_missing_articles_dir += 1
             else:
@@ -88,19 +181,31 @@ def main():
         total_issues += mag_issue_cnt
         total_articles += mag_article_cnt
 
-        log_path = newest_log_for_mag(args.logs, mag_name) if args.logs else None
-        vstatus, warns = parse_validator_status(log_path)
+        v = validation.get(mag_name)
+        stale = ""
+        if v is not None:
+            vstatus, log_name = v["status"], v["report"]
+            # Bericht älter als die letzte Änderung im Magazin → Ergebnis gilt nur eingeschränkt
+            gen = v.get("generated_at")
+            newest = max([x for x in entry["fp"] if x] + [x for i in entry["issues"].values() for x in i["fp"] if x] or [0])
+            if gen and newest / 1e9 > datetime.fromisoformat(gen).timestamp():
+                stale = "1"
+        else:
+            log_path = newest_log_for_mag(args.logs, mag_name) if args.logs else None
+            vstatus, warns = parse_validator_status(log_path)
+            log_name = os.path.basename(log_path) if log_path else ""
 
         rows.append({
             "magazine": mag_name,
-            "magazine_id": mag_json.get("magazine_id"),
+            "magazine_id": entry["magazine_id"],
             "issues": mag_issue_cnt,
             "articles": mag_article_cnt,
             "issues_missing_articles_dir": issues_missing_articles_dir,
             "issues_zero_articles": issues_with_zero_articles,
             "has_mag_listing_json": int(has_listing),
             "validator_status": vstatus,
-            "validator_log": os.path.basename(log_path) if log_path else "",
+            "validator_log": log_name,
+            "validator_stale": stale,
         })
 
     # CSV ausgeben (optional)
@@ -111,14 +216,21 @@ def main():
             w.writeheader()
             w.writerows(rows)
 
+    if args.cache:
+        save_cache(args.cache, new_cache)
+
     # Konsole zusammenfassen
     print(f"Magazine: {total_mags} | Issues: {total_issues} | Artikel: {total_articles}")
+    if args.cache:
+        print(f"♻️  Cache: {stats['mags_cached']} Magazine / {stats['issues_cached']} Issues unverändert, "
+              f"neu gescannt: {stats['mags_scanned']} Magazine / {stats['issues_scanned']} Issues "
+              f"({time.perf_counter() - t0:.2f}s)")
     print("\n⚠️  Kandidaten für manuelle Sichtung (Top 20 nach Problemen):")
     bad = sorted(rows, key=lambda r: (r["validator_status"]!="OK" and r["validator_status"]!="OK+WARN",
                                       r["issues_zero_articles"]+r["issues_missing_articles_dir"]), reverse=True)
     for r in bad[:20]:
         if r["validator_status"]!="OK" or r["issues_zero_articles"] or r["issues_missing_articles_dir"]:
-            print(f"- {r['magazine']}: v={r['validator_status']}, zero={r['issues_zero_articles']}, missArtsDir={r['issues_missing_articles_dir']}, issues={r['issues']}, arts={r['articles']} (log: {r['validator_log']})")
+            print(f"- {r['magazine']}: v={r['validator_status']}{' (veraltet)' if r['validator_stale'] else ''}, zero={r['issues_zero_articles']}, missArtsDir={r['issues_missing_articles_dir']}, issues={r['issues']}, arts={r['articles']} (log: {r['validator_log']})")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,10 @@
+# events_light.py — Brücke zu zxpress.events für die Light-Skripte (werden direkt als Datei gestartet)
+import os, sys
+
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from zxpress.events import (  # noqa: E402
+    ENV_PATH, EventLog, configure, get, timed_get, summarize_file, print_summary, error_class,
+)
@@ -4,6 +4,10 @@ from urllib.parse import urljoin, urlparse, parse_qs
 import requests
 from bs4 import BeautifulSoup
 
+import events_light
+from events_light import timed_get
+import hashstore_light
+
 BASE_URL = "https://zxpress.ru"
 
 def make_session():
@@ -34,12 +38,12 @@ def save_json(p, obj, dry=False):
         json.dump(obj, f, ensure_ascii=False, indent=2)
 
 def save_text(p, text, dry=False):
+    """Schreibt text.txt und liefert den sha1 (direkt beim Schreiben berechnet, im HashStore vermerkt)."""
     if dry:
         print(f"  (dry) would write {p} ({len(text)} chars)")
-        return
+        return None
     ensure_dir(os.path.dirname(p))
-    with open(p, "w", encoding="utf-8") as f:
-        f.write(text)
+    return hashstore_light.get().write_text(p, text)
 
 def slugify(text, maxlen=60):
     """Make a compact, filesystem-safe slug. Keeps Cyrillic letters; trims long names."""
@@ -72,7 +76,7 @@ def extract_h1_or_title(soup):
 
 def fetch_print_text(sess, article_id):
     url = f"{BASE_URL}/print.php?id={article_id}"
-    r = sess.get(url)
+    r = timed_get(url, session=sess)
     r.encoding = "utf-8"
     soup = BeautifulSoup(r.text, "html.parser")
     pre = soup.find("pre", id="text")
@@ -110,6 +114,7 @@ def process_issue(sess, issue_dir, dry=False, retry_missing=False, pause=0.3):
     if not listing:
         print(f"  ⚠️ listing.json fehlt: {issue_dir}")
         return
+    ev = events_light.get()
 
     mag_meta, issue_meta = infer_ids_from_paths(issue_dir)
     mag_name = (mag_meta.get("magazine_name") or mag_meta.get("name") or "").strip()
@@ -129,6 +134,7 @@ def process_issue(sess, issue_dir, dry=False, retry_missing=False, pause=0.3):
     articles_dir = ensure_dir(os.path.join(issue_dir, "articles"))
 
     ok, skipped, failed = 0, 0, 0
+    ev.progress(len(listing), f"{mag_name or os.path.basename(os.path.dirname(os.path.dirname(issue_dir)))} {issue_label}")
     for idx, item in enumerate(listing, 1):
         # Felder aus listing.json
         order = item.get("order") or idx
@@ -153,21 +159,24 @@ def process_issue(sess, issue_dir, dry=False, retry_missing=False, pause=0.3):
         meta_path = os.path.join(art_dir, "meta.json")
 
         if os.path.exists(text_path) and os.path.exists(meta_path) and not retry_missing:
-            print(f"    ↪︎ skip vorhanden: {folder_name}")
+            ev.echo(f"    ↪︎ skip vorhanden: {folder_name}")
             skipped += 1
+            ev.item("skip", article_id=art_id, issue=issue_label)
             continue
 
         try:
             # Laden
-            print(f"    ⇢ hole Artikel {order:02d} (id={art_id}) …")
+            ev.echo(f"    ⇢ hole Artikel {order:02d} (id={art_id}) …")
             url_used, title_h1, text = fetch_print_text(sess, art_id)
 
             if not text or len(text) < 10:
-                print(f"    ⚠️ leer/kurz: id={art_id}")
+                ev.echo(f"    ⚠️ leer/kurz: id={art_id}")
                 failed += 1
+                ev.item("fail", article_id=art_id, issue=issue_label, reason="empty")
                 continue
 
             # Speichern
+            sha1 = save_text(text_path, text, dry=dry)
             meta = {
                 "magazine_id": mag_id,
                 "magazine_name": mag_name,
@@ -182,17 +191,20 @@ def process_issue(sess, issue_dir, dry=False, retry_missing=False, pause=0.3):
                 "print_url": print_url,
                 "article_url": article_url,
                 "fetched_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "sha1": sha1,
             }
 
-            save_text(text_path, text, dry=dry)
             save_json(meta_path, meta, dry=dry)
-            print(f"    ✅ gespeichert: {os.path.relpath(art_dir)}")
+            ev.echo(f"    ✅ gespeichert: {os.path.relpath(art_dir)}")
             ok += 1
+            ev.item("ok", article_id=art_id, issue=issue_label, chars=len(text))
             time.sleep(pause)
         except Exception as e:
-            print(f"    ❌ Fehler bei id={art_id}: {e}")
+            ev.echo(f"    ❌ Fehler bei id={art_id}: {e}")
             failed += 1
+            ev.item("fail", article_id=art_id, issue=issue_label, reason=type(e).__name__)
 
+    ev.close_progress()
     print(f"  Ergebnis Issue {issue_label} ({issue_iso or '0000-01-01'}): ok={ok}, skip={skipped}, fail={failed}")
 
 def process_magazine(mag_root, dry=False, retry_missing=False):
@@ -215,7 +227,10 @@ def main():
     ap.add_argument("--root", default="data/zxpress/magazines", help="Wurzelordner aller Magazine")
     ap.add_argument("--dry-run", action="store_true", help="Nur anzeigen, nichts schreiben")
     ap.add_argument("--retry-missing", action="store_true", help="Nur fehlende Texte nachladen")
+    ap.add_argument("--events", help="JSONL-Eventlog (Default: $ZX_EVENTS, sonst nur Bilanz am Ende)")
+    ap.add_argument("--no-progress", action="store_true", help="keine tqdm-Fortschrittsbalken")
     args = ap.parse_args()
+    ev = events_light.configure(args.events, step="fetch_articles", progress=not args.no_progress)
 
     if args.mag_root:
         mags = [args.mag_root]
@@ -229,6 +244,8 @@ def main():
     for mag_dir in sorted(mags):
         process_magazine(mag_dir, dry=args.dry_run, retry_missing=args.retry_missing)
 
+    ev.print_summary("Artikelabruf")
+    ev.close()
     print("✅ Fertig.")
 
 if __name__ == "__main__":
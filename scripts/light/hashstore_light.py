@@ -0,0 +1,8 @@
+# hashstore_light.py — Brücke zu zxpress.hashstore für die Light-Skripte (werden direkt als Datei gestartet)
+import os, sys
+
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+from zxpress.hashstore import ENV_PATH, HashStore, get, sha1_file  # noqa: E402
@@ -5,20 +5,25 @@ import os
 import datetime
 import time
 import re
-import requests
 from bs4 import BeautifulSoup
 import yaml
 from urllib.parse import urljoin
 import re
 import unicodedata
 
+import events_light
+from events_light import timed_get
+import validate_corpus
+
 BASE_URL = "https://zxpress.ru"
 CATALOG_URL = f"{BASE_URL}/ezines.php"
 UA = "ZXPressScraperLight/1.0 (+noncommercial research; contact: you@example.org)"
 
 def sh(cmd: str):
     print(f"\n▶️  {cmd}")
+    t0 = time.time()
     res = subprocess.run(cmd, shell=True)
+    events_light.get().event("step", cmd=cmd, rc=res.returncode, seconds=round(time.time() - t0, 2))
     if res.returncode != 0:
         print(f"⚠️ Fehler bei: {cmd}")
         sys.exit(res.returncode)
@@ -46,7 +51,7 @@ def safe_mag_dir_name(name: str, max_len: int = 80) -> str:
 
     return n
 
-def run_for_magazine(mag_url: str, out_root: str, retry_missing=False, dry_run=False, validate=False, target_override=None):
+def run_for_magazine(mag_url: str, out_root: str, retry_missing=False, dry_run=False, target_override=None):
     # 1) Scrape (Issue-Listing → magazine.json, issue.json, listing.json)
     mag_name = os.path.basename(out_root)
     sh(
@@ -72,34 +77,20 @@ def run_for_magazine(mag_url: str, out_root: str, retry_missing=False, dry_run=F
         fetch_cmd += " --dry-run"
     sh(fetch_cmd)
 
-    # 4) Optional: Validate
-    if validate:
-        # Magazinname für Dateinamen ermitteln
-        mag_name = os.path.basename(target)
-        mag_json = os.path.join(target, "magazine.json")
-        try:
-            if os.path.exists(mag_json):
-                import json
-                with open(mag_json, "r", encoding="utf-8") as f:
-                    _mj = json.load(f)
-                mag_name = _mj.get("magazine_name") or mag_name
-        except Exception:
-            pass
-
-        # schlanker Slug
-        import re, unicodedata, datetime
-        def _slug(s: str, maxlen=40):
-            s = unicodedata.normalize("NFKD", s)
-            s = "".join(ch for ch in s if ch.isalnum() or ch in (" ", "_", "-"))
-            s = re.sub(r"\s+", "_", s).strip("_")
-            return (s[:maxlen].rstrip("_") or "mag")
+    return target
 
-        ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        report_dir = "logs/validation"
-        os.makedirs(report_dir, exist_ok=True)
-        report_txt = os.path.join(report_dir, f"validate_{_slug(mag_name)}_{ts}.txt")
-        sh(f'python scripts/light/validate_corpus.py --mag-root "{target}" > "{report_txt}"')
-        print(f"\n🧪 Validierungsreport: {report_txt}")
+def validate_targets(targets):
+    """Alle bearbeiteten Magazine in-process (Prozess-Pool) prüfen, ein JSON-Bericht für audit_corpus.py."""
+    ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_json = os.path.join("logs", "validation", f"validate_{ts}.json")
+    t0 = time.time()
+    results = validate_corpus.validate_many(targets)
+    for r in results:
+        if r["status"] == "FEHLER" or len(results) == 1:
+            validate_corpus.print_result(r)
+    report = validate_corpus.write_report(results, report_json, seconds=round(time.time() - t0, 3))
+    s = report["summary"]
+    print(f"\n🧪 Validierung: {s['magazines']} Magazine, Status {s['by_status']} → {report_json}")
 
 def fetch_catalog(timeout=25, retries=3, sleep=0.5):
     """
@@ -108,9 +99,9 @@ def fetch_catalog(timeout=25, retries=3, sleep=0.5):
     """
     headers = {"User-Agent": UA, "Accept": "text/html,*/*;q=0.8"}
     last_exc = None
-    for _ in range(retries):
+    for attempt in range(1, retries + 1):
         try:
-            r = requests.get(CATALOG_URL, headers=headers, timeout=timeout)
+            r = timed_get(CATALOG_URL, headers=headers, timeout=timeout, attempt=attempt)
             r.encoding = "utf-8"
             soup = BeautifulSoup(r.text, "html.parser")
             break
@@ -177,15 +168,27 @@ def main():
 
     parser.add_argument("--retry-missing", action="store_true", help="Fehlende Artikel erneut laden")
     parser.add_argument("--dry-run", action="store_true", help="Nur anzeigen/patchen, nichts persistentes verändern")
-    parser.add_argument("--validate", action="store_true", help="Am Ende Pydantic-Validierung ausführen")
+    parser.add_argument("--validate", action="store_true", help="Am Ende alle bearbeiteten Magazine validieren (JSON-Bericht in logs/validation)")
 
     # Sicherheits-/Steuerungsoptionen für --mode all
     parser.add_argument("--limit", type=int, default=None, help="Max. Anzahl Magazine (nur für --mode all)")
     parser.add_argument("--start-after-id", type=int, default=None, help="Starte nach Magazin-ID (nur für --mode all)")
     parser.add_argument("--sleep-mag", type=float, default=0.8, help="Pause (Sekunden) zwischen Magazinen")
+    parser.add_argument("--events", nargs="?", const="auto", default=None,
+                        help="JSONL-Eventlog für alle Schritte (ohne Wert: logs/events/pipeline_<ts>.jsonl)")
 
     args = parser.parse_args()
 
+    # Eventlog: Pfad per Umgebung an die Subprozesse (scrape/fetch) weiterreichen
+    if args.events:
+        events_path = args.events
+        if events_path == "auto":
+            ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            events_path = os.path.join("logs", "events", f"pipeline_{ts}.jsonl")
+        os.environ[events_light.ENV_PATH] = events_path
+        events_light.configure(events_path, step="run_light_pipeline", progress=False)
+        print(f"🧾 Eventlog: {events_path}")
+
     # YAML laden (optional, falls vorhanden)
     cfg = {}
     if args.config and os.path.exists(args.config):
@@ -194,6 +197,7 @@ def main():
     data_root = cfg.get("project", {}).get("data_root", "data/zxpress")
     mags_root = os.path.join(data_root, "magazines")
     os.makedirs(mags_root, exist_ok=True)
+    targets = []  # bearbeitete Magazinordner (für die Validierung am Ende)
 
     if args.mode == "seeds":
         seeds = (cfg.get("seeds") or [])
@@ -206,14 +210,13 @@ def main():
             out_dir_name = safe_mag_dir_name(mag_name)
             out_root = os.path.join(mags_root, out_dir_name)
             print(f"\n=== Seed: {mag_name} ({mag_url}) → {out_root}")
-            run_for_magazine(
+            targets.append(run_for_magazine(
                 mag_url=mag_url,
                 out_root=out_root,
                 retry_missing=args.retry_missing,
                 dry_run=args.dry_run,
-                validate=args.validate,
                 target_override=out_root
-            )
+            ))
             time.sleep(args.sleep_mag)
 
     elif args.mode == "all":
@@ -233,14 +236,13 @@ def main():
             out_dir_name = safe_mag_dir_name(name)
             out_root = os.path.join(mags_root, out_dir_name)
             print(f"\n=== [{i}/{len(catalog)}] {name} (id={item['magazine_id']}) → {out_root}")
-            run_for_magazine(
+            targets.append(run_for_magazine(
                 mag_url=mag_url,
                 out_root=out_root,
                 retry_missing=args.retry_missing,
                 dry_run=args.dry_run,
-                validate=args.validate,
                 target_override=out_root
-            )
+            ))
             time.sleep(args.sleep_mag)
 
     else:  # single
@@ -258,15 +260,21 @@ def main():
 
         os.makedirs(out_root, exist_ok=True)
         print(f"\n=== Single-Run: {args.mag_url} → {out_root}")
-        run_for_magazine(
+        targets.append(run_for_magazine(
             mag_url=args.mag_url,
             out_root=out_root,
             retry_missing=args.retry_missing,
             dry_run=args.dry_run,
-            validate=args.validate,
             target_override=out_root
-        )
+        ))
+
+    if args.validate and targets:
+        validate_targets(targets)
 
+    if args.events:
+        events_path = os.environ[events_light.ENV_PATH]
+        events_light.get().close()
+        events_light.print_summary(events_light.summarize_file(events_path), "Pipeline-Bilanz")
     print("\n✅ Pipeline fertig.")
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,302 @@
+# scripts/light/scale_corpus.py
+# Synthetischer Korpus-Skalierer für Last- und Skalierungstests (offline, deterministisch per Seed).
+#
+#   python scripts/light/scale_corpus.py --source data/zxpress/magazines --out /tmp/zx10x --factor 10
+#   python scripts/light/scale_corpus.py --source data_small/zxpress/magazines --out /tmp/zx_syn --magazines 50 --seed 7
+#
+# Aus dem vorhandenen Korpus werden Verteilungen gelernt (Form, Sprache, Ort, Issues pro Magazin,
+# Artikel pro Issue, Erscheinungsjahre, Textlängen, Zeilenlängen, Titellängen) sowie ein
+# Vokabular mit Rangfrequenzen. Die Texte werden Zipf-verteilt über diese Ränge gezogen
+# (Exponent aus den echten Häufigkeiten geschätzt). Geschrieben wird dasselbe Layout wie vom
+# Light-Scraper: magazine.json, listing.json, issues/<label>_<iso>/{issue.json,listing.json},
+# articles/<order>_<id>_<slug>/{meta.json,text.txt} – validate_corpus, build_indexes, Indexer
+# und full_healthcheck laufen damit unverändert.
+import os, re, json, math, time, random, shutil, argparse, unicodedata
+from bisect import bisect_left
+from collections import Counter
+from datetime import date, timedelta
+from itertools import accumulate
+
+BASE_URL = "https://zxpress.ru"
+SYN_MAG_ID_BASE = 900000       # synthetische IDs kollidieren nicht mit echten zxpress-IDs
+SYN_ART_ID_BASE = 90000000
+MAX_VOCAB = 50000
+
+
+def load_json(p):
+    try:
+        with open(p, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def dump_json(path, obj):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+
+
+def slugify(text, maxlen=60):
+    if not text:
+        return "article"
+    s = unicodedata.normalize("NFKC", text)
+    s = "".join(ch for ch in s if ch.isalnum() or ch in (" ", "_", "-"))
+    s = re.sub(r"\s+", "_", s).strip("_")
+    return s[:maxlen].rstrip("_- .") or "article"
+
+
+# -------------------
+# Profil des Quellkorpus
+# -------------------
+def _sorted_dirs(path):
+    return sorted(d for d in os.listdir(path) if os.path.isdir(os.path.join(path, d))) if os.path.isdir(path) else []
+
+
+def profile_corpus(source: str) -> dict:
+    """Empirische Verteilungen + Vokabular des Quellkorpus (Reihenfolge sortiert → deterministisch)."""
+    prof = {
+        "magazines": [],          # [{form, language, city_country, name}]
+        "issues_per_mag": [],
+        "articles_per_issue": [],
+        "issue_years": [],
+        "issue_gap_days": [],
+        "words_per_article": [],
+        "words_per_line": [],
+        "title_words": [],
+    }
+    vocab = Counter()
+    title_vocab = Counter()
+
+    for mag in _sorted_dirs(source):
+        mag_dir = os.path.join(source, mag)
+        mj = load_json(os.path.join(mag_dir, "magazine.json"))
+        if not isinstance(mj, dict):
+            continue
+        prof["magazines"].append({k: mj.get(k) for k in ("magazine_name", "form", "language", "city_country")})
+        issues = _sorted_dirs(os.path.join(mag_dir, "issues"))
+        prof["issues_per_mag"].append(len(issues))
+
+        prev = None
+        for iss in issues:
+            iss_dir = os.path.join(mag_dir, "issues", iss)
+            ij = load_json(os.path.join(iss_dir, "issue.json")) or {}
+            iso = ij.get("issue_date_iso") or ""
+            if re.match(r"^\d{4}-\d{2}-\d{2}$", iso) and not iso.startswith("0000"):
+                d = date.fromisoformat(iso)
+                prof["issue_years"].append(d.year)
+                if prev and d > prev:
+                    prof["issue_gap_days"].append((d - prev).days)
+                prev = d
+            arts = _sorted_dirs(os.path.join(iss_dir, "articles"))
+            prof["articles_per_issue"].append(len(arts))
+
+            for art in arts:
+                art_dir = os.path.join(iss_dir, "articles", art)
+                meta = load_json(os.path.join(art_dir, "meta.json")) or {}
+                title = meta.get("title_h1") or meta.get("title_link") or ""
+                if title:
+                    tw = title.split()
+                    prof["title_words"].append(len(tw))
+                    title_vocab.update(tw)
+                try:
+                    with open(os.path.join(art_dir, "text.txt"), "r", encoding="utf-8") as f:
+                        text = f.read()
+                except (OSError, UnicodeDecodeError):
+                    continue
+                n = 0
+                for line in text.splitlines():
+                    w = line.split()
+                    if w:
+                        prof["words_per_line"].append(len(w))
+                        vocab.update(w)
+                        n += len(w)
+                if n:
+                    prof["words_per_article"].append(n)
+
+    if not prof["magazines"] or not vocab:
+        raise SystemExit(f"❌ Quellkorpus ohne verwertbare Magazine/Texte: {source}")
+
+    words = [w for w, _ in vocab.most_common(MAX_VOCAB)]
+    prof["vocab"] = words
+    prof["zipf_s"] = fit_zipf([c for _, c in vocab.most_common(MAX_VOCAB)])
+    prof["title_vocab"] = [w for w, _ in title_vocab.most_common(5000)] or words[:5000]
+    return prof
+
+
+def fit_zipf(counts: list[int]) -> float:
+    """Zipf-Exponent per Kleinste-Quadrate auf log(Rang)/log(Häufigkeit); Fallback 1.0."""
+    pts = [(math.log(r), math.log(c)) for r, c in enumerate(counts, 1) if c > 0][:5000]
+    if len(pts) < 10:
+        return 1.0
+    mx = sum(x for x, _ in pts) / len(pts)
+    my = sum(y for _, y in pts) / len(pts)
+    sxx = sum((x - mx) ** 2 for x, _ in pts)
+    sxy = sum((x - mx) * (y - my) for x, y in pts)
+    s = -sxy / sxx if sxx else 1.0
+    return min(2.0, max(0.6, s))
+
+
+class ZipfSampler:
+    """Zieht Wörter nach Rang r mit Gewicht 1/r^s (kumulative Gewichte + bisect)."""
+
+    def __init__(self, words, s, rng):
+        self.words = words
+        self.rng = rng
+        self.cum = list(accumulate(1.0 / (r ** s) for r in range(1, len(words) + 1)))
+        self.total = self.cum[-1]
+
+    def word(self):
+        return self.words[bisect_left(self.cum, self.rng.random() * self.total)]
+
+    def words_n(self, n):
+        return [self.word() for _ in range(n)]
+
+
+# -------------------
+# Generator
+# -------------------
+def _pick(rng, values, default):
+    return rng.choice(values) if values else default
+
+
+def make_text(rng, sampler, prof, n_words):
+    lines, left = [], n_words
+    while left > 0:
+        k = min(left, _pick(rng, prof["words_per_line"], 10))
+        lines.append(" ".join(sampler.words_n(k)))
+        left -= k
+        if rng.random() < 0.08:
+            lines.append("")  # Absatz
+    return "\n".join(lines) + "\n"
+
+
+def generate(source: str, out: str, factor: float = None, magazines: int = None, seed: int = 42,
+             force: bool = False, prof: dict = None) -> dict:
+    """Schreibt einen synthetischen Korpus nach `out`; liefert Kennzahlen."""
+    rng = random.Random(seed)
+    prof = prof or profile_corpus(source)
+    n_mags = magazines or max(1, round((factor or 1.0) * len(prof["magazines"])))
+
+    if os.path.exists(out) and os.listdir(out):
+        if not force:
+            raise SystemExit(f"❌ Zielordner nicht leer: {out} (--force zum Überschreiben)")
+        shutil.rmtree(out)
+    os.makedirs(out, exist_ok=True)
+
+    text_sampler = ZipfSampler(prof["vocab"], prof["zipf_s"], rng)
+    title_sampler = ZipfSampler(prof["title_vocab"], prof["zipf_s"], rng)
+    stats = Counter()
+    art_id = SYN_ART_ID_BASE
+
+    for m in range(1, n_mags + 1):
+        tmpl = rng.choice(prof["magazines"])
+        mag_name = f"{tmpl.get('magazine_name') or 'Magazin'} SYN{m:05d}"
+        mag_id = SYN_MAG_ID_BASE + m
+        mag_dir = os.path.join(out, slugify(mag_name, 80))
+        os.makedirs(os.path.join(mag_dir, "issues"), exist_ok=True)
+
+        n_issues = max(1, _pick(rng, prof["issues_per_mag"], 5))
+        d = date(_pick(rng, prof["issue_years"], 1997), rng.randint(1, 12), rng.randint(1, 28))
+        mag_listing = []
+
+        for i in range(1, n_issues + 1):
+            label = f"{i:02d}"
+            iso = d.isoformat()
+            iss_dir = os.path.join(mag_dir, "issues", f"{label}_{iso}")
+            art_root = os.path.join(iss_dir, "articles")
+            os.makedirs(art_root, exist_ok=True)
+
+            n_arts = max(1, _pick(rng, prof["articles_per_issue"], 8))
+            listing = []
+            for order in range(1, n_arts + 1):
+                art_id += 1
+                title = " ".join(title_sampler.words_n(max(1, _pick(rng, prof["title_words"], 4))))
+                text = make_text(rng, text_sampler, prof, max(5, _pick(rng, prof["words_per_article"], 400)))
+                item = {
+                    "article_id": art_id,
+                    "article_url": f"{BASE_URL}/article.php?id={art_id}",
+                    "print_url": f"{BASE_URL}/print.php?id={art_id}",
+                    "title_link": title,
+                }
+                listing.append(item)
+
+                art_dir = os.path.join(art_root, f"{order:02d}_{art_id}_{slugify(title, 60)}")
+                os.makedirs(art_dir, exist_ok=True)
+                with open(os.path.join(art_dir, "text.txt"), "w", encoding="utf-8") as f:
+                    f.write(text)
+                city, country = None, None
+                cc = tmpl.get("city_country") or ""
+                mm = re.match(r"\s*(.+?)\s*\((.+?)\)\s*$", cc)
+                if mm:
+                    city, country = mm.group(1), mm.group(2)
+                dump_json(os.path.join(art_dir, "meta.json"), {
+                    "magazine_id": mag_id,
+                    "magazine_name": mag_name,
+                    "city": city,
+                    "country": country,
+                    "issue_label": label,
+                    "issue_date_iso": iso,
+                    "order": order,
+                    "article_id": art_id,
+                    "title_link": title,
+                    "title_h1": title,
+                    "print_url": item["print_url"],
+                    "article_url": item["article_url"],
+                    "fetched_at": "1970-01-01T00:00:00Z",  # fest → Ausgabe bytegleich je Seed
+                })
+                stats["articles"] += 1
+                stats["bytes"] += len(text.encode("utf-8"))
+
+            dump_json(os.path.join(iss_dir, "issue.json"), {
+                "issue_label": label,
+                "issue_date_human": None,
+                "issue_date_iso": iso,
+                "articles_count": len(listing),
+            })
+            dump_json(os.path.join(iss_dir, "listing.json"), listing)
+            mag_listing.append({"issue_label": label, "issue_date_iso": iso, "articles_count": len(listing)})
+            stats["issues"] += 1
+            d += timedelta(days=max(1, _pick(rng, prof["issue_gap_days"], 60)))
+
+        years = [mag_listing[0]["issue_date_iso"], mag_listing[-1]["issue_date_iso"]]
+        dump_json(os.path.join(mag_dir, "magazine.json"), {
+            "magazine_name": mag_name,
+            "magazine_id": mag_id,
+            "magazine_url": f"{BASE_URL}/gazette.php?id={mag_id}",
+            "form": tmpl.get("form"),
+            "language": tmpl.get("language"),
+            "city_country": tmpl.get("city_country"),
+            "years_human": None,
+            "years_iso": {"start": years[0], "end": years[1]},
+            "issues_count": len(mag_listing),
+        })
+        dump_json(os.path.join(mag_dir, "listing.json"), mag_listing)
+        stats["magazines"] += 1
+        if m % 50 == 0:
+            print(f"… {m}/{n_mags} Magazine, {stats['articles']} Artikel")
+
+    return {**stats, "seed": seed, "zipf_s": round(prof["zipf_s"], 3), "vocab": len(prof["vocab"])}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Synthetischen ZXpress-Korpus in beliebiger Größe erzeugen")
+    ap.add_argument("--source", required=True, help="Quell-Magazinwurzel (z.B. data/zxpress/magazines)")
+    ap.add_argument("--out", required=True, help="Ziel-Magazinwurzel")
+    g = ap.add_mutually_exclusive_group()
+    g.add_argument("--factor", type=float, default=None, help="Vielfaches der Magazinanzahl der Quelle")
+    g.add_argument("--magazines", type=int, default=None, help="absolute Anzahl synthetischer Magazine")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--force", action="store_true", help="nicht leeren Zielordner löschen")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    print(f"🔍 Profil des Quellkorpus: {args.source}")
+    res = generate(args.source, args.out, factor=args.factor, magazines=args.magazines,
+                   seed=args.seed, force=args.force)
+    print(f"✅ {res['magazines']} Magazine, {res['issues']} Issues, {res['articles']} Artikel "
+          f"({res['bytes'] / 1e6:.1f} MB Text, Zipf s={res['zipf_s']}, Vokabular {res['vocab']}) "
+          f"in {time.perf_counter() - t0:.1f}s → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
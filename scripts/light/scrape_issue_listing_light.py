@@ -1,6 +1,7 @@
 # python scripts/light/scrape_issue_listing_light.py --mag "#Z80" --url "https://zxpress.ru/issue.php?id=1" --out data/zxpress/magazines/Z80
 import argparse, os, re
 from utils_light import get_soup, ensure_dir, dump_json, abs_url, parse_ru_single_date, parse_ru_year_span
+import events_light
 
 DATE_RE = re.compile(r"\b(19|20)\d{2}\b")
 DATE_STRICT_RE = re.compile(r'(\d{1,2})\s+([А-Яа-яA-Za-z]+)\s+(19|20)\d{2}')
@@ -11,6 +12,7 @@ def main():
     ap.add_argument("--url", required=True, help="Magazinseite (issue.php?id=...)")
     ap.add_argument("--out", required=True, help="Zielordner für Magazin")
     args = ap.parse_args()
+    ev = events_light.configure(step="scrape_issue_listing", progress=False)
 
     mag_dir = ensure_dir(args.out)
     issues_dir = ensure_dir(os.path.join(mag_dir, "issues"))
@@ -129,6 +131,9 @@ def main():
         with open(os.path.join(mag_dir, "EMPTY.txt"), "w", encoding="utf-8") as f:
             f.write("Magazin ohne Issues – laut Katalog vorhanden, Issueliste jedoch leer.")
     print(f"📄 Magazin-Listing gespeichert: {os.path.join(mag_dir, 'listing.json')}")
+    ev.event("listing", magazine=mag_name, url=args.url, issues=len(issues),
+             articles=sum(len(i["articles"]) for i in issues.values()))
+    ev.close()
 
     print(f"✅ Fertig: {args.out}")
 
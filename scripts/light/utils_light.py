@@ -5,9 +5,10 @@ from datetime import datetime
 import os, json, time
 from urllib.parse import urljoin
 
-import requests
 from bs4 import BeautifulSoup
 
+from events_light import timed_get
+
 RU_MONTHS = {
     "января": 1, "февраля": 2, "марта": 3, "апреля": 4, "мая": 5, "июня": 6,
     "июля": 7, "августа": 8, "сентября": 9, "октября": 10, "ноября": 11, "декабря": 12,
@@ -88,9 +89,9 @@ def get_soup(url: str, timeout: int = 20, retries: int = 3, sleep: float = 0.3)
     """
     headers = {"User-Agent": UA, "Accept": "text/html,*/*;q=0.8"}
     last_err = None
-    for _ in range(retries):
+    for attempt in range(1, retries + 1):
         try:
-            r = requests.get(url, headers=headers, timeout=timeout)
+            r = timed_get(url, headers=headers, timeout=timeout, attempt=attempt)
             r.encoding = "utf-8"
             return BeautifulSoup(r.text, "html.parser")
         except Exception as e:
@@ -1,4 +1,5 @@
-import os, sys, json, argparse, re
+import os, sys, json, argparse, re, time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 
@@ -30,11 +31,18 @@ def is_iso_date(s: str) -> bool:
 def is_placeholder_date(s: Optional[str]) -> bool:
     return (s or "").strip() == "0000-01-01"
 
-def find_issue_dirs(mag_root: str) -> List[Dict[str, Any]]:
+def _warn(msg: str, sink: Optional[List[str]]):
+    if sink is None:
+        print(f"  - WARN: {msg}")
+    else:
+        sink.append(msg)
+
+def find_issue_dirs(mag_root: str, warnings: Optional[List[str]] = None) -> List[Dict[str, Any]]:
     """
     Liefert eine Liste erkannter Issues:
       {"dir": <Pfad>, "folder": <Ordnername>, "label": <issue_label>, "date_iso": <YYYY-MM-DD>, "issue_json": <Pfad>}
     Quelle der Wahrheit ist issue.json; der Ordnername dient als Fallback.
+    Mit `warnings` landen Hinweise in der Liste statt auf stdout.
     """
     issues_root = os.path.join(mag_root, "issues")
     out = []
@@ -75,11 +83,11 @@ def find_issue_dirs(mag_root: str) -> List[Dict[str, Any]]:
             })
         else:
             # Undurchsichtiger Ordner – überspringen (keinen harten Fehler)
-            print(f"  - WARN: unklare Issue-Ordnerstruktur bei '{d}' (keine issue.json und kein Label/Datum im Namen)")
+            _warn(f"unklare Issue-Ordnerstruktur bei '{d}' (keine issue.json und kein Label/Datum im Namen)", warnings)
 
     return out
 
-def load_listing(mag_root: str) -> List[Dict[str, Any]]:
+def load_listing(mag_root: str, warnings: Optional[List[str]] = None) -> List[Dict[str, Any]]:
     """
     Versucht listing.json zu laden. Akzeptiert:
       - Liste von Issues
@@ -94,21 +102,43 @@ def load_listing(mag_root: str) -> List[Dict[str, Any]]:
                 return data
             if isinstance(data, dict) and isinstance(data.get("issues"), list):
                 return data["issues"]
-            print("  - WARN: listing.json hat ein unerwartetes Format – nutze Ordnerstruktur.")
+            _warn("listing.json hat ein unerwartetes Format – nutze Ordnerstruktur.", warnings)
         except Exception as e:
-            print(f"  - WARN: listing.json nicht lesbar ({e}) – nutze Ordnerstruktur.")
+            _warn(f"listing.json nicht lesbar ({e}) – nutze Ordnerstruktur.", warnings)
 
     # Fallback: aus Ordnern ableiten
     derived = []
-    for it in find_issue_dirs(mag_root):
+    for it in find_issue_dirs(mag_root, warnings):
         derived.append({"issue_label": it["label"], "issue_date_iso": it["date_iso"]})
     return derived
 
-def validate_magazine(mag_root: str) -> int:
+def validate_magazine(mag_root: str) -> Dict[str, Any]:
+    """
+    Prüft ein Magazin und liefert das Ergebnis als dict (kein print, kein sys.exit):
+      {"magazine", "folder", "mag_root", "status": OK|OK+WARN|FEHLER, "errors", "warnings", "notes",
+       "issues", "articles", "seconds"}
+    """
+    t0 = time.perf_counter()
     mag_name = mag_display_name(mag_root)
-    print(f"🔎 Magazin: {mag_name}")
     errors: List[str] = []
     warnings: List[str] = []
+    notes: List[str] = []
+    article_total = 0
+
+    def _result(issues_cnt: int) -> Dict[str, Any]:
+        status = "FEHLER" if errors else ("OK+WARN" if warnings else "OK")
+        return {
+            "magazine": mag_name,
+            "folder": os.path.basename(os.path.normpath(mag_root)),
+            "mag_root": mag_root,
+            "status": status,
+            "errors": errors,
+            "warnings": warnings,
+            "notes": notes,
+            "issues": issues_cnt,
+            "articles": article_total,
+            "seconds": round(time.perf_counter() - t0, 4),
+        }
 
     # 0) magazine.json (optional)
     p_mag_json = os.path.join(mag_root, "magazine.json")
@@ -122,26 +152,22 @@ def validate_magazine(mag_root: str) -> int:
         except Exception as e:
             errors.append(f"[magazine.json] JSON-Fehler: {e}")
     else:
-        print(f"ℹ️  Hinweis: Keine magazine.json bei {p_mag_json} (nicht kritisch)")
+        notes.append(f"Keine magazine.json bei {p_mag_json} (nicht kritisch)")
 
     # 1) Issues aus listing.json ODER Ordnerstruktur
-    issues_list = load_listing(mag_root)
+    issues_list = load_listing(mag_root, warnings)
     # Wenn listing.json existiert, aber leer ist → OK mit Warnung (Magazin ohne Issues)
     has_listing_json = os.path.exists(os.path.join(mag_root, "listing.json"))
     if not issues_list:
         if has_listing_json:
-            print("ℹ️  Hinweis: listing.json vorhanden aber ohne Issues – Magazin scheint leer zu sein.")
-            # Früh-Exit: OK mit Warnung und kleiner Zusammenfassung
-            print("\n✅ Validierung: OK")
-            print("   (mit Warnungen)")
-            print("  - Magazin hat keine Issues (leerer Eintrag auf der Webseite)")
-            print("   ➜ Issues: 0 | Artikel gesamt: 0")
-            sys.exit(0)
+            notes.append("listing.json vorhanden aber ohne Issues – Magazin scheint leer zu sein.")
+            warnings.append("Magazin hat keine Issues (leerer Eintrag auf der Webseite)")
+            return _result(0)
         else:
             errors.append("Keine Issues auffindbar (weder listing.json noch issues/-Ordner verwertbar)")
 
     # 2) Issues-Ordner inventarisieren (für Zuordnung)
-    found_dirs = find_issue_dirs(mag_root)
+    found_dirs = find_issue_dirs(mag_root, warnings)
     found_map = {(f["label"], f["date_iso"]): f for f in found_dirs}
 
     # 3) pro Issue prüfen
@@ -212,6 +238,7 @@ def validate_magazine(mag_root: str) -> int:
             if not article_dirs:
                 errors.append(f"[Issue {label}] keine Artikelordner gefunden")
                 continue
+            article_total += len(article_dirs)
 
             # Vergleich deklarierte vs. gefundene Anzahl (nur Warnung)
             if isinstance(article_count_declared, int) and article_count_declared != len(article_dirs):
@@ -250,42 +277,108 @@ def validate_magazine(mag_root: str) -> int:
                 if not os.path.exists(p_text):
                     errors.append(f"[Issue {label}] {a}/text.txt fehlt")
 
-    # Ergebnis + knappe Zusammenfassung
-    if errors:
-        print(f"\n❌ Validierung: FEHLER - {mag_name}")
-        for e in errors:
+    return _result(len(issues_list))
+
+def print_result(res: Dict[str, Any]) -> None:
+    """Konsolenbericht im bisherigen Format."""
+    print(f"🔎 Magazin: {res['magazine']}")
+    for n in res["notes"]:
+        print(f"ℹ️  Hinweis: {n}")
+    if res["status"] == "FEHLER":
+        print(f"\n❌ Validierung: FEHLER - {res['magazine']}")
+        for e in res["errors"]:
             print("  -", e)
-        sys.exit(1)
-    else:
-        print(f"\n✅ Validierung: OK - {mag_name}")
-        if warnings:
-            print("   (mit Warnungen)")
-            for w in warnings:
-                print("  -", w)
-        # kleine Summary
-        try:
-            issues_cnt = len(load_listing(mag_root))
-            total_articles = 0
-            for it in find_issue_dirs(mag_root):
-                adir = os.path.join(it["dir"], "articles")
-                if os.path.isdir(adir):
-                    total_articles += len([d for d in os.listdir(adir) if os.path.isdir(os.path.join(adir, d))])
-            print(f"   ➜ Issues: {issues_cnt} | Artikel gesamt: {total_articles}")
-        except Exception:
-            pass
-        sys.exit(0)
+        return
+    print(f"\n✅ Validierung: OK - {res['magazine']}")
+    if res["warnings"]:
+        print("   (mit Warnungen)")
+        for w in res["warnings"]:
+            print("  -", w)
+    print(f"   ➜ Issues: {res['issues']} | Artikel gesamt: {res['articles']}")
+
+def _safe_validate(mag_root: str) -> Dict[str, Any]:
+    try:
+        return validate_magazine(mag_root)
+    except Exception as e:  # ein kaputtes Magazin darf den Pool-Lauf nicht abbrechen
+        return {"magazine": mag_display_name(mag_root), "folder": os.path.basename(os.path.normpath(mag_root)),
+                "mag_root": mag_root, "status": "FEHLER", "errors": [f"Validator-Ausnahme: {e!r}"],
+                "warnings": [], "notes": [], "issues": 0, "articles": 0, "seconds": 0.0}
+
+def list_magazines(root: str) -> List[str]:
+    return [os.path.join(root, d) for d in sorted(os.listdir(root)) if os.path.isdir(os.path.join(root, d))]
+
+def validate_many(mag_roots: List[str], workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Mehrere Magazine parallel (Prozess-Pool) prüfen; Reihenfolge wie Eingabe."""
+    if not mag_roots:
+        return []
+    workers = workers or min(len(mag_roots), os.cpu_count() or 2)
+    if workers <= 1:
+        return [_safe_validate(m) for m in mag_roots]
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(_safe_validate, mag_roots, chunksize=max(1, len(mag_roots) // (workers * 4))))
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    by_status: Dict[str, int] = {}
+    for r in results:
+        by_status[r["status"]] = by_status.get(r["status"], 0) + 1
+    return {
+        "magazines": len(results),
+        "issues": sum(r["issues"] for r in results),
+        "articles": sum(r["articles"] for r in results),
+        "errors": sum(len(r["errors"]) for r in results),
+        "warnings": sum(len(r["warnings"]) for r in results),
+        "by_status": by_status,
+    }
+
+def write_report(results: List[Dict[str, Any]], path: str, root: Optional[str] = None, seconds: Optional[float] = None):
+    """Ein JSON-Bericht für alle Magazine (liest audit_corpus.py direkt)."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "root": root,
+        "seconds": seconds,
+        "summary": summarize(results),
+        "magazines": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
 
 def main():
     ap = argparse.ArgumentParser(description="Validate ZXPress light corpus")
-    ap.add_argument("--mag-root", required=True, help="Pfad zum Magazin-Root (z. B. data/zxpress/magazines/Z80)")
+    g = ap.add_mutually_exclusive_group(required=True)
+    g.add_argument("--mag-root", help="Pfad zum Magazin-Root (z. B. data/zxpress/magazines/Z80)")
+    g.add_argument("--root", help="Wurzel aller Magazine (z. B. data/zxpress/magazines) – parallel prüfen")
+    ap.add_argument("--workers", type=int, default=None, help="Prozesse für --root (Default: CPU-Anzahl)")
+    ap.add_argument("--report-json", help="JSON-Bericht schreiben (z. B. logs/validation/validate_<ts>.json)")
+    ap.add_argument("--quiet", action="store_true", help="nur fehlerhafte Magazine und Summe ausgeben")
     args = ap.parse_args()
 
-    if not os.path.isdir(args.mag_root):
-        print(f"Pfad existiert nicht oder ist kein Ordner: {args.mag_root}")
+    target = args.mag_root or args.root
+    if not os.path.isdir(target):
+        print(f"Pfad existiert nicht oder ist kein Ordner: {target}")
         sys.exit(2)
 
-    rc = validate_magazine(args.mag_root)
-    sys.exit(rc)
+    t0 = time.perf_counter()
+    mags = [args.mag_root] if args.mag_root else list_magazines(args.root)
+    results = validate_many(mags, args.workers)
+    secs = round(time.perf_counter() - t0, 3)
+
+    for r in results:
+        if not args.quiet or r["status"] == "FEHLER":
+            print_result(r)
+            if len(results) > 1:
+                print()
+    if len(results) > 1:
+        s = summarize(results)
+        print(f"📊 {s['magazines']} Magazine | Issues: {s['issues']} | Artikel: {s['articles']} | "
+              f"Status: {s['by_status']} | {secs}s")
+    if args.report_json:
+        write_report(results, args.report_json, root=args.root or os.path.dirname(os.path.normpath(args.mag_root)),
+                     seconds=secs)
+        print(f"📝 JSON-Bericht: {args.report_json}")
+
+    sys.exit(1 if any(r["status"] == "FEHLER" for r in results) else 0)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
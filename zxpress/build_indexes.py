@@ -1,9 +1,20 @@
 # zxpress/build_indexes.py
 import os
+import sys
 import json
-import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional, Tuple
 
+# auch direkt als Datei startbar (python zxpress/build_indexes.py <mag_dir>)
+_REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+from zxpress import hashstore  # noqa: E402
+from zxpress.hashstore import sha1_file  # noqa: E402
+
+FORMATS = ("json", "pretty", "jsonl")
+LEGACY_HASH_CACHE = ".hash_cache.json"  # alter JSON-Cache pro Magazin, ersetzt durch den HashStore
+
 
 def _safe_read_json(path: str) -> Optional[Dict[str, Any]]:
     try:
@@ -13,24 +24,21 @@ def _safe_read_json(path: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def _sha1_of_file(path: str) -> Optional[str]:
-    if not os.path.exists(path) or not os.path.isfile(path):
+def _stat(path: Optional[str]) -> Optional[os.stat_result]:
+    if not path:
         return None
-    h = hashlib.sha1()
     try:
-        with open(path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                h.update(chunk)
-        return h.hexdigest()
-    except Exception:
+        return os.stat(path)
+    except OSError:
         return None
 
 
-def _size_of_file(path: str) -> Optional[int]:
-    try:
-        return os.path.getsize(path) if os.path.exists(path) else None
-    except Exception:
-        return None
+class _NoStore:
+    """Ersatz für den HashStore bei --no-hash-store: immer neu hashen."""
+    hits = misses = 0
+
+    def sha1(self, path: str, st: Optional[os.stat_result]) -> Optional[str]:
+        return sha1_file(path) if st is not None else None
 
 
 def _parse_seq_id_slug(dirname: str) -> Tuple[Optional[int], Optional[str], Optional[str]]:
@@ -52,32 +60,68 @@ def _parse_seq_id_slug(dirname: str) -> Tuple[Optional[int], Optional[str], Opti
     return None, dirname if dirname.isdigit() else None, None
 
 
-def _collect_articles_from_fs(arts_dir: str) -> List[Dict[str, Any]]:
+def _list_article_dirs(arts_dir: str) -> List[str]:
+    """Einmaliges Listing der Artikelordner (sortiert)."""
+    try:
+        with os.scandir(arts_dir) as it:
+            return sorted(e.name for e in it if e.is_dir())
+    except OSError:
+        return []
+
+
+def _article_dir_map(names: List[str]) -> Dict[str, str]:
+    """article_id (als String) → Ordnername; erster Treffer gewinnt wie bisher."""
+    by_id: Dict[str, str] = {}
+    for name in names:
+        _, art_id, _ = _parse_seq_id_slug(name)
+        if art_id is None and "_" in name:
+            # z.B. 'x_1868' – bisher über name.endswith(f"_{id}") gefunden
+            tail = name.rsplit("_", 1)[-1]
+            art_id = tail if tail.isdigit() else None
+        if art_id is not None:
+            by_id.setdefault(art_id, name)
+    return by_id
+
+
+def _article_row(art_dir: Optional[str]) -> Dict[str, Any]:
+    """Gemeinsame Felder aus meta.json/text.txt; ein stat() pro Datei."""
+    meta_path = os.path.join(art_dir, "meta.json") if art_dir else None
+    txt_path = os.path.join(art_dir, "text.txt") if art_dir else None
+    st_meta = _stat(meta_path)
+    st_txt = _stat(txt_path)
+    meta = (_safe_read_json(meta_path) or {}) if st_meta else {}
+    return {
+        "meta": meta,
+        "has_text": st_txt is not None,
+        "has_meta": st_meta is not None,
+        "txt_path": txt_path,
+        "st_txt": st_txt,
+        "size_bytes": st_txt.st_size if st_txt else None,
+    }
+
+
+def _collect_articles_from_fs(arts_dir: str, hashes, names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
     """
     Falls kein Manifest existiert: lese Artikelordner direkt vom FS.
     Versuche Reihenfolge aus 'NN_<id>_<slug>' zu entnehmen, sonst alphabetisch.
     """
     rows: List[Dict[str, Any]] = []
-    for name in sorted(os.listdir(arts_dir)):
+    for name in (names if names is not None else _list_article_dirs(arts_dir)):
         art_dir = os.path.join(arts_dir, name)
-        if not os.path.isdir(art_dir):
-            continue
         seq, art_id, _ = _parse_seq_id_slug(name)
-        meta_path = os.path.join(art_dir, "meta.json")
-        txt_path = os.path.join(art_dir, "text.txt")
-        meta = _safe_read_json(meta_path) or {}
-        title = meta.get("title")
+        a = _article_row(art_dir)
+        meta = a["meta"]
         rows.append({
             "seq": seq,                        # kann None sein
             "article_id": int(art_id) if art_id and art_id.isdigit() else meta.get("article_id"),
-            "title": title,
+            "title": meta.get("title"),
             "path": art_dir,
             "print_url": meta.get("print_url"),
-            "has_text": os.path.exists(txt_path),
-            "has_meta": os.path.exists(meta_path),
-            "status": meta.get("status", "ok" if os.path.exists(txt_path) else "missing"),
-            "sha1": meta.get("sha1") or _sha1_of_file(txt_path),
-            "size_bytes": _size_of_file(txt_path),
+            "has_text": a["has_text"],
+            "has_meta": a["has_meta"],
+            "status": meta.get("status", "ok" if a["has_text"] else "missing"),
+            "sha1": meta.get("sha1") or hashes.sha1(a["txt_path"], a["st_txt"]),
+            "size_bytes": a["size_bytes"],
         })
     # Sortierung: erst nach seq (falls vorhanden), sonst nach article_id, sonst by name via path
     rows.sort(key=lambda r: (
@@ -88,51 +132,49 @@ def _collect_articles_from_fs(arts_dir: str) -> List[Dict[str, Any]]:
     return rows
 
 
-def _collect_articles_from_manifest(issue_dir: str) -> List[Dict[str, Any]]:
+def _collect_articles_from_manifest(issue_dir: str, hashes) -> List[Dict[str, Any]]:
     """
     Nutzt articles_order.json (vom Scraper erzeugt) als Ground Truth für die Reihenfolge.
+    Das Artikelverzeichnis wird genau einmal gelistet (id → Ordner), damit bleibt die
+    Zuordnung linear in der Artikelzahl.
     """
     order_path = os.path.join(issue_dir, "articles_order.json")
     arts_dir = os.path.join(issue_dir, "articles")
+    names = _list_article_dirs(arts_dir)
     listing = _safe_read_json(order_path)
     if not listing:
         # Fallback auf FS
-        return _collect_articles_from_fs(arts_dir) if os.path.isdir(arts_dir) else []
+        return _collect_articles_from_fs(arts_dir, hashes, names)
+
+    present = set(names)
+    by_id = _article_dir_map(names)
 
     rows: List[Dict[str, Any]] = []
     for row in listing:
         seq = row.get("seq")
         art_id = row.get("article_id")
-        # Ordner kann NN_<id>_* sein, aber wir suchen robust nach Verzeichnis, das die id enthält:
-        chosen_dir = None
-        if os.path.isdir(arts_dir):
-            for name in os.listdir(arts_dir):
-                if f"_{art_id}_" in name or name.endswith(f"_{art_id}") or name == str(art_id):
-                    p = os.path.join(arts_dir, name)
-                    if os.path.isdir(p):
-                        chosen_dir = p
-                        break
-        # letzte Chance: es gibt evtl. nur "<id>"
-        if chosen_dir is None:
-            p = os.path.join(arts_dir, str(art_id))
-            if os.path.isdir(p):
-                chosen_dir = p
-
-        meta_path = os.path.join(chosen_dir, "meta.json") if chosen_dir else None
-        txt_path = os.path.join(chosen_dir, "text.txt") if chosen_dir else None
-        meta = _safe_read_json(meta_path) if meta_path and os.path.exists(meta_path) else {}
-        title = meta.get("title") or row.get("title")
+        # Manifest-Spalte "dir" (articles/NN_<id>_<slug>) bevorzugen, sonst über die id auflösen
+        name = None
+        rel = row.get("dir")
+        if rel and os.path.basename(rel) in present:
+            name = os.path.basename(rel)
+        if name is None and art_id is not None:
+            name = by_id.get(str(art_id))
+        chosen_dir = os.path.join(arts_dir, name) if name else None
+
+        a = _article_row(chosen_dir)
+        meta = a["meta"]
         rows.append({
             "seq": seq,
             "article_id": art_id,
-            "title": title,
+            "title": meta.get("title") or row.get("title"),
             "path": chosen_dir or "",
             "print_url": row.get("print_url") or meta.get("print_url"),
-            "has_text": bool(txt_path and os.path.exists(txt_path)),
-            "has_meta": bool(meta_path and os.path.exists(meta_path)),
-            "status": (meta.get("status") if meta else ("ok" if txt_path and os.path.exists(txt_path) else "missing")),
-            "sha1": (meta.get("sha1") if meta else (_sha1_of_file(txt_path) if txt_path else None)),
-            "size_bytes": _size_of_file(txt_path) if txt_path else None,
+            "has_text": a["has_text"],
+            "has_meta": a["has_meta"],
+            "status": (meta.get("status") if meta else ("ok" if a["has_text"] else "missing")),
+            "sha1": (meta.get("sha1") if meta else hashes.sha1(a["txt_path"], a["st_txt"])),
+            "size_bytes": a["size_bytes"],
         })
 
     # manifestierte Reihenfolge ist bereits korrekt, zur Sicherheit stabil nach seq sortieren
@@ -140,71 +182,113 @@ def _collect_articles_from_manifest(issue_dir: str) -> List[Dict[str, Any]]:
     return rows
 
 
-def build_indexes(mag_dir: str):
+def _index_issue(mag_dir: str, issue_id: str, hashes) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    issue_dir = os.path.join(mag_dir, "issues", issue_id)
+    issue_rel = os.path.relpath(issue_dir, mag_dir)
+    issue_meta = _safe_read_json(os.path.join(issue_dir, "issue.json")) or {}
+    issue_row = {"issue_id": issue_id, "issue_dir": issue_rel, **issue_meta}
+
+    articles = []
+    for r in _collect_articles_from_manifest(issue_dir, hashes):
+        articles.append({
+            "issue_id": issue_id,
+            "issue_dir": issue_rel,
+            "article_dir": os.path.relpath(r["path"], mag_dir) if r["path"] else "",
+            "article_id": r.get("article_id"),
+            "seq": r.get("seq"),
+            "title": r.get("title"),
+            "print_url": r.get("print_url"),
+            "has_text": bool(r.get("has_text")),
+            "has_meta": bool(r.get("has_meta")),
+            "status": r.get("status"),
+            "sha1": r.get("sha1"),
+            "size_bytes": r.get("size_bytes"),
+        })
+    return issue_row, articles
+
+
+def _write_rows(path_base: str, rows: List[Dict[str, Any]], fmt: str) -> str:
+    """fmt: json (kompakt) | pretty (eingerückt, wie früher) | jsonl (eine Zeile pro Eintrag)."""
+    if fmt == "jsonl":
+        path = path_base + ".jsonl"
+        with open(path, "w", encoding="utf-8") as f:
+            for r in rows:
+                f.write(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n")
+    else:
+        path = path_base + ".json"
+        with open(path, "w", encoding="utf-8") as f:
+            if fmt == "pretty":
+                json.dump(rows, f, ensure_ascii=False, indent=2)
+            else:
+                json.dump(rows, f, ensure_ascii=False, separators=(",", ":"))
+    # veraltete Datei im jeweils anderen Format entfernen, damit load_index eindeutig bleibt
+    other = path_base + (".json" if fmt == "jsonl" else ".jsonl")
+    if os.path.exists(other):
+        os.remove(other)
+    return path
+
+
+def load_index(mag_dir: str, name: str) -> Optional[List[Dict[str, Any]]]:
+    """Liest indexes/<name>.jsonl oder indexes/<name>.json (was build_indexes zuletzt geschrieben hat)."""
+    base = os.path.join(mag_dir, "indexes", name)
+    if os.path.exists(base + ".jsonl"):
+        with open(base + ".jsonl", "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    if os.path.exists(base + ".json"):
+        with open(base + ".json", "r", encoding="utf-8") as f:
+            return json.load(f)
+    return None
+
+
+def build_indexes(mag_dir: str, workers: int = 4, fmt: str = "json", use_hash_store: bool = True):
     """
     Baut Indexdateien zu einem Magazinverzeichnis:
-      - <mag_dir>/indexes/issues.json
+      - <mag_dir>/indexes/issues.json   (bzw. .jsonl bei fmt="jsonl")
       - <mag_dir>/indexes/articles.json
     Erwartete Struktur:
       <mag_dir>/issues/<issue_id>/issue.json
       <mag_dir>/issues/<issue_id>/articles/...
       <mag_dir>/issues/<issue_id>/articles_order.json (optional, bevorzugt)
+    Issues werden parallel (Threads, I/O-lastig) verarbeitet; die Ausgabe bleibt nach issue_id sortiert.
+    sha1 fehlender meta-Einträge kommt aus dem gemeinsamen HashStore (zxpress.hashstore).
     """
-    indexes: Dict[str, List[Dict[str, Any]]] = {"issues": [], "articles": []}
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt muss eines von {FORMATS} sein")
     issues_root = os.path.join(mag_dir, "issues")
 
     if not os.path.isdir(issues_root):
         print(f"⚠️ Kein issues/ in {mag_dir}")
         return
 
-    total_issues = 0
-    total_articles = 0
-
-    for issue_id in sorted(os.listdir(issues_root)):
-        issue_dir = os.path.join(issues_root, issue_id)
-        if not os.path.isdir(issue_dir):
-            continue
-
-        issue_meta = _safe_read_json(os.path.join(issue_dir, "issue.json")) or {}
-        issue_meta_enriched = {
-            "issue_id": issue_id,
-            "issue_dir": os.path.relpath(issue_dir, mag_dir),
-            **issue_meta
-        }
-        indexes["issues"].append(issue_meta_enriched)
-        total_issues += 1
-
-        # Artikel sammeln (Manifest bevorzugt)
-        rows = _collect_articles_from_manifest(issue_dir)
-        for r in rows:
-            indexes["articles"].append({
-                "issue_id": issue_id,
-                "issue_dir": os.path.relpath(issue_dir, mag_dir),
-                "article_dir": os.path.relpath(r["path"], mag_dir) if r["path"] else "",
-                "article_id": r.get("article_id"),
-                "seq": r.get("seq"),
-                "title": r.get("title"),
-                "print_url": r.get("print_url"),
-                "has_text": bool(r.get("has_text")),
-                "has_meta": bool(r.get("has_meta")),
-                "status": r.get("status"),
-                "sha1": r.get("sha1"),
-                "size_bytes": r.get("size_bytes"),
-            })
-        total_articles += len(rows)
-
     idx_dir = os.path.join(mag_dir, "indexes")
     os.makedirs(idx_dir, exist_ok=True)
+    legacy = os.path.join(idx_dir, LEGACY_HASH_CACHE)
+    if os.path.exists(legacy):
+        os.remove(legacy)
+    hashes = hashstore.get() if use_hash_store else _NoStore()
+    hits0, misses0 = hashes.hits, hashes.misses
+
+    with os.scandir(issues_root) as it:
+        issue_ids = sorted(e.name for e in it if e.is_dir())
+
+    if workers > 1 and len(issue_ids) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            results = list(ex.map(lambda i: _index_issue(mag_dir, i, hashes), issue_ids))
+    else:
+        results = [_index_issue(mag_dir, i, hashes) for i in issue_ids]
 
-    with open(os.path.join(idx_dir, "issues.json"), "w", encoding="utf-8") as f:
-        json.dump(indexes["issues"], f, ensure_ascii=False, indent=2)
+    issues = [r[0] for r in results]
+    articles = [a for r in results for a in r[1]]
 
-    with open(os.path.join(idx_dir, "articles.json"), "w", encoding="utf-8") as f:
-        json.dump(indexes["articles"], f, ensure_ascii=False, indent=2)
+    _write_rows(os.path.join(idx_dir, "issues"), issues, fmt)
+    out = _write_rows(os.path.join(idx_dir, "articles"), articles, fmt)
 
-    print(f"📚 Indexe aktualisiert in {idx_dir}")
-    print(f"   • Issues:   {total_issues}")
-    print(f"   • Articles: {total_articles}")
+    print(f"📚 Indexe aktualisiert in {idx_dir} ({os.path.basename(out)})")
+    print(f"   • Issues:   {len(issues)}")
+    print(f"   • Articles: {len(articles)}")
+    hits, misses = hashes.hits - hits0, hashes.misses - misses0
+    if hits or misses:
+        print(f"   • sha1:     {hits} aus HashStore, {misses} neu berechnet")
 
 
 # Optional: direkt ausführbar für einen Magazin-Ordner
@@ -212,5 +296,9 @@ if __name__ == "__main__":
     import argparse
     ap = argparse.ArgumentParser(description="Baue Indexe für ein Magazinverzeichnis")
     ap.add_argument("mag_dir", help="Pfad zu data/zxpress/magazines/<MAGAZIN>")
+    ap.add_argument("--workers", type=int, default=4, help="parallele Issues (Threads)")
+    ap.add_argument("--format", dest="fmt", choices=FORMATS, default="json",
+                    help="json = kompakt (Default), pretty = eingerückt, jsonl = eine Zeile pro Eintrag")
+    ap.add_argument("--no-hash-store", action="store_true", help="sha1 immer neu berechnen")
     args = ap.parse_args()
-    build_indexes(args.mag_dir)
\ No newline at end of file
+    build_indexes(args.mag_dir, workers=args.workers, fmt=args.fmt, use_hash_store=not args.no_hash_store)
@@ -0,0 +1,237 @@
+# zxpress/events.py
+"""
+Strukturierte Scraper-Events: JSONL-Log, Live-Fortschritt (tqdm) und Abschlussbericht.
+
+Jeder HTTP-Versuch wird als Event mit Host, Status, Latenz, Bytes, Versuch-Nr. und
+Fehlerklasse festgehalten; Artikel-/Issue-Ergebnisse als "item"-Events. Daraus entstehen
+Seiten/s, Bytes/s, Retry-Quote, Latenz-Perzentile pro Host und Fehlerklassen.
+
+Der Log-Pfad kommt aus configure(path=…) oder der Umgebungsvariable ZX_EVENTS – so schreiben
+auch die per Subprozess gestarteten Schritte der Light-Pipeline in dieselbe Datei (Append).
+"""
+import os
+import sys
+import json
+import time
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+try:
+    from tqdm import tqdm
+except ImportError:  # Fortschrittsbalken sind optional
+    tqdm = None
+
+ENV_PATH = "ZX_EVENTS"
+
+
+def _pct(values: List[float], p: float) -> Optional[float]:
+    if not values:
+        return None
+    s = sorted(values)
+    return round(s[min(len(s) - 1, int(p * len(s)))], 1)
+
+
+def error_class(exc: Optional[BaseException] = None, status: Optional[int] = None) -> Optional[str]:
+    """Exception → Klassenname (Timeout, ConnectionError, …); HTTP ≥ 400 → 'HTTP 503'."""
+    if exc is not None:
+        return type(exc).__name__
+    if status is not None and status >= 400:
+        return f"HTTP {status}"
+    return None
+
+
+class EventLog:
+    def __init__(self, path: Optional[str] = None, step: Optional[str] = None, progress: bool = True):
+        self.path = path
+        self.step = step or os.path.basename(sys.argv[0] or "zxpress")
+        self.progress_enabled = progress and tqdm is not None
+        self._lock = threading.Lock()
+        self._fh = None
+        self._bar = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._fh = open(path, "a", encoding="utf-8", buffering=1)  # zeilengepuffert, Append
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.t0 = time.time()
+        self.hosts: Dict[str, Dict[str, Any]] = defaultdict(
+            lambda: {"requests": 0, "errors": 0, "retries": 0, "bytes": 0, "latency_ms": []})
+        self.error_classes: Counter = Counter()
+        self.items: Counter = Counter()
+
+    # ---------- Schreiben ----------
+    def event(self, kind: str, **fields):
+        rec = {"ts": round(time.time(), 3), "step": self.step, "pid": os.getpid(), "kind": kind, **fields}
+        if self._fh:
+            line = json.dumps(rec, ensure_ascii=False)
+            with self._lock:
+                self._fh.write(line + "\n")
+        return rec
+
+    def http(self, url: str, status: Optional[int], ms: float, nbytes: int = 0, attempt: int = 1,
+             exc: Optional[BaseException] = None):
+        host = urlsplit(url).hostname or "?"
+        err = error_class(exc, status)
+        with self._lock:
+            h = self.hosts[host]
+            h["requests"] += 1
+            h["bytes"] += nbytes
+            h["latency_ms"].append(ms)
+            if attempt > 1:
+                h["retries"] += 1
+            if err:
+                h["errors"] += 1
+                self.error_classes[err] += 1
+        self.event("http", url=url, host=host, status=status, ms=round(ms, 1), bytes=nbytes,
+                   attempt=attempt, error=err, detail=str(exc) if exc else None)
+
+    def item(self, status: str, **fields):
+        """Ergebnis einer Einheit (Artikel/Issue): ok | skip | fail | …"""
+        with self._lock:
+            self.items[status] += 1
+        self.event("item", status=status, **fields)
+        if self._bar is not None:
+            self._bar.update(1)
+            self._bar.set_postfix({k: v for k, v in self.items.items()}, refresh=False)
+
+    # ---------- Fortschritt ----------
+    def progress(self, total: Optional[int], desc: str):
+        """Startet einen Balken für die folgenden item()-Aufrufe (None, wenn tqdm fehlt/abgeschaltet)."""
+        self.close_progress()
+        if self.progress_enabled:
+            self._bar = tqdm(total=total, desc=desc, unit="art", leave=False, dynamic_ncols=True)
+        return self._bar
+
+    def close_progress(self):
+        if self._bar is not None:
+            self._bar.close()
+            self._bar = None
+
+    def echo(self, msg: str):
+        """print(), das einen laufenden Fortschrittsbalken nicht zerreißt."""
+        if self._bar is not None:
+            tqdm.write(msg)
+        else:
+            print(msg)
+
+    # ---------- Auswertung ----------
+    def summary(self) -> Dict[str, Any]:
+        return summarize(self.hosts, self.error_classes, self.items, time.time() - self.t0)
+
+    def print_summary(self, title: str = "Scraper-Bilanz"):
+        print_summary(self.summary(), title)
+
+    def close(self):
+        self.close_progress()
+        if self._fh:
+            self._fh.close()
+            self._fh = None
+
+
+def summarize(hosts, error_classes, items, seconds: float) -> Dict[str, Any]:
+    total_req = sum(h["requests"] for h in hosts.values())
+    total_bytes = sum(h["bytes"] for h in hosts.values())
+    total_retry = sum(h["retries"] for h in hosts.values())
+    total_err = sum(h["errors"] for h in hosts.values())
+    all_lat = [ms for h in hosts.values() for ms in h["latency_ms"]]
+    seconds = max(seconds, 1e-6)
+    return {
+        "seconds": round(seconds, 1),
+        "requests": total_req,
+        "pages_per_sec": round(total_req / seconds, 2),
+        "bytes": total_bytes,
+        "bytes_per_sec": round(total_bytes / seconds, 1),
+        "retry_rate": round(total_retry / total_req, 4) if total_req else 0.0,
+        "error_rate": round(total_err / total_req, 4) if total_req else 0.0,
+        "latency_ms": {"p50": _pct(all_lat, 0.50), "p95": _pct(all_lat, 0.95), "p99": _pct(all_lat, 0.99)},
+        "hosts": {
+            host: {"requests": h["requests"], "errors": h["errors"], "retries": h["retries"], "bytes": h["bytes"],
+                   "p50_ms": _pct(h["latency_ms"], 0.50), "p95_ms": _pct(h["latency_ms"], 0.95),
+                   "p99_ms": _pct(h["latency_ms"], 0.99)}
+            for host, h in sorted(hosts.items())
+        },
+        "error_classes": dict(error_classes.most_common()),
+        "items": dict(items),
+    }
+
+
+def summarize_file(path: str) -> Dict[str, Any]:
+    """Bilanz aus einer JSONL-Datei (z.B. über alle Subprozesse eines Pipeline-Laufs)."""
+    hosts = defaultdict(lambda: {"requests": 0, "errors": 0, "retries": 0, "bytes": 0, "latency_ms": []})
+    errs, items = Counter(), Counter()
+    t_first = t_last = None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                ev = json.loads(line)
+            except ValueError:
+                continue
+            ts = ev.get("ts")
+            if ts is not None:
+                t_first = ts if t_first is None else min(t_first, ts)
+                t_last = ts if t_last is None else max(t_last, ts)
+            if ev.get("kind") == "http":
+                h = hosts[ev.get("host") or "?"]
+                h["requests"] += 1
+                h["bytes"] += ev.get("bytes") or 0
+                h["latency_ms"].append(ev.get("ms") or 0.0)
+                if (ev.get("attempt") or 1) > 1:
+                    h["retries"] += 1
+                if ev.get("error"):
+                    h["errors"] += 1
+                    errs[ev["error"]] += 1
+            elif ev.get("kind") == "item":
+                items[ev.get("status") or "?"] += 1
+    return summarize(hosts, errs, items, (t_last - t_first) if t_first is not None else 0.0)
+
+
+def print_summary(s: Dict[str, Any], title: str = "Scraper-Bilanz"):
+    lat = s["latency_ms"]
+    print(f"\n📊 {title}: {s['requests']} Requests in {s['seconds']}s "
+          f"({s['pages_per_sec']} Seiten/s, {s['bytes_per_sec'] / 1024:.1f} KiB/s) | "
+          f"Retry {s['retry_rate'] * 100:.1f}% | Fehler {s['error_rate'] * 100:.1f}% | "
+          f"Latenz p50 {lat['p50']} / p95 {lat['p95']} / p99 {lat['p99']} ms")
+    for host, h in s["hosts"].items():
+        print(f"   🌐 {host}: {h['requests']} Req, {h['errors']} Fehler, {h['retries']} Retries, "
+              f"{h['bytes'] / 1024:.0f} KiB, p50 {h['p50_ms']} / p95 {h['p95_ms']} ms")
+    if s["error_classes"]:
+        print("   ❌ Fehlerklassen: " + ", ".join(f"{k}={v}" for k, v in s["error_classes"].items()))
+    if s["items"]:
+        print("   📦 Ergebnisse: " + ", ".join(f"{k}={v}" for k, v in sorted(s["items"].items())))
+
+
+# ---------- Prozessweiter Default ----------
+_default: Optional[EventLog] = None
+
+
+def configure(path: Optional[str] = None, step: Optional[str] = None, progress: bool = True) -> EventLog:
+    global _default
+    if _default is not None:
+        _default.close()
+    _default = EventLog(path or os.environ.get(ENV_PATH) or None, step=step, progress=progress)
+    return _default
+
+
+def get() -> EventLog:
+    """Aktuelles EventLog; ohne configure() nur im Speicher bzw. in ZX_EVENTS."""
+    global _default
+    if _default is None:
+        _default = EventLog(os.environ.get(ENV_PATH) or None)
+    return _default
+
+
+def timed_get(url: str, session=None, attempt: int = 1, **kwargs):
+    """requests.get / session.get mit Latenz-, Byte- und Fehler-Event; Exceptions werden weitergereicht."""
+    if session is None:
+        import requests as session
+    t = time.perf_counter()
+    try:
+        r = session.get(url, **kwargs)
+    except Exception as e:
+        get().http(url, None, (time.perf_counter() - t) * 1000, 0, attempt, exc=e)
+        raise
+    get().http(url, r.status_code, (time.perf_counter() - t) * 1000, len(r.content or b""), attempt)
+    return r
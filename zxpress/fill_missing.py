@@ -1,16 +1,14 @@
 import os
-import json
 from .scrape_articles import scrape_issue_articles
+from .build_indexes import load_index
+from . import events
 
 def fill_missing(cfg_path: str, mag_dir: str, magazine_id: int, form: str = None, city: str = None, country: str = None):
-    idx_articles = os.path.join(mag_dir, "indexes", "articles.json")
-    if not os.path.exists(idx_articles):
+    items = load_index(mag_dir, "articles")
+    if items is None:
         print("⚠️ Kein articles.json gefunden – bitte zuerst build_indexes laufen lassen.")
         return
 
-    with open(idx_articles, "r", encoding="utf-8") as f:
-        items = json.load(f)
-
     issue_dirs = {}
     for row in items:
         if not row.get("has_text") or not row.get("has_meta") or row.get("status") != "ok":
@@ -24,4 +22,6 @@ def fill_missing(cfg_path: str, mag_dir: str, magazine_id: int, form: str = None
 
     print(f"🧩 Fülle {len(issue_dirs)} Ausgabe(n) nach …")
     for issue_id, issue_dir in issue_dirs.items():
-        scrape_issue_articles(cfg_path, issue_dir, magazine_id, form=form, city=city, country=country)
\ No newline at end of file
+        scrape_issue_articles(cfg_path, issue_dir, magazine_id, form=form, city=city, country=country,
+                              summary=False)
+    events.get().print_summary()
@@ -0,0 +1,167 @@
+# zxpress/hashstore.py
+"""
+Gemeinsamer, persistenter sha1-Speicher für Korpusdateien (SQLite).
+
+Schlüssel ist der absolute Pfad, gültig ist ein Eintrag nur, solange (inode, size, mtime_ns)
+übereinstimmen – eine Abfrage kostet damit ein stat(). Scraper tragen den Hash direkt beim
+Schreiben ein (write_text), build_indexes und der Indexer lesen ihn nur noch nach.
+
+Pfad der Datenbank: Argument, Umgebungsvariable ZX_HASHSTORE oder <repo>/logs/hashstore.sqlite.
+WAL-Modus, damit parallele Skripte (Pipeline-Subprozesse) gleichzeitig lesen/schreiben können.
+"""
+import os
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional
+
+ENV_PATH = "ZX_HASHSTORE"
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_PATH = os.path.join(REPO_ROOT, "logs", "hashstore.sqlite")
+
+_CHUNK = 1 << 20
+_BATCH = 500  # SQLite-Parametergrenze beachten
+
+
+def sha1_file(path: str) -> Optional[str]:
+    h = hashlib.sha1()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK), b""):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+def _stat(path: str) -> Optional[os.stat_result]:
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+class HashStore:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.environ.get(ENV_PATH) or DEFAULT_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY, ino INTEGER, size INTEGER, mtime_ns INTEGER, sha1 TEXT NOT NULL)")
+        self._db.commit()
+        self.hits = self.misses = 0
+
+    # ---------- Lesen ----------
+    @staticmethod
+    def _valid(row, st: os.stat_result) -> bool:
+        return row is not None and row[0] == st.st_ino and row[1] == st.st_size and row[2] == st.st_mtime_ns
+
+    def lookup(self, path: str, st: Optional[os.stat_result] = None) -> Optional[str]:
+        """sha1 aus dem Speicher, wenn die Datei seitdem unverändert ist – sonst None (kein Lesen der Datei)."""
+        path = os.path.abspath(path)
+        st = st or _stat(path)
+        if st is None:
+            return None
+        with self._lock:
+            row = self._db.execute("SELECT ino, size, mtime_ns, sha1 FROM files WHERE path=?", (path,)).fetchone()
+        return row[3] if self._valid(row, st) else None
+
+    def lookup_many(self, paths: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Batch-Variante von lookup(): {pfad: sha1 oder None}."""
+        stats = {}
+        for p in paths:
+            stats[os.path.abspath(p)] = _stat(p)
+        keys = [p for p, st in stats.items() if st is not None]
+        rows = {}
+        with self._lock:
+            for i in range(0, len(keys), _BATCH):
+                part = keys[i:i + _BATCH]
+                q = f"SELECT path, ino, size, mtime_ns, sha1 FROM files WHERE path IN ({','.join('?' * len(part))})"
+                for r in self._db.execute(q, part):
+                    rows[r[0]] = r[1:]
+        return {p: (rows[p][3] if st is not None and self._valid(rows.get(p), st) else None)
+                for p, st in stats.items()}
+
+    def sha1(self, path: str, st: Optional[os.stat_result] = None) -> Optional[str]:
+        """lookup() oder – bei Fehltreffer – Datei hashen und eintragen."""
+        path = os.path.abspath(path)
+        st = st or _stat(path)
+        if st is None:
+            return None
+        digest = self.lookup(path, st)
+        if digest is not None:
+            with self._lock:
+                self.hits += 1
+            return digest
+        digest = sha1_file(path)
+        if digest is not None:
+            self.put(path, digest, st)
+        with self._lock:
+            self.misses += 1
+        return digest
+
+    # ---------- Schreiben ----------
+    def put(self, path: str, digest: str, st: Optional[os.stat_result] = None):
+        path = os.path.abspath(path)
+        st = st or _stat(path)
+        if st is None:
+            return
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                             (path, st.st_ino, st.st_size, st.st_mtime_ns, digest))
+            self._db.commit()
+
+    def write_text(self, path: str, text: str, encoding: str = "utf-8") -> str:
+        """Text schreiben und dabei hashen – kein zweites Lesen der Datei. Liefert den sha1."""
+        data = text.encode(encoding)
+        with open(path, "wb") as f:
+            f.write(data)
+        digest = hashlib.sha1(data).hexdigest()
+        self.put(path, digest)
+        return digest
+
+    def fill(self, paths: List[str], background: bool = True) -> Optional[threading.Thread]:
+        """Fehlende/veraltete Hashes nachtragen, optional im Hintergrund-Thread (hashlib gibt die GIL frei)."""
+        def _run():
+            for p, digest in self.lookup_many(paths).items():
+                if digest is None:
+                    self.sha1(p)
+        if not background:
+            _run()
+            return None
+        t = threading.Thread(target=_run, name="hashstore-fill", daemon=True)
+        t.start()
+        return t
+
+    def prune(self, prefix: str) -> int:
+        """Einträge unter prefix entfernen, deren Datei nicht mehr existiert."""
+        prefix = os.path.abspath(prefix)
+        with self._lock:
+            rows = self._db.execute("SELECT path FROM files WHERE path >= ? AND path < ?",
+                                    (prefix, prefix + "￿")).fetchall()
+        gone = [(p,) for (p,) in rows if not os.path.exists(p)]
+        with self._lock:
+            self._db.executemany("DELETE FROM files WHERE path=?", gone)
+            self._db.commit()
+        return len(gone)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+# ---------- Prozessweiter Default ----------
+_default: Optional[HashStore] = None
+_default_lock = threading.Lock()
+
+
+def get(path: Optional[str] = None) -> HashStore:
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = HashStore(path)
+        return _default
@@ -2,22 +2,17 @@
 import os
 import json
 import time
-import hashlib
-import requests
 from bs4 import BeautifulSoup
 from typing import List, Dict, Any, Optional
 from .utils import safe_filename  # wir nutzen das schon vorhandene helper
+from . import events
+from . import hashstore
 
 BASE_URL = "https://zxpress.ru"
 
-def _sha1(data: bytes) -> str:
-    h = hashlib.sha1()
-    h.update(data)
-    return h.hexdigest()
-
 def _safe_get(url: str) -> Optional[BeautifulSoup]:
     try:
-        r = requests.get(url, timeout=20)
+        r = events.timed_get(url, timeout=20)
         r.encoding = "utf-8"
         return BeautifulSoup(r.text, "html.parser")
     except Exception:
@@ -104,7 +99,8 @@ def _fetch_article_print(article_id: int) -> Dict[str, Any]:
 def scrape_issue_articles(config_path: str, issue_dir: str, magazine_id: int,
                           form: Optional[str] = None,
                           city: Optional[str] = None,
-                          country: Optional[str] = None) -> None:
+                          country: Optional[str] = None,
+                          summary: bool = True) -> None:
     """
     Erzeugt für jede Ausgabe die Artikel-Ordner mit **laufenden seq-Nummern**:
       <issue_dir>/articles/01_<id>_<slug>/
@@ -112,6 +108,8 @@ def scrape_issue_articles(config_path: str, issue_dir: str, magazine_id: int,
       - <article_dir>/meta.json
       - <article_dir>/text.txt
       - <issue_dir>/articles_order.json (Manifest mit seq)
+    summary: Scraper-Bilanz am Ende ausgeben (False, wenn der Aufrufer mehrere Ausgaben
+    scrapt und die Bilanz selbst einmal ausgibt, siehe fill_missing).
     """
     # Lade issue.json (für Kontext und TEI später)
     issue_meta_path = os.path.join(issue_dir, "issue.json")
@@ -126,6 +124,8 @@ def scrape_issue_articles(config_path: str, issue_dir: str, magazine_id: int,
 
     manifest_path = os.path.join(issue_dir, "articles_order.json")
     manifest: List[Dict[str, Any]] = []
+    ev = events.get()
+    ev.progress(len(link_rows), os.path.basename(issue_dir))
 
     for seq, row in enumerate(link_rows, start=1):
         article_id = int(row["article_id"])
@@ -148,13 +148,13 @@ def scrape_issue_articles(config_path: str, issue_dir: str, magazine_id: int,
         txt_path = os.path.join(art_dir, "text.txt")
         meta_path = os.path.join(art_dir, "meta.json")
 
-        # schreiben (idempotent)
+        # schreiben (idempotent); sha1 entsteht beim Schreiben und landet im HashStore
+        sha1 = None
         try:
-            with open(txt_path, "w", encoding="utf-8") as f:
-                f.write(text)
-            print(f"✅ gespeichert: {os.path.relpath(txt_path)}")
+            sha1 = hashstore.get().write_text(txt_path, text)
+            ev.echo(f"✅ gespeichert: {os.path.relpath(txt_path)}")
         except Exception as e:
-            print(f"❌ Fehler beim Speichern text.txt ({article_id}): {e}")
+            ev.echo(f"❌ Fehler beim Speichern text.txt ({article_id}): {e}")
 
         meta = {
             "magazine_id": magazine_id,
@@ -170,14 +170,15 @@ def scrape_issue_articles(config_path: str, issue_dir: str, magazine_id: int,
             "title": title,
             "print_url": print_url,
             "source_url": url,
-            "status": "ok" if os.path.exists(txt_path) else "missing",
-            "sha1": _sha1(open(txt_path, "rb").read()) if os.path.exists(txt_path) else None,
+            "status": "ok" if sha1 else "missing",
+            "sha1": sha1,
         }
         try:
             with open(meta_path, "w", encoding="utf-8") as f:
                 json.dump(meta, f, ensure_ascii=False, indent=2)
         except Exception as e:
-            print(f"❌ Fehler beim Speichern meta.json ({article_id}): {e}")
+            ev.echo(f"❌ Fehler beim Speichern meta.json ({article_id}): {e}")
+        ev.item("ok" if text else "fail", article_id=article_id, issue=issue_meta.get("issue_id"), chars=len(text))
 
         # Manifest-Zeile
         manifest.append({
@@ -190,9 +191,13 @@ def scrape_issue_articles(config_path: str, issue_dir: str, magazine_id: int,
 
         time.sleep(0.2)  # nett zum Server
 
+    ev.close_progress()
     # Manifest schreiben
     try:
         with open(manifest_path, "w", encoding="utf-8") as f:
             json.dump(manifest, f, ensure_ascii=False, indent=2)
     except Exception as e:
-        print(f"❌ Fehler beim Speichern articles_order.json: {e}")
\ No newline at end of file
+        print(f"❌ Fehler beim Speichern articles_order.json: {e}")
+
+    if summary:
+        ev.print_summary()
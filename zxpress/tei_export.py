@@ -0,0 +1,328 @@
+# zxpress/tei_export.py
+"""
+TEI-P5-Export des Korpus (Magazin → Ausgabe → Artikel) für das CLARIN-Depositpaket.
+
+    python -m zxpress.tei_export --root data/zxpress/magazines --out export/tei
+    python -m zxpress.tei_export --root data/zxpress/magazines --out export/tei --workers 8 --force
+
+Ergebnis:
+  <out>/<Magazin>/<Ausgabe>/<Artikel>.xml   – ein TEI-Dokument pro Artikel
+  <out>/<Magazin>/corpus.xml                – teiCorpus mit Magazin-Header und allen Artikeln
+  <out>/<Magazin>/.export_state.json        – Fingerabdrücke der exportierten Artikel
+  <out>/manifest.json                       – Überblick über das Paket
+
+XML wird mit lxml.etree.xmlfile inkrementell geschrieben (kein Baum im Speicher), Magazine laufen
+parallel in einem Prozesspool. Neu geschrieben werden nur Artikel, deren Fingerabdruck
+(sha1 von text.txt, meta.json, issue.json, magazine.json aus dem HashStore) sich geändert hat;
+corpus.xml nur, wenn sich im Magazin etwas geändert hat.
+"""
+import os
+import re
+import json
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from lxml import etree
+
+from . import hashstore
+
+TEI_NS = "http://www.tei-c.org/ns/1.0"
+XML_NS = "http://www.w3.org/XML/1998/namespace"
+# xml-Präfix explizit binden – xmlfile würde für xml:id sonst ein ns0-Präfix erfinden
+NSMAP = {None: TEI_NS, "xml": XML_NS}
+EXPORTER_VERSION = "2"  # erhöhen, wenn sich das TEI-Layout ändert → alles wird neu exportiert
+STATE_NAME = ".export_state.json"
+PUBLISHER = "DigitProject – ZXpress-Korpus"
+
+# in XML 1.0 nicht erlaubte Steuerzeichen (kommen in alten E-Zine-Texten vor)
+_INVALID_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f￾￿]")
+_PARAS = re.compile(r"\n\s*\n")
+_NOT_NCNAME = re.compile(r"[^\w.\-]+")  # xml:id muss ein NCName sein
+
+
+def _clean(s: Optional[str]) -> str:
+    return _INVALID_XML.sub("", s or "")
+
+
+def _read_json(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f) or {}
+    except Exception:
+        return {}
+
+
+def _split_city_country(city_country: Optional[str]):
+    if city_country and "(" in city_country and ")" in city_country:
+        return city_country.split("(")[0].strip(), city_country.split("(")[1].replace(")", "").strip()
+    return city_country, None
+
+
+def _el(xf, tag: str, text: Optional[str] = None, **attrib):
+    """Kleines Element komplett schreiben (leere Attribute werden weggelassen)."""
+    e = etree.Element(tag, {k: str(v) for k, v in attrib.items() if v not in (None, "")})
+    if text:
+        e.text = _clean(str(text))
+    xf.write(e)
+
+
+# -------------------
+# TEI-Bausteine
+# -------------------
+def _write_monogr(xf, mag: Dict[str, Any], issue: Optional[Dict[str, Any]] = None):
+    city, country = _split_city_country(mag.get("city_country"))
+    with xf.element("monogr"):
+        _el(xf, "title", mag.get("magazine_name"), level="j")
+        _el(xf, "idno", mag.get("magazine_id"), type="zxpress-magazine")
+        if mag.get("magazine_url"):
+            _el(xf, "idno", mag["magazine_url"], type="URL")
+        with xf.element("imprint"):
+            _el(xf, "pubPlace", city)
+            if country:
+                _el(xf, "pubPlace", country, type="country")
+            if issue is not None:
+                _el(xf, "date", issue.get("issue_date_human") or issue.get("issue_date_iso"),
+                    when=_iso_date(issue.get("issue_date_iso")))
+                _el(xf, "biblScope", issue.get("issue_label"), unit="issue")
+            else:
+                years = mag.get("years_iso") or {}
+                _el(xf, "date", mag.get("years_human"), **{"from": _iso_date(years.get("start")),
+                                                             "to": _iso_date(years.get("end"))})
+
+
+def _iso_date(value: Optional[str]) -> Optional[str]:
+    # Platzhalter der Light-Pipeline ("0000-01-01") nicht als Datum ausgeben
+    return value if value and not value.startswith("0000") else None
+
+
+def _write_profile(xf, mag: Dict[str, Any]):
+    with xf.element("profileDesc"):
+        if mag.get("language"):
+            with xf.element("langUsage"):
+                _el(xf, "language", ident=mag["language"])
+        if mag.get("form"):
+            with xf.element("textClass"):
+                with xf.element("keywords"):
+                    _el(xf, "term", mag["form"], type="form")
+
+
+def article_xml_id(meta: Dict[str, Any], issue_name: str, art_name: str) -> str:
+    """xml:id eines Artikels: zx-a<article_id>; ohne gültige article_id aus dem Ordnerpfad abgeleitet
+    (sonst kollidierten alle Artikel ohne meta.json-ID als zx-aNone im teiCorpus)."""
+    art_id = str(meta.get("article_id") or "").strip()
+    if art_id.isdigit():
+        return f"zx-a{int(art_id)}"
+    return "zx-f" + _NOT_NCNAME.sub("_", f"{issue_name}.{art_name}")
+
+
+def write_article_tei(path: str, mag: Dict[str, Any], issue: Dict[str, Any], meta: Dict[str, Any],
+                      text: str, sha1: Optional[str], xml_id: str):
+    art_id = meta.get("article_id")
+    title = meta.get("title_h1") or meta.get("title_link") or meta.get("title") or f"Article {art_id}"
+    tmp = path + ".tmp"
+    with etree.xmlfile(tmp, encoding="utf-8") as xf:
+        xf.write_declaration()
+        with xf.element("TEI", {f"{{{XML_NS}}}id": xml_id}, nsmap=NSMAP):
+            with xf.element("teiHeader"):
+                with xf.element("fileDesc"):
+                    with xf.element("titleStmt"):
+                        _el(xf, "title", title)
+                    with xf.element("publicationStmt"):
+                        _el(xf, "publisher", PUBLISHER)
+                        _el(xf, "idno", art_id, type="zxpress-article")
+                        if sha1:
+                            _el(xf, "idno", sha1, type="sha1")
+                    with xf.element("sourceDesc"):
+                        with xf.element("biblStruct"):
+                            with xf.element("analytic"):
+                                _el(xf, "title", title, level="a")
+                                if meta.get("title_link") and meta.get("title_link") != title:
+                                    _el(xf, "title", meta["title_link"], level="a", type="toc")
+                            _write_monogr(xf, mag, issue)
+                            _el(xf, "ref", target=meta.get("article_url") or meta.get("source_url"))
+                            _el(xf, "ref", type="print", target=meta.get("print_url"))
+                _write_profile(xf, mag)
+                if meta.get("fetched_at"):
+                    with xf.element("revisionDesc"):
+                        _el(xf, "change", "harvested from zxpress.ru", when=meta["fetched_at"])
+            with xf.element("text"):
+                with xf.element("body"):
+                    order = meta.get("order", meta.get("seq"))
+                    with xf.element("div", {"type": "article", **({"n": str(order)} if order is not None else {})}):
+                        _el(xf, "head", title)
+                        for para in _PARAS.split(_clean(text).strip()):
+                            if not para.strip():
+                                continue
+                            with xf.element("p"):
+                                for i, line in enumerate(para.split("\n")):
+                                    if i:
+                                        xf.write(etree.Element("lb"))
+                                    xf.write(line)
+    os.replace(tmp, path)
+
+
+def write_corpus(path: str, mag: Dict[str, Any], article_files: List[str]):
+    """teiCorpus eines Magazins: Header + alle Artikel-TEIs, Datei für Datei eingestreamt."""
+    tmp = path + ".tmp"
+    parser = etree.XMLParser(remove_blank_text=False, huge_tree=True)
+    with etree.xmlfile(tmp, encoding="utf-8") as xf:
+        xf.write_declaration()
+        mag_id = str(mag.get("magazine_id") or "").strip()
+        xml_id = f"zx-m{int(mag_id)}" if mag_id.isdigit() else "zx-mf" + _NOT_NCNAME.sub("_", mag.get("magazine_name") or "")
+        with xf.element("teiCorpus", {f"{{{XML_NS}}}id": xml_id}, nsmap=NSMAP):
+            with xf.element("teiHeader"):
+                with xf.element("fileDesc"):
+                    with xf.element("titleStmt"):
+                        _el(xf, "title", mag.get("magazine_name"))
+                    with xf.element("extent"):
+                        _el(xf, "measure", str(len(article_files)), unit="articles", quantity=len(article_files))
+                    with xf.element("publicationStmt"):
+                        _el(xf, "publisher", PUBLISHER)
+                    with xf.element("sourceDesc"):
+                        with xf.element("biblStruct"):
+                            _write_monogr(xf, mag)
+                _write_profile(xf, mag)
+            for f in article_files:
+                xf.write(etree.parse(f, parser).getroot())
+                xf.flush()
+    os.replace(tmp, path)
+
+
+# -------------------
+# Export pro Magazin (läuft im Worker-Prozess)
+# -------------------
+def _fingerprint(*digests) -> str:
+    return hashlib.sha1("|".join([EXPORTER_VERSION, *(d or "-" for d in digests)]).encode("ascii")).hexdigest()
+
+
+def export_magazine(mag_root: str, out_root: str, force: bool = False) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    hashes = hashstore.get()
+    mag_name = os.path.basename(mag_root.rstrip(os.sep))
+    mag_meta_path = os.path.join(mag_root, "magazine.json")
+    mag = _read_json(mag_meta_path)
+    mag.setdefault("magazine_name", mag_name)
+    mag_sha1 = hashes.sha1(mag_meta_path)
+
+    out_dir = os.path.join(out_root, mag_name)
+    os.makedirs(out_dir, exist_ok=True)
+    state_path = os.path.join(out_dir, STATE_NAME)
+    old_state = {} if force else _read_json(state_path).get("articles", {})
+    state: Dict[str, str] = {}
+    exported = unchanged = 0
+    id_fallback: List[str] = []
+    files: List[str] = []
+
+    issues_root = os.path.join(mag_root, "issues")
+    issue_names = sorted(os.listdir(issues_root)) if os.path.isdir(issues_root) else []
+    for issue_name in issue_names:
+        issue_dir = os.path.join(issues_root, issue_name)
+        arts_dir = os.path.join(issue_dir, "articles")
+        if not os.path.isdir(arts_dir):
+            continue
+        issue_meta_path = os.path.join(issue_dir, "issue.json")
+        issue = None
+        issue_sha1 = hashes.sha1(issue_meta_path)
+        for art_name in sorted(os.listdir(arts_dir)):
+            art_dir = os.path.join(arts_dir, art_name)
+            text_path = os.path.join(art_dir, "text.txt")
+            meta_path = os.path.join(art_dir, "meta.json")
+            if not (os.path.isfile(text_path) and os.path.isfile(meta_path)):
+                continue
+            rel = f"{issue_name}/{art_name}.xml"
+            out_path = os.path.join(out_dir, issue_name, f"{art_name}.xml")
+            text_sha1 = hashes.sha1(text_path)
+            fp = _fingerprint(text_sha1, hashes.sha1(meta_path), issue_sha1, mag_sha1)
+            state[rel] = fp
+            files.append(out_path)
+            if old_state.get(rel) == fp and os.path.exists(out_path):
+                unchanged += 1
+                continue
+            if issue is None:
+                issue = _read_json(issue_meta_path)
+            with open(text_path, "r", encoding="utf-8") as f:
+                text = f.read()
+            os.makedirs(os.path.dirname(out_path), exist_ok=True)
+            meta = _read_json(meta_path)
+            xml_id = article_xml_id(meta, issue_name, art_name)
+            if not xml_id.startswith("zx-a"):
+                id_fallback.append(rel)
+            write_article_tei(out_path, mag, issue, meta, text, text_sha1, xml_id)
+            exported += 1
+
+    # verschwundene Artikel auch aus dem Export entfernen
+    removed = 0
+    for rel in set(old_state) - set(state):
+        p = os.path.join(out_dir, *rel.split("/"))
+        if os.path.exists(p):
+            os.remove(p)
+            removed += 1
+
+    corpus_path = os.path.join(out_dir, "corpus.xml")
+    if exported or removed or force or not os.path.exists(corpus_path) or set(old_state) != set(state):
+        write_corpus(corpus_path, mag, files)
+        corpus_written = True
+    else:
+        corpus_written = False
+
+    with open(state_path, "w", encoding="utf-8") as f:
+        json.dump({"exporter_version": EXPORTER_VERSION, "articles": state}, f, ensure_ascii=False)
+
+    return {"magazine": mag.get("magazine_name"), "folder": mag_name, "articles": len(state),
+            "exported": exported, "unchanged": unchanged, "removed": removed,
+            "id_fallback": id_fallback,
+            "corpus_written": corpus_written, "seconds": round(time.perf_counter() - t0, 2)}
+
+
+def _safe_export(args):
+    mag_root, out_root, force = args
+    try:
+        return export_magazine(mag_root, out_root, force)
+    except Exception as e:  # ein kaputtes Magazin soll den Lauf nicht abbrechen
+        return {"folder": os.path.basename(mag_root), "error": f"{type(e).__name__}: {e}"}
+
+
+def export_corpus(root: str, out_root: str, workers: int = 4, force: bool = False) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    mags = sorted(os.path.join(root, d) for d in os.listdir(root)
+                  if os.path.isfile(os.path.join(root, d, "magazine.json")))
+    os.makedirs(out_root, exist_ok=True)
+    jobs = [(m, out_root, force) for m in mags]
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results = list(ex.map(_safe_export, jobs))
+    else:
+        results = [_safe_export(j) for j in jobs]
+
+    manifest = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "exporter_version": EXPORTER_VERSION,
+        "format": "TEI P5",
+        "source_root": os.path.abspath(root),
+        "seconds": round(time.perf_counter() - t0, 2),
+        "magazines": results,
+    }
+    with open(os.path.join(out_root, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="TEI-P5-Export (Depositpaket) für alle Magazine")
+    ap.add_argument("--root", required=True, help="Pfad zu data/zxpress/magazines")
+    ap.add_argument("--out", required=True, help="Zielordner des Exports")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="parallele Magazine (Prozesse)")
+    ap.add_argument("--force", action="store_true", help="alles neu exportieren (Fingerabdrücke ignorieren)")
+    args = ap.parse_args()
+
+    m = export_corpus(args.root, args.out, workers=args.workers, force=args.force)
+    errors = [r for r in m["magazines"] if r.get("error")]
+    done = [r for r in m["magazines"] if not r.get("error")]
+    print(f"📦 TEI-Export: {len(done)} Magazine, {sum(r['articles'] for r in done)} Artikel "
+          f"({sum(r['exported'] for r in done)} neu geschrieben, {sum(r['unchanged'] for r in done)} unverändert, "
+          f"{sum(r['removed'] for r in done)} entfernt) in {m['seconds']}s → {args.out}")
+    for r in errors:
+        print(f"❌ {r['folder']}: {r['error']}")